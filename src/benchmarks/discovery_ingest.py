@@ -0,0 +1,200 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+# Runs synthetic discovery traffic through the whole pipeline:
+# DdsData.queue -> BuiltInReceiver -> DdsData (worker thread) -> ParticipantTreeModel.
+# Reports ingest throughput, time until the model reflects the final discovery
+# state and the peak memory.
+#
+# Usage (from src): python -m benchmarks.discovery_ingest --participants 2000 --churn 0.1 --churn-rounds 5
+#                   python -m benchmarks.discovery_ingest --journal storm.cddsj.gz
+
+import argparse
+import sys
+import time
+import tracemalloc
+from typing import List, Set, Tuple
+from loguru import logger as logging
+from PySide6.QtCore import QCoreApplication, QObject, QThread, QTimer, Qt, Slot
+
+from dds_access import dds_data
+from dds_access.builtin_observer import BuiltInDataItem
+from dds_access.discovery_journal import read_journal
+from benchmarks.discovery_load import DiscoveryLoadGenerator
+from models.participant_model import ParticipantTreeModel, ParticipantTreeNode
+
+
+class StableModelProbe(QObject):
+    """Lives in the main thread next to the model and mirrors what it received."""
+
+    def __init__(self, expected_participants: Set[str], expected_endpoints: Set[str]):
+        super().__init__()
+        self.expected_participants = expected_participants
+        self.expected_endpoints = expected_endpoints
+        self.participants: Set[str] = set()
+        self.endpoints: Set[str] = set()
+        self.start_time = 0.0
+        self.stable_time = 0.0
+        self.latency_max_ms = 0.0
+
+    @Slot(float)
+    def delivered(self, observed_at: float):
+        self.latency_max_ms = max(self.latency_max_ms, (time.monotonic() - observed_at) * 1000.0)
+
+    @Slot(int, list)
+    def new_participants(self, domain_id: int, participants: list):
+        self.participants.update(str(p.key) for p in participants)
+        self.check()
+
+    @Slot(int, list)
+    def removed_participants(self, domain_id: int, participant_keys: list):
+        self.participants.difference_update(participant_keys)
+        self.check()
+
+    @Slot(str, int, list)
+    def new_endpoints(self, requestId: str, domain_id: int, endpoints: list):
+        self.endpoints.update(str(endp.endpoint.key) for endp in endpoints)
+        self.check()
+
+    @Slot(int, list)
+    def removed_endpoints(self, domain_id: int, endpoint_keys: list):
+        self.endpoints.difference_update(endpoint_keys)
+        self.check()
+
+    def check(self):
+        if self.stable_time > 0.0:
+            return
+        if len(self.participants) != len(self.expected_participants) or len(self.endpoints) != len(self.expected_endpoints):
+            return
+        if self.participants == self.expected_participants and self.endpoints == self.expected_endpoints:
+            self.stable_time = time.perf_counter()
+            # Let the model slots queued behind this one run before leaving
+            QTimer.singleShot(0, QCoreApplication.quit)
+
+
+def load_journal(path: str) -> Tuple[List[BuiltInDataItem], Set[int], Set[str], Set[str]]:
+    """Reads a recorded discovery journal and folds it into the final discovery state."""
+    items = []
+    domain_ids: Set[int] = set()
+    participants: Set[str] = set()
+    endpoints: Set[str] = set()
+    for (_, item) in read_journal(path):
+        items.append(item)
+        for (domain_id, p) in item.new_participants:
+            domain_ids.add(domain_id)
+            participants.add(str(p.key))
+        for (domain_id, p) in item.remove_participants:
+            participants.discard(str(p.key))
+        for (domain_id, endp, _) in item.new_endpoints:
+            domain_ids.add(domain_id)
+            endpoints.add(str(endp.key))
+        for (domain_id, endp) in item.remove_endpoints:
+            endpoints.discard(str(endp.key))
+    return (items, domain_ids, participants, endpoints)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discovery ingest benchmark")
+    parser.add_argument("--participants", type=int, default=2000)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--endpoints-per-participant", type=int, default=10)
+    parser.add_argument("--qos-profiles", type=int, default=8)
+    parser.add_argument("--hosts", type=int, default=50)
+    parser.add_argument("--churn", type=float, default=0.0, help="fraction of participants restarted per churn round")
+    parser.add_argument("--churn-rounds", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=50, help="participants per BuiltInDataItem")
+    parser.add_argument("--journal", type=str, default="", help="replay a recorded discovery journal instead of synthetic load")
+    parser.add_argument("--trace-memory", action="store_true", help="track peak memory with tracemalloc (slows the run)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="seconds")
+    args = parser.parse_args()
+
+    logging.remove()
+    logging.add(sys.stderr, level="WARNING")
+
+    app = QCoreApplication(sys.argv)
+    app.setOrganizationName("cyclonedds")
+    app.setApplicationName("CycloneDDS Insight Benchmark")
+
+    generator = DiscoveryLoadGenerator(
+        domain_id=0,
+        participants=args.participants,
+        topics=args.topics,
+        endpoints_per_participant=args.endpoints_per_participant,
+        qos_profiles=args.qos_profiles,
+        hosts=args.hosts,
+        churn=args.churn,
+        batch_size=args.batch_size)
+    if args.journal:
+        items, domain_ids, expected_participants, expected_endpoints = load_journal(args.journal)
+    else:
+        items = list(generator.initial_items()) + list(generator.churn_items(args.churn_rounds))
+        domain_ids = {0}
+        expected_participants = generator.live_participant_keys()
+        expected_endpoints = generator.live_endpoint_keys()
+
+    if args.trace_memory:
+        tracemalloc.start()
+
+    worker_thread = QThread()
+    data = dds_data.DdsData()
+    data.moveToThread(worker_thread)
+    worker_thread.start()
+
+    participantModel = ParticipantTreeModel(ParticipantTreeNode("Root"))
+    for domain_id in sorted(domain_ids):
+        data.add_domain(domain_id, observe=False)
+        participantModel.addDomain(domain_id)
+
+    probe = StableModelProbe(expected_participants, expected_endpoints)
+    data.new_participants_signal.connect(probe.new_participants, Qt.ConnectionType.QueuedConnection)
+    data.removed_participants_signal.connect(probe.removed_participants, Qt.ConnectionType.QueuedConnection)
+    data.new_endpoints_signal.connect(probe.new_endpoints, Qt.ConnectionType.QueuedConnection)
+    data.removed_endpoints_signal.connect(probe.removed_endpoints, Qt.ConnectionType.QueuedConnection)
+    data.discovery_delivered_signal.connect(probe.delivered, Qt.ConnectionType.QueuedConnection)
+
+    QTimer.singleShot(int(args.timeout * 1000), app.quit)
+
+    probe.start_time = time.perf_counter()
+    samples = generator.push(data.queue, items)
+    push_time = time.perf_counter()
+
+    app.exec()
+
+    peak_memory = None
+    if args.trace_memory:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    data.join_observer()
+    worker_thread.quit()
+    worker_thread.wait()
+
+    print(f"items:                {len(items)}")
+    print(f"samples:              {samples}")
+    print(f"final participants:   {len(probe.expected_participants)}")
+    print(f"final endpoints:      {len(probe.expected_endpoints)}")
+    print(f"push time:            {(push_time - probe.start_time) * 1000:10.1f} ms")
+    if probe.stable_time > 0.0:
+        elapsed = probe.stable_time - probe.start_time
+        print(f"time to stable model: {elapsed * 1000:10.1f} ms")
+        print(f"ingest throughput:    {samples / elapsed:10.0f} samples/s")
+    else:
+        print(f"time to stable model: not reached within {args.timeout} s")
+    print(f"latency max:          {probe.latency_max_ms:10.1f} ms")
+    if peak_memory is not None:
+        print(f"peak memory:          {peak_memory / (1024 * 1024):10.1f} MiB")
+    else:
+        print("peak memory:          n/a (use --trace-memory)")
+
+
+if __name__ == "__main__":
+    main()
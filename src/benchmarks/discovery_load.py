@@ -0,0 +1,146 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+# Synthetic discovery traffic. Builds DcpsParticipant / DcpsEndpoint samples
+# and packs them into BuiltInDataItem batches the same way BuiltInObserver
+# does, so they can be put into DdsData.queue without a real network.
+
+import random
+import time
+import uuid
+from queue import Queue
+from typing import Dict, Iterator, List, Set, Tuple
+from cyclonedds.builtin import DcpsEndpoint, DcpsParticipant
+from cyclonedds.core import Qos, Policy
+from cyclonedds.util import duration
+
+from dds_access.builtin_observer import BuiltInDataItem
+from dds_access.datatypes.entity_type import EntityType
+
+
+class DiscoveryLoadGenerator:
+
+    def __init__(self,
+                 domain_id: int = 0,
+                 participants: int = 1000,
+                 topics: int = 200,
+                 endpoints_per_participant: int = 10,
+                 qos_profiles: int = 8,
+                 hosts: int = 50,
+                 churn: float = 0.0,
+                 batch_size: int = 50,
+                 seed: int = 0):
+        self.domain_id = domain_id
+        self.participant_count = participants
+        self.topic_count = max(1, topics)
+        self.endpoints_per_participant = endpoints_per_participant
+        self.qos_profile_count = max(1, qos_profiles)
+        self.host_count = max(1, hosts)
+        self.churn = churn
+        self.batch_size = max(1, batch_size)
+        self.random = random.Random(seed)
+
+        # Participant key -> (participant, endpoints)
+        self.live: Dict[str, Tuple[DcpsParticipant, List[DcpsEndpoint]]] = {}
+        self.next_pid = 1000
+
+    def make_participant(self) -> DcpsParticipant:
+        self.next_pid += 1
+        host = self.random.randrange(self.host_count)
+        return DcpsParticipant(
+            key=uuid.UUID(int=self.random.getrandbits(128)),
+            qos=Qos(
+                Policy.Property("__Hostname", f"host_{host}"),
+                Policy.Property("__ProcessName", f"/opt/bench/app_{self.next_pid % 97}"),
+                Policy.Property("__Pid", str(self.next_pid)),
+                Policy.Property("__NetworkAddresses", f"udp/10.0.{host // 256}.{host % 256}:7410"),
+                Policy.EntityName(name=f"participant_{self.next_pid}")))
+
+    def make_qos(self, profile: int) -> Qos:
+        return Qos(
+            Policy.Reliability.Reliable(duration(milliseconds=100)) if profile % 3 else Policy.Reliability.BestEffort,
+            Policy.Durability.TransientLocal if profile % 2 else Policy.Durability.Volatile,
+            Policy.History.KeepLast(1 + profile),
+            Policy.Deadline(duration(infinite=True)),
+            Policy.Ownership.Shared,
+            Policy.Liveliness.Automatic(duration(infinite=True)),
+            Policy.DestinationOrder.ByReceptionTimestamp,
+            Policy.Partition(partitions=[f"partition_{profile % 4}"]),
+            Policy.DataRepresentation(use_cdrv0_representation=True, use_xcdrv2_representation=True))
+
+    def make_endpoints(self, participant: DcpsParticipant, handle: int) -> List[Tuple[DcpsEndpoint, EntityType]]:
+        endpoints = []
+        for _ in range(self.endpoints_per_participant):
+            topic = self.random.randrange(self.topic_count)
+            endpoint = DcpsEndpoint(
+                key=uuid.UUID(int=self.random.getrandbits(128)),
+                participant_key=participant.key,
+                participant_instance_handle=handle,
+                topic_name=f"bench_topic_{topic}",
+                type_name=f"bench::Type_{topic}",
+                qos=self.make_qos(self.random.randrange(self.qos_profile_count)),
+                type_id=None)
+            endpoints.append((endpoint, EntityType.READER if self.random.random() < 0.5 else EntityType.WRITER))
+        return endpoints
+
+    def add_to_item(self, item: BuiltInDataItem):
+        participant = self.make_participant()
+        endpoints = self.make_endpoints(participant, len(self.live))
+        self.live[str(participant.key)] = (participant, [endp for (endp, _) in endpoints])
+        item.new_participants.append((self.domain_id, participant))
+        for (endp, entity_type) in endpoints:
+            item.new_endpoints.append((self.domain_id, endp, entity_type))
+
+    def remove_to_item(self, item: BuiltInDataItem, participant_key: str):
+        participant, endpoints = self.live.pop(participant_key)
+        for endp in endpoints:
+            item.remove_endpoints.append((self.domain_id, endp))
+        item.remove_participants.append((self.domain_id, participant))
+
+    def initial_items(self) -> Iterator[BuiltInDataItem]:
+        """Brings up all participants, batch_size participants per item."""
+        remaining = self.participant_count - len(self.live)
+        while remaining > 0:
+            item = BuiltInDataItem()
+            for _ in range(min(self.batch_size, remaining)):
+                self.add_to_item(item)
+                remaining -= 1
+            yield item
+
+    def churn_items(self, rounds: int) -> Iterator[BuiltInDataItem]:
+        """Each round restarts the churn fraction of participants with new keys."""
+        for _ in range(rounds):
+            restart_count = int(len(self.live) * self.churn)
+            restarted = self.random.sample(list(self.live.keys()), restart_count)
+            for offset in range(0, restart_count, self.batch_size):
+                item = BuiltInDataItem()
+                for participant_key in restarted[offset:offset + self.batch_size]:
+                    self.remove_to_item(item, participant_key)
+                    self.add_to_item(item)
+                yield item
+
+    def push(self, queue: Queue, items: Iterator[BuiltInDataItem]) -> int:
+        """Puts the items into the queue and returns the number of samples."""
+        samples = 0
+        for item in items:
+            samples += (len(item.new_participants) + len(item.remove_participants) +
+                        len(item.new_endpoints) + len(item.remove_endpoints))
+            # Taken now, as far as the latency measurement is concerned
+            item.timestamp = time.monotonic()
+            queue.put(item)
+        return samples
+
+    def live_participant_keys(self) -> Set[str]:
+        return set(self.live.keys())
+
+    def live_endpoint_keys(self) -> Set[str]:
+        return {str(endp.key) for (_, endpoints) in self.live.values() for endp in endpoints}
@@ -0,0 +1,69 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+# Feeds endpoints before their participants into a DataDomain (the usual
+# order on a busy network) and reports the time per participant arrival.
+# With deferred linking it stays flat when the participant count grows.
+#
+# Usage (from src): python -m benchmarks.discovery_scaling --participants 5000
+
+import argparse
+import time
+import uuid
+from cyclonedds.builtin import DcpsEndpoint, DcpsParticipant
+from cyclonedds.core import Qos, Policy
+
+from dds_access.dds_data import DataDomain, DataEndpoint
+from dds_access.datatypes.entity_type import EntityType
+
+
+def run(participant_count: int, endpoints_per_participant: int, topic_count: int):
+    domain = DataDomain(0)
+
+    participants = [DcpsParticipant(key=uuid.uuid4(), qos=Qos()) for _ in range(participant_count)]
+    for p_idx, participant in enumerate(participants):
+        for e_idx in range(endpoints_per_participant):
+            endpoint = DcpsEndpoint(
+                key=uuid.uuid4(),
+                participant_key=participant.key,
+                participant_instance_handle=p_idx,
+                topic_name=f"topic_{(p_idx + e_idx) % topic_count}",
+                type_name="bench::Type",
+                qos=Qos(Policy.Reliability.Reliable(0)),
+                type_id=None)
+            domain.add_endpoint(DataEndpoint(endpoint, EntityType.READER if e_idx % 2 else EntityType.WRITER))
+
+    start = time.perf_counter()
+    for participant in participants:
+        domain.add_participant(participant)
+    elapsed = time.perf_counter() - start
+
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Participant linking scaling benchmark")
+    parser.add_argument("--participants", type=int, default=5000)
+    parser.add_argument("--endpoints-per-participant", type=int, default=4)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--steps", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'participants':>12} {'endpoints':>10} {'total ms':>10} {'us/participant':>15}")
+    for step in range(1, args.steps + 1):
+        count = args.participants * step // args.steps
+        elapsed = run(count, args.endpoints_per_participant, args.topics)
+        print(f"{count:>12} {count * args.endpoints_per_participant:>10} {elapsed * 1000:>10.1f} {elapsed / count * 1e6:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
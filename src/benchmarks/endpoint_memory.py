@@ -0,0 +1,109 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+# Compares the resident memory per endpoint of retained DcpsEndpoint samples
+# with the compact EndpointRecord based DataEndpoint. Every endpoint has its
+# own EntityName and a real type id, as endpoints of real applications do.
+#
+# Exits with 1 when the ratio is below --target, 5x by default.
+#
+# Usage (from src): python -m benchmarks.endpoint_memory --endpoints 20000 --qos-profiles 8
+
+import argparse
+import gc
+import sys
+import tracemalloc
+import uuid
+from cyclonedds.builtin import DcpsEndpoint
+from cyclonedds.core import Qos, Policy
+from cyclonedds.util import duration
+from cyclonedds.idl import make_idl_struct, types
+
+from dds_access.dds_data import DataEndpoint
+from dds_access.datatypes.entity_type import EntityType
+
+
+def make_qos(profile: int, idx: int) -> Qos:
+    # A new Qos per sample, as deserializing a builtin sample does
+    return Qos(
+        Policy.Reliability.Reliable(duration(milliseconds=100)),
+        Policy.Durability.TransientLocal if profile % 2 else Policy.Durability.Volatile,
+        Policy.History.KeepLast(1 + profile),
+        Policy.Deadline(duration(infinite=True)),
+        Policy.LatencyBudget(duration(seconds=0)),
+        Policy.Ownership.Shared,
+        Policy.Liveliness.Automatic(duration(infinite=True)),
+        Policy.DestinationOrder.ByReceptionTimestamp,
+        Policy.ResourceLimits(max_samples=-1, max_instances=-1, max_samples_per_instance=-1),
+        Policy.Partition(partitions=[f"partition_{profile}"]),
+        Policy.DataRepresentation(use_cdrv0_representation=True, use_xcdrv2_representation=True),
+        Policy.EntityName(name=f"endpoint_{idx}"))
+
+
+def make_type_ids(count: int) -> list:
+    type_ids = []
+    for idx in range(count):
+        data_type = make_idl_struct(f"Type_{idx}", f"bench::Type_{idx}", {
+            "id": types.int32, "value": types.float64, "name": str})
+        type_ids.append(data_type.__idl__.get_type_id())
+    return type_ids
+
+
+def make_endpoints(count: int, profiles: int):
+    participant_keys = [uuid.uuid4() for _ in range(max(1, count // 10))]
+    type_ids = make_type_ids(min(count, 500))
+    return [DcpsEndpoint(
+        key=uuid.uuid4(),
+        participant_key=participant_keys[idx % len(participant_keys)],
+        participant_instance_handle=idx,
+        topic_name=f"topic_{idx % 500}",
+        type_name=f"bench::Type_{idx % 500}",
+        qos=make_qos(idx % profiles, idx),
+        # A new type id per sample, as deserializing a builtin sample does
+        type_id=type_ids[idx % len(type_ids)].deserialize(type_ids[idx % len(type_ids)].serialize()))
+        for idx in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Endpoint memory benchmark")
+    parser.add_argument("--endpoints", type=int, default=20000)
+    parser.add_argument("--qos-profiles", type=int, default=8)
+    parser.add_argument("--target", type=float, default=5.0)
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+
+    base, _ = tracemalloc.get_traced_memory()
+    endpoints = make_endpoints(args.endpoints, args.qos_profiles)
+    gc.collect()
+    dcps_bytes = tracemalloc.get_traced_memory()[0] - base
+
+    base, _ = tracemalloc.get_traced_memory()
+    records = [DataEndpoint(endp, EntityType.READER) for endp in endpoints]
+    del endpoints
+    gc.collect()
+    record_bytes = tracemalloc.get_traced_memory()[0] - base + dcps_bytes
+
+    tracemalloc.stop()
+
+    print(f"endpoints:          {args.endpoints}")
+    print(f"qos profiles:       {args.qos_profiles}")
+    print(f"DcpsEndpoint:       {dcps_bytes / args.endpoints:10.1f} bytes/endpoint")
+    print(f"DataEndpoint:       {record_bytes / len(records):10.1f} bytes/endpoint")
+    ratio = dcps_bytes / max(1, record_bytes)
+    print(f"ratio:              {ratio:10.1f}x (target {args.target:.1f}x)")
+    sys.exit(0 if ratio >= args.target else 1)
+
+
+if __name__ == "__main__":
+    main()
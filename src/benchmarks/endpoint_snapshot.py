@@ -0,0 +1,78 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+# Compares the allocations per endpoint of the former deepcopy hand over
+# with the EndpointSnapshot hand over.
+#
+# Usage (from src): python -m benchmarks.endpoint_snapshot --endpoints 10000
+
+import argparse
+import copy
+import tracemalloc
+import uuid
+from cyclonedds.builtin import DcpsEndpoint, DcpsParticipant
+from cyclonedds.core import Qos, Policy
+
+from dds_access.dds_data import DataEndpoint
+from dds_access.datatypes.entity_type import EntityType
+
+
+def make_endpoints(count: int):
+    participant = DcpsParticipant(
+        key=uuid.uuid4(),
+        qos=Qos(Policy.Property("__Hostname", "bench-host"),
+                Policy.Property("__ProcessName", "bench"),
+                Policy.Property("__Pid", "1")))
+    endpoints = []
+    for idx in range(count):
+        endpoint = DcpsEndpoint(
+            key=uuid.uuid4(),
+            participant_key=participant.key,
+            participant_instance_handle=idx,
+            topic_name=f"topic_{idx % 100}",
+            type_name="bench::Type",
+            qos=Qos(Policy.Reliability.Reliable(0),
+                    Policy.Durability.TransientLocal,
+                    Policy.History.KeepLast(10),
+                    Policy.Partition(partitions=["a", "b"])),
+            type_id=None)
+        endpoints.append(DataEndpoint(endpoint, EntityType.READER if idx % 2 else EntityType.WRITER))
+    return (participant, endpoints)
+
+
+def measure(endpoints, handover) -> int:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    handed = [handover(endp) for endp in endpoints]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del handed
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Endpoint hand over allocation benchmark")
+    parser.add_argument("--endpoints", type=int, default=10000)
+    args = parser.parse_args()
+
+    (participant, endpoints) = make_endpoints(args.endpoints)
+
+    deepcopy_bytes = measure(endpoints, copy.deepcopy)
+    snapshot_bytes = measure(endpoints, lambda endp: endp.snapshot(participant))
+
+    print(f"endpoints:          {args.endpoints}")
+    print(f"deepcopy:           {deepcopy_bytes / args.endpoints:10.1f} bytes/endpoint")
+    print(f"snapshot:           {snapshot_bytes / args.endpoints:10.1f} bytes/endpoint")
+
+
+if __name__ == "__main__":
+    main()
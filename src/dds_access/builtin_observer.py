@@ -11,8 +11,10 @@
 """
 
 import sys
+import threading
+import time
 from loguru import logger as logging
-from queue import Queue
+from queue import Queue, Full
 from PySide6.QtCore import QThread
 from cyclonedds import core, builtin, internal
 from cyclonedds.util import duration
@@ -22,22 +24,18 @@ from cyclonedds.topic import Topic
 from cyclonedds.sub import Subscriber, DataReader
 from dds_access.datatypes.ospl import kernelModule
 from dds_access.datatypes.ospl.utils import from_ospl
-from typing import Tuple
+from typing import Dict, Optional, Set, Tuple
 from dds_access.domain_participant_factory import DomainParticipantFactory
 from dds_access.datatypes.entity_type import EntityType
-
-
-IGNORE_TOPICS = [
-                # DDS-Spec
-                "DCPSParticipant", "DCPSPublication", "DCPSSubscription",
-                # OSPL-BuiltIn-Topics
-                "CMParticipant", "CMDataReader", "CMDataWriter", "CMSubscriber", "CMPublisher",
-                "DCPSTopic", "DCPSType", "DCPSHeartbeat", "DCPSCandMCommand", "DCPSDelivery"]
+from dds_access.discovery_filter import DiscoveryFilter
 
 
 class BuiltInDataItem():
 
     def __init__(self):
+        # Monotonic time the samples were taken, used to measure delivery latency
+        self.timestamp: float = time.monotonic()
+
         # Participants
         self.new_participants: Tuple[int, DcpsParticipant] = []
         self.remove_participants: Tuple[int, DcpsParticipant] = []
@@ -50,118 +48,196 @@ class BuiltInDataItem():
         self.new_endpoints: Tuple[int, DcpsEndpoint, EntityType] = []
         self.remove_endpoints: Tuple[int, DcpsEndpoint] = []
 
+    def empty(self) -> bool:
+        return not (self.new_participants or self.remove_participants or self.update_participants or
+                    self.new_topics or self.new_endpoints or self.remove_endpoints)
+
+
+class BuiltInDomainReaders:
+    """The builtin readers of one observed domain."""
+
+    def __init__(self, domain_id: int, listener: core.Listener):
+        self.domain_id = domain_id
+        self.participant_ref = DomainParticipantFactory.get_participant(domain_id)
+        domain_participant = self.participant_ref.__enter__()
+
+        any_state = core.SampleState.Any | core.ViewState.Any | core.InstanceState.Any
+
+        self.rdp = builtin.BuiltinDataReader(domain_participant, builtin.BuiltinTopicDcpsParticipant, listener=listener)
+        self.rcp = core.ReadCondition(self.rdp, any_state)
+
+        self.rdw = builtin.BuiltinDataReader(domain_participant, builtin.BuiltinTopicDcpsPublication, listener=listener)
+        self.rcw = core.ReadCondition(self.rdw, any_state)
+
+        self.rdr = builtin.BuiltinDataReader(domain_participant, builtin.BuiltinTopicDcpsSubscription, listener=listener)
+        self.rcr = core.ReadCondition(self.rdr, any_state)
+
+        self.rdt = None
+        self.rct = None
+        if internal.feature_topic_discovery:
+            self.rdt = builtin.BuiltinDataReader(domain_participant, builtin.BuiltinTopicDcpsTopic, listener=listener)
+            self.rct = core.ReadCondition(self.rdt, any_state)
+
+        # OpenSplice-BuiltIn
+        sys.modules["kernelModule"] = kernelModule
+        ospl_qos = Qos(
+            Policy.Ownership.Shared,
+            Policy.Durability.TransientLocal,
+            Policy.Reliability.Reliable(max_blocking_time=duration(milliseconds=0)),
+            Policy.History.KeepAll,
+            Policy.Partition(partitions=["__BUILT-IN PARTITION__"]),
+            Policy.EntityName(name="CMParticipantReader"),
+            Policy.DataRepresentation(use_cdrv0_representation=True, use_xcdrv2_representation=False))
+        self.ospl_topic = Topic(domain_participant, "CMParticipant", kernelModule.v_participantCMInfo, qos=ospl_qos)
+        self.ospl_subscriber = Subscriber(domain_participant, qos=ospl_qos)
+        self.ospl_reader = DataReader(self.ospl_subscriber, self.ospl_topic, qos=ospl_qos, listener=listener)
+        self.ospl_read_condition = core.ReadCondition(self.ospl_reader, any_state)
+
+    def take_all(self, reader, condition) -> list:
+        samples = []
+        while True:
+            taken = reader.take(condition=condition)
+            if len(taken) == 0:
+                return samples
+            samples.extend(taken)
+
+    def take(self, dataItem: BuiltInDataItem, discovery_filter: DiscoveryFilter):
+        for p in self.take_all(self.rdp, self.rcp):
+            if p.sample_info.sample_state == core.SampleState.NotRead and p.sample_info.instance_state == core.InstanceState.Alive:
+                if discovery_filter.acceptParticipant(p):
+                    logging.trace(str(p))
+                    dataItem.new_participants.append((self.domain_id, p))
+                for endpoint in discovery_filter.withdrawUnchecked(p):
+                    dataItem.remove_endpoints.append((self.domain_id, endpoint))
+            elif p.sample_info.instance_state == core.InstanceState.NotAliveDisposed:
+                if discovery_filter.acceptRemovedParticipant(p):
+                    dataItem.remove_participants.append((self.domain_id, p))
+
+        for (reader, condition, entity_type) in ((self.rdw, self.rcw, EntityType.WRITER), (self.rdr, self.rcr, EntityType.READER)):
+            for endpoint in self.take_all(reader, condition):
+                if endpoint.sample_info.sample_state == core.SampleState.NotRead and endpoint.sample_info.instance_state == core.InstanceState.Alive:
+                    if discovery_filter.acceptEndpoint(endpoint):
+                        logging.trace(str(endpoint))
+                        dataItem.new_endpoints.append((self.domain_id, endpoint, entity_type))
+                elif endpoint.sample_info.instance_state == core.InstanceState.NotAliveDisposed:
+                    if discovery_filter.acceptRemovedEndpoint(endpoint):
+                        dataItem.remove_endpoints.append((self.domain_id, endpoint))
+
+        if self.rdt is not None:
+            for topic in self.take_all(self.rdt, self.rct):
+                if topic.sample_info.sample_state == core.SampleState.NotRead and topic.sample_info.instance_state == core.InstanceState.Alive:
+                    if discovery_filter.acceptTopic(topic.topic_name):
+                        logging.trace(str(topic))
+                        dataItem.new_topics.append((self.domain_id, topic))
+                elif topic.sample_info.instance_state == core.InstanceState.NotAliveDisposed:
+                    pass # topics are automatically removed when last endpoint is gone
+
+        for ospl_participant in self.take_all(self.ospl_reader, self.ospl_read_condition):
+            if ospl_participant.sample_info.sample_state == core.SampleState.NotRead and ospl_participant.sample_info.instance_state == core.InstanceState.Alive:
+                p_update = from_ospl(ospl_participant)
+                if p_update and str(p_update.key) not in discovery_filter.rejected_participants:
+                    dataItem.update_participants.append((self.domain_id, p_update))
+
+    def close(self):
+        self.rdp = self.rcp = self.rdw = self.rcw = self.rdr = self.rcr = self.rdt = self.rct = None
+        self.ospl_read_condition = self.ospl_reader = self.ospl_subscriber = self.ospl_topic = None
+        self.participant_ref.__exit__(None, None, None)
+
 
 class BuiltInObserver(QThread):
+    """One thread observing the builtin topics of all domains.
+
+    The builtin readers of every domain share a data available listener that
+    only marks the domain as pending, the thread takes the samples of all
+    pending domains per wakeup. Adding or removing a domain creates or
+    deletes its readers and does not start or stop a thread. Samples rejected
+    by the DiscoveryFilter are dropped here and never reach the queue.
+    """
 
-    def __init__(self, domain_id: int, queue: Queue):
+    def __init__(self, queue: Queue, journal=None, discovery_filter: Optional[DiscoveryFilter] = None):
         super().__init__()
-        self.domain_id = domain_id
         self.queue = queue
-        self.running = False
-        self.guardCondition = None
+        self.journal = journal
+        self.discovery_filter = discovery_filter if discovery_filter is not None else DiscoveryFilter()
+        # Set here and not in run(), a stop() before the thread runs must stick
+        self.running = True
+        self.domains: Dict[int, BuiltInDomainReaders] = {}
+        self.pending: Set[int] = set()
+        self.condition = threading.Condition()
+        # Held while taking, so a domain's readers are not deleted underneath
+        self.take_lock = threading.Lock()
+
+    def add_domain(self, domain_id: int):
+        logging.info(f"builtin_observer add domain {domain_id}")
+        listener = core.Listener(on_data_available=lambda _: self.notify(domain_id))
+        readers = BuiltInDomainReaders(domain_id, listener)
+        with self.condition:
+            self.domains[domain_id] = readers
+            # Samples may have arrived before the listener could find the domain
+            self.pending.add(domain_id)
+            self.condition.notify()
+
+    def remove_domain(self, domain_id: int):
+        logging.info(f"builtin_observer remove domain {domain_id}")
+        with self.take_lock:
+            with self.condition:
+                readers = self.domains.pop(domain_id, None)
+                self.pending.discard(domain_id)
+            if readers is not None:
+                readers.close()
+
+    def notify(self, domain_id: int):
+        # Called on the cyclonedds listener threads, keep it short
+        with self.condition:
+            self.pending.add(domain_id)
+            self.condition.notify()
 
     def stop(self):
-        self.running = False
-        if self.guardCondition is not None:
-            self.guardCondition.set(True)
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+
+    def put(self, dataItem: BuiltInDataItem):
+        # The queue is bounded: while it is full, stop taking samples and let
+        # the builtin readers keep only the latest state per instance
+        while self.running:
+            try:
+                self.queue.put(dataItem, timeout=0.5)
+                return
+            except Full:
+                logging.debug("builtin_observer discovery queue full")
 
     def run(self):
-        logging.info(f"builtin_observer({self.domain_id}) ...")
-        self.running = True
-
-        with DomainParticipantFactory.get_participant(self.domain_id) as domain_participant:
-
-            waitset = core.WaitSet(domain_participant)
-
-            self.guardCondition = core.GuardCondition(domain_participant)
-            waitset.attach(self.guardCondition)
-
-            rdp = builtin.BuiltinDataReader(domain_participant, builtin.BuiltinTopicDcpsParticipant)
-            rcp = core.ReadCondition(
-                rdp, core.SampleState.Any | core.ViewState.Any | core.InstanceState.Any)
-            waitset.attach(rcp)
-
-            rdw = builtin.BuiltinDataReader(domain_participant, builtin.BuiltinTopicDcpsPublication)
-            rcw = core.ReadCondition(
-                rdw, core.SampleState.Any | core.ViewState.Any | core.InstanceState.Any)
-            waitset.attach(rcw)
-
-            rdr = builtin.BuiltinDataReader(domain_participant, builtin.BuiltinTopicDcpsSubscription)
-            rcr = core.ReadCondition(
-                rdr, core.SampleState.Any | core.ViewState.Any | core.InstanceState.Any)
-            waitset.attach(rcr)
-
-            if internal.feature_topic_discovery:
-                rdt = builtin.BuiltinDataReader(domain_participant, builtin.BuiltinTopicDcpsTopic)
-                rct = core.ReadCondition(rdt, core.SampleState.Any | core.ViewState.Any | core.InstanceState.Any)
-                waitset.attach(rct)
-
-            # OpenSplice-BuiltIn
-            sys.modules["kernelModule"] = kernelModule
-            ospl_qos = Qos(
-                Policy.Ownership.Shared,
-                Policy.Durability.TransientLocal,
-                Policy.Reliability.Reliable(max_blocking_time=duration(milliseconds=0)),
-                Policy.History.KeepAll,
-                Policy.Partition(partitions=["__BUILT-IN PARTITION__"]),
-                Policy.EntityName(name="CMParticipantReader"),
-                Policy.DataRepresentation(use_cdrv0_representation=True, use_xcdrv2_representation=False))
-            ospl_topic = Topic(domain_participant, "CMParticipant", kernelModule.v_participantCMInfo, qos=ospl_qos)
-            ospl_subscriber = Subscriber(domain_participant, qos=ospl_qos)
-            ospl_reader = DataReader(ospl_subscriber, ospl_topic, qos=ospl_qos)
-            ospl_read_condition = core.ReadCondition(ospl_reader, core.SampleState.Any | core.ViewState.Any | core.InstanceState.Any)
-            waitset.attach(ospl_read_condition)
-
-            while self.running:
-
-                amount_triggered = 0
-                try:
-                    amount_triggered = waitset.wait(duration(infinite=True))
-                except Exception as e:
-                    logging.error(str(e))
-                if amount_triggered == 0:
-                    continue
-
-                dataItem = BuiltInDataItem()
-
-                for p in rdp.take(condition=rcp):
-                    if p.sample_info.sample_state == core.SampleState.NotRead and p.sample_info.instance_state == core.InstanceState.Alive:
-                        logging.trace(str(p))
-                        dataItem.new_participants.append((self.domain_id, p))
-                    elif p.sample_info.instance_state == core.InstanceState.NotAliveDisposed:
-                        dataItem.remove_participants.append((self.domain_id, p))
-
-                for pub in rdw.take(condition=rcw):
-                    if pub.sample_info.sample_state == core.SampleState.NotRead and pub.sample_info.instance_state == core.InstanceState.Alive:
-                        if pub.topic_name not in IGNORE_TOPICS:
-                            logging.trace(str(pub))
-                            dataItem.new_endpoints.append((self.domain_id, pub, EntityType.WRITER))
-                    elif pub.sample_info.instance_state == core.InstanceState.NotAliveDisposed:
-                        dataItem.remove_endpoints.append((self.domain_id, pub))
-
-                for sub in rdr.take(condition=rcr):
-                    if sub.sample_info.sample_state == core.SampleState.NotRead and sub.sample_info.instance_state == core.InstanceState.Alive:
-                        if sub.topic_name not in IGNORE_TOPICS:
-                            logging.trace(str(sub))
-                            dataItem.new_endpoints.append((self.domain_id, sub, EntityType.READER))
-                    elif sub.sample_info.instance_state == core.InstanceState.NotAliveDisposed:
-                        dataItem.remove_endpoints.append((self.domain_id, sub))
-
-                if internal.feature_topic_discovery:
-                    for topic in rdt.take(condition=rct):
-                        if topic.sample_info.sample_state == core.SampleState.NotRead and topic.sample_info.instance_state == core.InstanceState.Alive:
-                            if topic.topic_name not in IGNORE_TOPICS:
-                                logging.trace(str(topic))
-                                dataItem.new_topics.append((self.domain_id, topic))
-                        elif topic.sample_info.instance_state == core.InstanceState.NotAliveDisposed:
-                            pass # topics are automatically removed when last endpoint is gone
-
-                for ospl_participant in ospl_reader.take(condition=ospl_read_condition):
-                    if ospl_participant.sample_info.sample_state == core.SampleState.NotRead and ospl_participant.sample_info.instance_state == core.InstanceState.Alive:
-                        p_update = from_ospl(ospl_participant)
-                        if p_update:
-                            dataItem.update_participants.append((self.domain_id, p_update))
-
-                self.queue.put(dataItem)
-
-        logging.info(f"builtin_observer({self.domain_id}) ... DONE")
+        logging.info("builtin_observer ...")
+
+        while self.running:
+            with self.condition:
+                while self.running and len(self.pending) == 0:
+                    self.condition.wait()
+                pending = [self.domains[domain_id] for domain_id in self.pending if domain_id in self.domains]
+                self.pending.clear()
+
+            dataItem = BuiltInDataItem()
+            with self.take_lock:
+                for readers in pending:
+                    if readers.domain_id not in self.domains:
+                        continue
+                    try:
+                        readers.take(dataItem, self.discovery_filter)
+                    except Exception as e:
+                        logging.error(f"builtin_observer({readers.domain_id}) {str(e)}")
+
+            if dataItem.empty():
+                continue
+
+            if self.journal is not None:
+                self.journal.record(dataItem)
+
+            self.put(dataItem)
+
+        with self.condition:
+            domain_ids = list(self.domains.keys())
+        for domain_id in domain_ids:
+            self.remove_domain(domain_id)
+
+        logging.info("builtin_observer ... DONE")
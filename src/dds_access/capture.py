@@ -0,0 +1,232 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import json
+import struct
+import threading
+import time
+from loguru import logger as logging
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, Tuple
+from PySide6.QtCore import QThread
+from cyclonedds.core import Qos, Policy
+from cyclonedds.topic import Topic
+from cyclonedds.sub import Subscriber, DataReader
+from cyclonedds.pub import Publisher, DataWriter
+
+from dds_access.domain_participant_factory import DomainParticipantFactory
+from dds_access.dds_utils import hasValidData
+
+
+# A capture is a header followed by records, each a kind and payload length.
+# A stream record announces a reader and its QoS as json, the sample records
+# of that reader refer to its stream number and carry the CDR bytes of the
+# sample. Those bytes are the sample serialized again by the Python type of
+# the reader, not the bytes received: equal in content, but encoding details
+# of the writer, like padding, extensibility headers of appendable types or
+# members unknown to the reader type, are not kept. Disposes and unregisters
+# carry no data and are not captured.
+CAPTURE_MAGIC = b"CDDSCP01"
+RECORD_HEADER = struct.Struct("<BI")
+STREAM_HEADER = struct.Struct("<I")
+# stream, source timestamp ns, reception timestamp ns, instance handle
+SAMPLE_HEADER = struct.Struct("<IqqQ")
+
+RECORD_STREAM = 1
+RECORD_SAMPLE = 2
+
+# Reader policies a replay writer cannot take over
+READER_ONLY_POLICIES = (Policy.TimeBasedFilter, Policy.ReaderDataLifecycle, Policy.EntityName)
+
+
+def qos_to_dict(qos: Qos) -> Optional[dict]:
+    try:
+        return Qos(*[policy for policy in qos if not isinstance(policy, READER_ONLY_POLICIES)]).asdict()
+    except Exception as e:
+        logging.warning(f"Capture without qos: {str(e)}")
+        return None
+
+
+def qos_from_dict(info: dict, name: str) -> Optional[Qos]:
+    if info.get(name) is None:
+        return None
+    try:
+        return Qos.fromdict(info[name])
+    except Exception as e:
+        logging.warning(f"Replay ignores recorded {name}: {str(e)}")
+        return None
+
+
+class CaptureWriter:
+    """Appends the samples of listener readers to a capture file.
+
+    Shared by the dispatcher threads of all domains, record() is thread safe.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.streams: Dict[str, int] = {}
+        self.count = 0
+        self.file: Optional[BinaryIO] = open(path, "wb")
+        self.file.write(CAPTURE_MAGIC)
+        logging.info(f"Capturing samples to {path}")
+
+    def write_record(self, kind: int, payload: bytes):
+        self.file.write(RECORD_HEADER.pack(kind, len(payload)))
+        self.file.write(payload)
+
+    def stream(self, readerId: str, domain_id: int, topic: Topic, subscriber: Subscriber, reader: DataReader) -> int:
+        if readerId not in self.streams:
+            self.streams[readerId] = len(self.streams)
+            info = {"reader_id": readerId, "domain_id": domain_id, "topic_name": topic.name, "type_name": topic.typename,
+                    "topic_qos": qos_to_dict(topic.get_qos()),
+                    "subscriber_qos": qos_to_dict(subscriber.get_qos()),
+                    "reader_qos": qos_to_dict(reader.get_qos())}
+            self.write_record(RECORD_STREAM, STREAM_HEADER.pack(self.streams[readerId]) + json.dumps(info).encode("utf-8"))
+        return self.streams[readerId]
+
+    def record(self, readerId: str, domain_id: int, topic: Topic, subscriber: Subscriber, reader: DataReader, samples: list):
+        reception = time.time_ns()
+        with self.lock:
+            if self.file is None:
+                return
+            try:
+                stream = self.stream(readerId, domain_id, topic, subscriber, reader)
+            except Exception as e:
+                logging.error(f"Failed to write capture: {str(e)}")
+                return
+            for sample in samples:
+                if not hasValidData(sample):
+                    continue
+                try:
+                    info = sample.sample_info
+                    header = SAMPLE_HEADER.pack(stream, info.source_timestamp, reception, info.instance_handle)
+                    data = bytes(sample.serialize())
+                except Exception as e:
+                    logging.warning(f"Capture skips a sample of {readerId}: {str(e)}")
+                    continue
+                try:
+                    self.write_record(RECORD_SAMPLE, header + data)
+                    self.count += 1
+                except Exception as e:
+                    logging.error(f"Failed to write capture: {str(e)}")
+                    return
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+                logging.info(f"Capture {self.path} closed ({self.count} samples)")
+
+
+def read_capture(path: str) -> Iterator[Tuple[int, tuple]]:
+    """Yields (RECORD_STREAM, (stream, info)) and
+    (RECORD_SAMPLE, (stream, source ns, reception ns, instance handle, data))."""
+    with open(path, "rb") as file:
+        if file.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a sample capture")
+
+        while True:
+            header = file.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                break
+            (kind, length) = RECORD_HEADER.unpack(header)
+            payload = file.read(length)
+            if len(payload) < length:
+                break
+
+            if kind == RECORD_STREAM:
+                (stream,) = STREAM_HEADER.unpack_from(payload)
+                yield (kind, (stream, json.loads(payload[STREAM_HEADER.size:].decode("utf-8"))))
+            elif kind == RECORD_SAMPLE:
+                yield (kind, SAMPLE_HEADER.unpack_from(payload) + (payload[SAMPLE_HEADER.size:],))
+
+
+class CaptureReplay(QThread):
+    """Publishes the samples of a capture with one DataWriter per stream.
+
+    A speed of 1.0 keeps the recorded timing of the reception timestamps,
+    2.0 replays twice as fast, 0 as fast as possible. Types are looked up
+    by name with get_type, streams of unknown types are skipped. The writers
+    take over the QoS recorded for the reader of their stream.
+    """
+
+    def __init__(self, path: str, get_type: Callable[[str], object], speed: float = 1.0):
+        super().__init__()
+        self.path = path
+        self.get_type = get_type
+        self.speed = speed
+        self.running = False
+        # Set by stop(), wakes the thread while it waits for the next sample
+        self.stopped = threading.Event()
+
+    def stop(self):
+        self.running = False
+        self.stopped.set()
+
+    def createWriter(self, info: dict, participants: dict):
+        data_type = self.get_type(info["type_name"])
+        if data_type is None:
+            logging.error(f"Replay skips topic {info['topic_name']}, unknown type {info['type_name']}")
+            return None
+
+        domain_id = info["domain_id"]
+        if domain_id not in participants:
+            participant_ref = DomainParticipantFactory.get_participant(domain_id)
+            participants[domain_id] = (participant_ref, participant_ref.__enter__())
+        (_, domain_participant) = participants[domain_id]
+
+        topic = Topic(domain_participant, info["topic_name"], data_type, qos=qos_from_dict(info, "topic_qos"))
+        publisher = Publisher(domain_participant, qos=qos_from_dict(info, "subscriber_qos"))
+        return (data_type, topic, publisher, DataWriter(publisher, topic, qos=qos_from_dict(info, "reader_qos")))
+
+    def run(self):
+        logging.info(f"Replay capture {self.path} (speed: {self.speed}) ...")
+        self.running = True
+        participants = {}
+        writers = {}
+        start = time.monotonic()
+        first_reception = None
+        count = 0
+        try:
+            for (kind, record) in read_capture(self.path):
+                if not self.running:
+                    break
+
+                if kind == RECORD_STREAM:
+                    (stream, info) = record
+                    writers[stream] = self.createWriter(info, participants)
+                    continue
+
+                (stream, _, reception, _, data) = record
+                if writers.get(stream) is None:
+                    continue
+
+                if first_reception is None:
+                    first_reception = reception
+                if self.speed > 0:
+                    delay = start + (reception - first_reception) / 1e9 / self.speed - time.monotonic()
+                    if delay > 0 and self.stopped.wait(delay):
+                        break
+
+                (data_type, _, _, writer) = writers[stream]
+                writer.write(data_type.deserialize(data))
+                count += 1
+        except Exception as e:
+            logging.error(f"Failed to replay capture: {str(e)}")
+
+        writers.clear()
+        for (participant_ref, _) in participants.values():
+            participant_ref.__exit__(None, None, None)
+
+        logging.info(f"Replay capture {self.path} ... DONE ({count} samples)")
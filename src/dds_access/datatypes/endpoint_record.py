@@ -0,0 +1,90 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import sys
+import weakref
+from typing import Tuple
+from cyclonedds.builtin import DcpsEndpoint
+from cyclonedds.core import Qos, Policy
+
+
+# Policies that name or describe a single endpoint, they are kept per record
+# and not in the shared part of the QoS
+ENDPOINT_POLICIES = (Policy.EntityName, Policy.UserData, Policy.Property)
+
+# Distinct QoS and type ids seen during discovery. Large systems use a
+# handful of QoS profiles and types, records hold the shared instance. The
+# pools are weak, an entry goes away with the last record referring to it.
+_qos_pool: "weakref.WeakValueDictionary[str, Qos]" = weakref.WeakValueDictionary()
+_type_id_pool: "weakref.WeakValueDictionary[bytes, object]" = weakref.WeakValueDictionary()
+
+
+def _split_qos(q: Qos) -> Tuple[Qos, tuple]:
+    shared = []
+    own = []
+    for policy in q:
+        (own if isinstance(policy, ENDPOINT_POLICIES) else shared).append(policy)
+    shared_qos = Qos(*shared)
+    qos_key = str(shared_qos)
+    pooled = _qos_pool.get(qos_key)
+    if pooled is None:
+        _qos_pool[qos_key] = pooled = shared_qos
+    return (pooled, tuple(own))
+
+
+def _shared_type_id(type_id):
+    if not type_id:
+        return None
+    try:
+        type_id_key = bytes(type_id.serialize())
+    except Exception:
+        return type_id
+    pooled = _type_id_pool.get(type_id_key)
+    if pooled is None:
+        _type_id_pool[type_id_key] = pooled = type_id
+    return pooled
+
+
+class EndpointRecord:
+    """Compact, immutable discovery record of a reader or writer.
+
+    Offers the DcpsEndpoint attributes the application uses. The key is kept
+    as a string, the very object the endpoint indexes of DataDomain and the
+    models are keyed by. Names are interned, the type id and the QoS apart
+    from the endpoint's own policies are shared with the other records.
+
+    The QoS is kept, not fetched on demand: the builtin sample is taken and
+    gone, there is nothing left to fetch it from. Shared, it costs a record
+    one reference plus its own policies.
+    """
+    __slots__ = ("key", "participant_key", "participant_instance_handle", "topic_name", "type_name",
+                 "type_id", "partitions", "_shared_qos", "_own_policies")
+
+    def __init__(self, endpoint: DcpsEndpoint) -> None:
+        self.key: str = str(endpoint.key)
+        self.participant_key: str = sys.intern(str(endpoint.participant_key))
+        self.participant_instance_handle: int = endpoint.participant_instance_handle
+        self.topic_name: str = sys.intern(str(endpoint.topic_name))
+        self.type_name: str = sys.intern(str(endpoint.type_name))
+        self.type_id = _shared_type_id(endpoint.type_id)
+        self.partitions: Tuple[str, ...] = ()
+        if Policy.Partition in endpoint.qos:
+            self.partitions = tuple(sys.intern(str(p)) for p in endpoint.qos[Policy.Partition].partitions)
+        self._shared_qos: Qos
+        self._own_policies: tuple
+        (self._shared_qos, self._own_policies) = _split_qos(endpoint.qos)
+
+    @property
+    def qos(self) -> Qos:
+        if len(self._own_policies) == 0:
+            return self._shared_qos
+        return Qos(*self._shared_qos, *self._own_policies)
@@ -0,0 +1,71 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+from cyclonedds.builtin import DcpsParticipant
+
+from dds_access.dds_utils import (getProperty, getHostname, getAppName, getVendorInfo, isLikelyOpensplice,
+                                  PROCESS_NAMES, PIDS, ADDRESSES, DEBUG_MONITORS, UNKNOWN_VENDOR_INFO)
+
+
+class ParticipantInfo:
+    """Identity of a participant as shown by the models, parsed once from its QoS."""
+
+    __slots__ = ("qos", "hostname", "app_name", "process_name", "pid", "addresses", "debug_monitor",
+                 "vendor_name", "vendor_short_name", "vendor_picture", "is_opensplice")
+
+    def __init__(self, participant: Optional[DcpsParticipant]) -> None:
+        vendorInfo = getVendorInfo(participant) if participant is not None else UNKNOWN_VENDOR_INFO
+        processPath = getProperty(participant, PROCESS_NAMES)
+
+        self.qos = participant.qos if participant is not None else None
+        self.hostname: str = getHostname(participant)
+        self.app_name: str = getAppName(participant)
+        self.process_name: str = Path(processPath.replace("\\", f"{os.path.sep}")).stem
+        self.pid: str = getProperty(participant, PIDS)
+        self.addresses: str = getProperty(participant, ADDRESSES)
+        self.debug_monitor: str = getProperty(participant, DEBUG_MONITORS)
+        self.vendor_name: str = vendorInfo.get("name", "Unknown")
+        self.vendor_short_name: str = vendorInfo.get("short_name", "DDS")
+        self.vendor_picture: str = vendorInfo.get("picture", "")
+        self.is_opensplice: bool = isLikelyOpensplice(participant)
+
+
+UNKNOWN_PARTICIPANT_INFO = ParticipantInfo(None)
+
+# Filled by DdsData on discovery and updates and emptied on removal, the
+# models only read it. Participants not in it, like removed ones a view
+# still shows, get a ParticipantInfo that is not kept.
+_infos: Dict[uuid.UUID, ParticipantInfo] = {}
+
+
+def participant_info(participant: Optional[DcpsParticipant]) -> ParticipantInfo:
+    if participant is None:
+        return UNKNOWN_PARTICIPANT_INFO
+    info = _infos.get(participant.key)
+    # An update replaces the qos object of the participant
+    if info is None or info.qos is not participant.qos:
+        info = ParticipantInfo(participant)
+    return info
+
+
+def remember_participant_info(participant: DcpsParticipant):
+    info = _infos.get(participant.key)
+    if info is None or info.qos is not participant.qos:
+        _infos[participant.key] = ParticipantInfo(participant)
+
+
+def forget_participant_info(key: uuid.UUID):
+    _infos.pop(key, None)
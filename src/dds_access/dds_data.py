@@ -10,29 +10,108 @@
  * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
 """
 
-from PySide6.QtCore import QObject, Signal, Slot, QThread, Qt
+from PySide6.QtCore import QObject, Signal, Slot, QThread, Qt, QSettings
 from cyclonedds.builtin import DcpsEndpoint, DcpsParticipant, DcpsTopic
-from cyclonedds import qos
 from loguru import logger as logging
 import time
-import copy
-from queue import Queue
-from typing import Dict, List, Optional
+from queue import Queue, Empty, Full
+from typing import Dict, List, Optional, Set, Tuple
 import gc
-import json
 
-from dds_access.builtin_observer import BuiltInObserver
-from dds_access.dds_utils import getDataType
-from dds_access.dds_qos import qos_match, dds_qos_policy_id
+from dds_access.builtin_observer import BuiltInObserver, BuiltInDataItem
+from dds_access.discovery_filter import DiscoveryFilter
+from dds_access.discovery_journal import DiscoveryJournal, DiscoveryReplay, journal_domain_ids
+from dds_access.dds_data_export import DdsDataExporter, DomainRows
+from dds_access.type_resolver import TypeResolver, TypePrefetcher, DEFAULT_PREFETCH_INTERVAL_MS
+from dds_access.dds_qos import qos_match_signatures, qos_signature, QosSignature, dds_qos_policy_id
+from dds_access.datatypes.endpoint_record import EndpointRecord
+from dds_access.datatypes.participant_info import remember_participant_info, forget_participant_info
 from dds_access.datatypes.entity_type import EntityType
 from utils.singleton import singleton
 
+
+# Time the receiver keeps collecting after a wakeup before it delivers,
+# to batch discovery bursts without delaying a quiet system
+DEFAULT_COALESCE_WINDOW_MS = 20
+
+# Items the observers may queue before they block, see BuiltInObserver.put
+DISCOVERY_QUEUE_SIZE = 256
+
+
+def coalesce_items(items: List[BuiltInDataItem]) -> BuiltInDataItem:
+    """Merges the items into one, in order.
+
+    An add and a remove of the same participant or endpoint within the items
+    cancel each other out, so an app restarting in a loop does not insert
+    and remove rows or recompute mismatches for every restart.
+    """
+    participants: Dict[tuple, tuple] = {}
+    endpoints: Dict[tuple, tuple] = {}
+    vanished: Set[tuple] = set() # participants added and removed again
+    merged = BuiltInDataItem()
+    merged.timestamp = items[0].timestamp
+
+    def apply(state: Dict[tuple, tuple], key: tuple, added: bool, entry: tuple) -> bool:
+        if key in state and state[key][0] != added:
+            del state[key]
+            return True
+        state[key] = (added, entry)
+        return False
+
+    for item in items:
+        for entry in item.new_participants:
+            key = (entry[0], str(entry[1].key))
+            # Back again, its updates from here on apply to the new instance
+            vanished.discard(key)
+            apply(participants, key, True, entry)
+        for entry in item.remove_participants:
+            key = (entry[0], str(entry[1].key))
+            if apply(participants, key, False, entry):
+                vanished.add(key)
+        for entry in item.new_endpoints:
+            apply(endpoints, (entry[0], str(entry[1].key)), True, entry)
+        for entry in item.remove_endpoints:
+            apply(endpoints, (entry[0], str(entry[1].key)), False, entry)
+        merged.update_participants.extend(item.update_participants)
+        merged.new_topics.extend(item.new_topics)
+
+    for (added, entry) in participants.values():
+        if added:
+            merged.new_participants.append(entry)
+        else:
+            merged.remove_participants.append(entry)
+
+    for (added, entry) in endpoints.values():
+        if added:
+            merged.new_endpoints.append(entry)
+        else:
+            merged.remove_endpoints.append(entry)
+
+    # Updates for participants that are gone would only be parked as pending
+    if len(vanished) > 0 or len(merged.remove_participants) > 0:
+        gone = vanished.union((entry[0], str(entry[1].key)) for entry in merged.remove_participants)
+        merged.update_participants = [entry for entry in merged.update_participants
+                                      if (entry[0], str(entry[1].key)) not in gone]
+
+    return merged
+
+
 class DataEndpoint:
+    __slots__ = ("endpoint", "entity_type", "topic", "qos_signature")
+
     def __init__(self, endpoint: DcpsEndpoint, entity_type) -> None:
-        self.endpoint: DcpsEndpoint = endpoint
+        self.endpoint: EndpointRecord = EndpointRecord(endpoint)
         self.entity_type: EntityType = entity_type
-        self.participant = None
-        self.mismatches : Dict[str, List[dds_qos_policy_id]]= {}
+        # The topic records the qos mismatches of its endpoints
+        self.topic: Optional["DataTopic"] = None
+        # Replaced by the equal signature of the topic's qos class when added
+        self.qos_signature: QosSignature = qos_signature(endpoint)
+
+    @property
+    def mismatches(self) -> Dict[str, List[dds_qos_policy_id]]:
+        if self.topic is None:
+            return {}
+        return self.topic.endpoint_mismatches(self)
 
     def isReader(self):
         return self.entity_type == EntityType.READER
@@ -40,9 +119,30 @@ class DataEndpoint:
     def isWriter(self):
         return self.entity_type == EntityType.WRITER
 
-    def link_participant(self, participant: DcpsParticipant):
-        if str(self.endpoint.participant_key) == str(participant.key):
-            self.participant = participant
+    def snapshot(self, participant: Optional[DcpsParticipant]) -> "EndpointSnapshot":
+        return EndpointSnapshot(self, participant)
+
+
+class EndpointSnapshot:
+    """Read-only view of a DataEndpoint handed to the models.
+
+    The EndpointRecord and DcpsParticipant are shared and never
+    modified, the mismatch map is expanded from the topic's class pairs
+    as the models update it.
+    """
+    __slots__ = ("endpoint", "entity_type", "participant", "mismatches")
+
+    def __init__(self, dataEndpoint: DataEndpoint, participant: Optional[DcpsParticipant]) -> None:
+        self.endpoint: EndpointRecord = dataEndpoint.endpoint
+        self.entity_type: EntityType = dataEndpoint.entity_type
+        self.participant: Optional[DcpsParticipant] = participant
+        self.mismatches: Dict[str, List[dds_qos_policy_id]] = dataEndpoint.mismatches
+
+    def isReader(self):
+        return self.entity_type == EntityType.READER
+
+    def isWriter(self):
+        return self.entity_type == EntityType.WRITER
 
 
 class DataTopic:
@@ -51,75 +151,95 @@ class DataTopic:
         self.dcpsTopic = dcpsTopic
         self.reader_endpoints: Dict[str, DataEndpoint] = {}
         self.writer_endpoints: Dict[str, DataEndpoint] = {}
+        # endpoints grouped by qos signature, the qos check runs per class
+        self.reader_classes: Dict[QosSignature, Dict[str, DataEndpoint]] = {}
+        self.writer_classes: Dict[QosSignature, Dict[str, DataEndpoint]] = {}
+        # mismatching (reader signature, writer signature) pairs, expanded to
+        # endpoints only when read
+        self.class_mismatches: Dict[Tuple[QosSignature, QosSignature], Tuple[dds_qos_policy_id, ...]] = {}
 
     def update_dcps_topic(self, dcpsTopic: DcpsTopic):
         self.dcpsTopic = dcpsTopic
 
     def add_endpoint(self, endpoint: DataEndpoint):
         if endpoint.isReader():
-            if str(endpoint.endpoint.key) not in self.reader_endpoints:
-                self.reader_endpoints[str(endpoint.endpoint.key)] = endpoint
+            endpoints, classes = self.reader_endpoints, self.reader_classes
         else:
-            if str(endpoint.endpoint.key) not in self.writer_endpoints:
-                self.writer_endpoints[str(endpoint.endpoint.key)] = endpoint
-
-        self.check_qos_mismatch(endpoint)
+            endpoints, classes = self.writer_endpoints, self.writer_classes
+
+        endpointKey = str(endpoint.endpoint.key)
+        if endpointKey not in endpoints:
+            endpoints[endpointKey] = endpoint
+            endpoint.topic = self
+            if endpoint.qos_signature not in classes:
+                classes[endpoint.qos_signature] = {}
+                self.check_qos_mismatch(endpoint)
+            else:
+                endpoint.qos_signature = next(iter(classes[endpoint.qos_signature].values())).qos_signature
+            classes[endpoint.qos_signature][endpointKey] = endpoint
 
     def remove_endpoint(self, endpointKey: str):
         if endpointKey in self.reader_endpoints:
-            for mimKey in self.reader_endpoints[endpointKey].mismatches:
-                if mimKey in self.writer_endpoints:
-                    if endpointKey in self.writer_endpoints[mimKey].mismatches:
-                        del self.writer_endpoints[mimKey].mismatches[endpointKey]
+            self.remove_from_class(self.reader_classes, self.reader_endpoints.pop(endpointKey))
 
-            del self.reader_endpoints[endpointKey]
-    
         if endpointKey in self.writer_endpoints:
-            for mimKey in self.writer_endpoints[endpointKey].mismatches:
-                if mimKey in self.reader_endpoints:
-                    if endpointKey in self.reader_endpoints[mimKey].mismatches:
-                        del self.reader_endpoints[mimKey].mismatches[endpointKey]
-
-            del self.writer_endpoints[endpointKey]
-
-    def link_participant(self, participant: DcpsParticipant):
-        for reader_key in self.reader_endpoints.keys():
-            self.reader_endpoints[reader_key].link_participant(participant)
-        for writer_key in self.writer_endpoints.keys():
-            self.writer_endpoints[writer_key].link_participant(participant)
+            self.remove_from_class(self.writer_classes, self.writer_endpoints.pop(endpointKey))
+
+    def remove_from_class(self, classes: Dict[QosSignature, Dict[str, DataEndpoint]], endpoint: DataEndpoint):
+        endpoint.topic = None
+        if endpoint.qos_signature in classes:
+            classes[endpoint.qos_signature].pop(str(endpoint.endpoint.key), None)
+            if len(classes[endpoint.qos_signature]) == 0:
+                del classes[endpoint.qos_signature]
+                # The last endpoint of a class takes the pairs of the class along
+                side = 0 if endpoint.isReader() else 1
+                for pair in [pair for pair in self.class_mismatches if pair[side] == endpoint.qos_signature]:
+                    del self.class_mismatches[pair]
+
+    def get_endpoint(self, endpointKey: str) -> Optional[DataEndpoint]:
+        if endpointKey in self.reader_endpoints:
+            return self.reader_endpoints[endpointKey]
+        if endpointKey in self.writer_endpoints:
+            return self.writer_endpoints[endpointKey]
+        return None
 
     def hasEndpoints(self) -> bool:
         return len(self.reader_endpoints) > 0 or len(self.writer_endpoints) > 0
 
     def check_qos_mismatch(self, data_endpoint: DataEndpoint):
-
-        endpoints_to_check = self.reader_endpoints
+        # Called once per new qos class, compatibility is evaluated against each
+        # opposite class and only mismatching class pairs are recorded. The
+        # signature includes the topic name, so the qos_match_signatures cache
+        # only helps within a topic.
         if data_endpoint.isReader():
-            endpoints_to_check = self.writer_endpoints
-
-        for endpKey in endpoints_to_check.keys():
-            endpoint_to_check = endpoints_to_check[endpKey]
-
-            mismatches: List[dds_qos_policy_id] = []
-            if data_endpoint.isReader():
-                mismatches = qos_match(data_endpoint.endpoint, endpoint_to_check.endpoint)
-            else:
-                mismatches = qos_match(endpoint_to_check.endpoint, data_endpoint.endpoint)
-
-            if len(mismatches) > 0:
-                data_endpoint.mismatches[str(endpoint_to_check.endpoint.key)] = mismatches
-                endpoint_to_check.mismatches[str(data_endpoint.endpoint.key)] = mismatches
+            for writer_signature in self.writer_classes.keys():
+                mismatches = qos_match_signatures(data_endpoint.qos_signature, writer_signature)
+                if len(mismatches) > 0:
+                    self.class_mismatches[(data_endpoint.qos_signature, writer_signature)] = mismatches
+        else:
+            for reader_signature in self.reader_classes.keys():
+                mismatches = qos_match_signatures(reader_signature, data_endpoint.qos_signature)
+                if len(mismatches) > 0:
+                    self.class_mismatches[(reader_signature, data_endpoint.qos_signature)] = mismatches
+
+    def endpoint_mismatches(self, data_endpoint: DataEndpoint) -> Dict[str, List[dds_qos_policy_id]]:
+        """The mismatching opposite endpoints of data_endpoint and their policies."""
+        mismatches: Dict[str, List[dds_qos_policy_id]] = {}
+        side = 0 if data_endpoint.isReader() else 1
+        opposite_classes = self.writer_classes if data_endpoint.isReader() else self.reader_classes
+        for (pair, policies) in self.class_mismatches.items():
+            if pair[side] == data_endpoint.qos_signature:
+                for endpointKey in opposite_classes.get(pair[1 - side], {}).keys():
+                    mismatches[endpointKey] = list(policies)
+        return mismatches
 
     def get_mismatches(self) -> List[str]:
-        mism_endp_keys: List[str] = []
-        for endpKey in self.reader_endpoints.keys():
-            if len(self.reader_endpoints[endpKey].mismatches):
-                mism_endp_keys += self.reader_endpoints[endpKey].mismatches.keys()
-        for endpKey in self.writer_endpoints.keys():
-            if len(self.writer_endpoints[endpKey].mismatches):
-                mism_endp_keys += self.writer_endpoints[endpKey].mismatches.keys()
+        mism_endp_keys: Dict[str, None] = {}
+        for (reader_signature, writer_signature) in self.class_mismatches.keys():
+            mism_endp_keys.update(dict.fromkeys(self.reader_classes.get(reader_signature, {}).keys()))
+            mism_endp_keys.update(dict.fromkeys(self.writer_classes.get(writer_signature, {}).keys()))
 
-        return list(dict.fromkeys(mism_endp_keys))
+        return list(mism_endp_keys)
 
     def getEndpointWithTypeId(self, topicTypeName) -> Optional[DataEndpoint]:
         for endpKey in self.reader_endpoints.keys():
@@ -132,26 +252,31 @@ class DataTopic:
                     return self.writer_endpoints[endpKey]
 
 class DataDomain:
-    def __init__(self, domain_id: int, queue) -> None:
+    def __init__(self, domain_id: int, observer: Optional[BuiltInObserver] = None) -> None:
         self.domain_id = domain_id
-        self.topics: Dict[str, DataTopic] = {}
+        self.topics: Dict[str, DataTopic] = {} # topics with endpoints, as announced to the models
+        self.dcpsTopics: Dict[str, DcpsTopic] = {} # discovered topics, attached to the DataTopic of their endpoints
         self.endpointToTopic = {} # shortcut for deletion where only endp key is available
+        self.participantToEndpoints: Dict[str, Set[str]] = {} # endpoint keys per participant key
         self.participants = {}
         self.pending_participant_updates = {}
-        self.obs_thread = BuiltInObserver(domain_id, queue)
-        self.obs_thread.start()
+        self.observer = observer
+        if self.observer is not None:
+            self.observer.add_domain(domain_id)
 
     def add_participant(self, participant: DcpsParticipant):
         self.participants[str(participant.key)] = participant
+        remember_participant_info(participant)
         if str(participant.key) in self.pending_participant_updates:
             self.update_participant(self.pending_participant_updates[str(participant.key)])
             del self.pending_participant_updates[str(participant.key)]
-        for topic in self.topics.keys():
-            self.topics[topic].link_participant(participant)
 
     def update_participant(self, update_participant: DcpsParticipant) -> Optional[DcpsParticipant]:
         if str(update_participant.key) in self.participants:
             self.participants[str(update_participant.key)].qos += update_participant.qos
+            # Parsed again, also should the qos have been extended in place
+            forget_participant_info(update_participant.key)
+            remember_participant_info(self.participants[str(update_participant.key)])
             return self.participants[str(update_participant.key)]
         else:
             self.pending_participant_updates[str(update_participant.key)] = update_participant
@@ -159,30 +284,43 @@ class DataDomain:
 
     def remove_participant(self, key: str):
         if key in self.participants:
+            forget_participant_info(self.participants[key].key)
             del self.participants[key]
         if key in self.pending_participant_updates:
             del self.pending_participant_updates[key]
 
     def add_topic(self, dcpsTopic: DcpsTopic):
-        if str(dcpsTopic.topic_name) not in self.topics:
-            self.topics[str(dcpsTopic.topic_name)] = DataTopic(str(dcpsTopic.topic_name))
- 
-        self.topics[str(dcpsTopic.topic_name)].update_dcps_topic(dcpsTopic)
+        # Not a DataTopic yet, a topic is shown from its first endpoint on
+        topicName = str(dcpsTopic.topic_name)
+        self.dcpsTopics[topicName] = dcpsTopic
+        if topicName in self.topics:
+            self.topics[topicName].update_dcps_topic(dcpsTopic)
 
     def add_endpoint(self, dataEndpoint: DataEndpoint):
         self.endpointToTopic[str(dataEndpoint.endpoint.key)] = str(dataEndpoint.endpoint.topic_name)
         if str(dataEndpoint.endpoint.topic_name) not in self.topics:
-            self.topics[str(dataEndpoint.endpoint.topic_name)] = DataTopic(str(dataEndpoint.endpoint.topic_name))
-
-        if str(dataEndpoint.endpoint.participant_key) in self.participants:
-            dataEndpoint.link_participant(self.participants[str(dataEndpoint.endpoint.participant_key)])
+            topicName = str(dataEndpoint.endpoint.topic_name)
+            self.topics[topicName] = DataTopic(topicName, self.dcpsTopics.get(topicName))
 
+        participantKey = dataEndpoint.endpoint.participant_key
         self.topics[str(dataEndpoint.endpoint.topic_name)].add_endpoint(dataEndpoint)
 
+        if participantKey not in self.participantToEndpoints:
+            self.participantToEndpoints[participantKey] = set()
+        self.participantToEndpoints[participantKey].add(str(dataEndpoint.endpoint.key))
+
     def remove_endpoint(self, endpoint_key: str):
         if endpoint_key in self.endpointToTopic:
             topicName = self.endpointToTopic[endpoint_key]
             if topicName in self.topics:
+                dataEndpoint = self.topics[topicName].get_endpoint(endpoint_key)
+                if dataEndpoint is not None:
+                    participantKey = str(dataEndpoint.endpoint.participant_key)
+                    if participantKey in self.participantToEndpoints:
+                        self.participantToEndpoints[participantKey].discard(endpoint_key)
+                        if len(self.participantToEndpoints[participantKey]) == 0:
+                            del self.participantToEndpoints[participantKey]
+
                 self.topics[topicName].remove_endpoint(endpoint_key)
                 del self.endpointToTopic[endpoint_key]
 
@@ -213,171 +351,239 @@ class DataDomain:
 
     def getEndpointsByParticipantKey(self, participantKey: str) -> List[DataEndpoint]:
         endpoints = []
-        if participantKey in self.participants:
-            for topic in self.topics.keys():
-                for endpKey in self.topics[topic].reader_endpoints.keys():
-                    if str(self.topics[topic].reader_endpoints[endpKey].endpoint.participant_key) == participantKey:
-                        endpoints.append(self.topics[topic].reader_endpoints[endpKey])
-                for endpKey in self.topics[topic].writer_endpoints.keys():
-                    if str(self.topics[topic].writer_endpoints[endpKey].endpoint.participant_key) == participantKey:
-                        endpoints.append(self.topics[topic].writer_endpoints[endpKey])
+        if participantKey in self.participants and participantKey in self.participantToEndpoints:
+            for endpKey in self.participantToEndpoints[participantKey]:
+                topicName = self.endpointToTopic.get(endpKey, "")
+                if topicName in self.topics:
+                    dataEndpoint = self.topics[topicName].get_endpoint(endpKey)
+                    if dataEndpoint is not None:
+                        endpoints.append(dataEndpoint)
         return endpoints
 
+    def snapshot(self, dataEndpoint: DataEndpoint) -> EndpointSnapshot:
+        # Endpoints refer to their participant by key, an endpoint discovered
+        # before its participant finds it here once it is known
+        return dataEndpoint.snapshot(self.participants.get(dataEndpoint.endpoint.participant_key))
+
     def getParticipantByKey(self, pkey: str):
         if pkey in self.participants:
             return self.participants[pkey]
         return None
 
     def __del__(self):
-        self.obs_thread.stop()
-        self.obs_thread.wait()
-
-    def toJson(self):
-        domain_data = {
-            "domain_id": self.domain_id,
-            "participants": {}
-        }
-
-        for pKey, _ in self.participants.items():
-            domain_data["participants"][pKey] = {
-                "participant_key": pKey,
-                "readers": {},
-                "writers": {}
-            }
+        if self.observer is not None:
+            self.observer.remove_domain(self.domain_id)
+        for participant in self.participants.values():
+            forget_participant_info(participant.key)
+
+    def exportRows(self) -> DomainRows:
+        # Plain tuples of immutable values, safe to hand to the exporter thread
+        rows: DomainRows = {}
+        for pKey in self.participants.keys():
+            rows[pKey] = ([], [])
 
         for _, topic in self.topics.items():
             for endpoints in [topic.reader_endpoints, topic.writer_endpoints]:
                 for _, endp in endpoints.items():
-
-                    readWriteJsonKey = "writers"
+                    record = endp.endpoint
+                    readers, writers = rows.setdefault(record.participant_key, ([], []))
+                    row = (str(record.key), record.topic_name, record.type_name, record.partitions)
                     if endp.isReader():
-                        readWriteJsonKey = "readers"
+                        readers.append(row)
+                    else:
+                        writers.append(row)
 
-                    partitions = []
-                    if qos.Policy.Partition in endp.endpoint.qos:
-                        for i in range(len(endp.endpoint.qos[qos.Policy.Partition].partitions)):
-                            partitions.append(str(endp.endpoint.qos[qos.Policy.Partition].partitions[i]))
-
-                    domain_data["participants"][str(endp.participant.key)][readWriteJsonKey][str(endp.endpoint.key)] = {
-                        "endpoint_key": str(endp.endpoint.key),
-                        "topic": endp.endpoint.topic_name,
-                        "type": endp.endpoint.type_name,
-                        "qos": {
-                            "partitions": partitions
-                        }
-                    }
-
-        return domain_data
+        return rows
 
 class BuiltInReceiver(QObject):
 
-    newParticipantSignal = Signal(int, DcpsParticipant)
-    newEndpointSignal = Signal(int, DcpsParticipant, EntityType)
-    removeParticipantSignal = Signal(int, DcpsParticipant)
-    removeEndpointSignal = Signal(int, DcpsParticipant)
-    updateParticipantSignal = Signal(int, DcpsParticipant)
-    newTopicSignal = Signal(int, DcpsTopic)
+    newParticipantsSignal = Signal(list)
+    newEndpointsSignal = Signal(list)
+    removeParticipantsSignal = Signal(list)
+    removeEndpointsSignal = Signal(list)
+    updateParticipantsSignal = Signal(list)
+    newTopicsSignal = Signal(list)
+    deliveredSignal = Signal(float)
 
-    def __init__(self, queue):
+    def __init__(self, queue, coalesce_window_ms: int = DEFAULT_COALESCE_WINDOW_MS):
         super().__init__()
         self.queue = queue
+        self.coalesce_window = max(0, coalesce_window_ms) / 1000.0
         self.running = True
 
+    def collect(self) -> List[BuiltInDataItem]:
+        # Block until the observers put something
+        item = self.queue.get()
+        if item is None:
+            return []
+
+        items = [item]
+        deadline = time.monotonic() + self.coalesce_window
+        while self.running:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self.queue.get(timeout=remaining)
+                else:
+                    item = self.queue.get_nowait()
+            except Empty:
+                break
+            if item is None:
+                break
+            items.append(item)
+
+        return items
+
     def run(self):
         logging.info(f"Running BuiltInReceiver ... (thread: {QThread.currentThread()})")
 
         while self.running:
-            time.sleep(2)
+            items = self.collect()
+            if len(items) == 0:
+                continue
 
-            while self.running:
-                if self.queue.empty():
-                    break
+            item = coalesce_items(items)
 
-                item = self.queue.get()
-                if item is None:
-                    break
+            if len(item.new_participants) > 0:
+                self.newParticipantsSignal.emit(item.new_participants)
 
-                for (domain_id, participant) in item.new_participants:
-                    self.newParticipantSignal.emit(domain_id, participant)
+            if len(item.remove_participants) > 0:
+                self.removeParticipantsSignal.emit(item.remove_participants)
 
-                for (domain_id, participant) in item.remove_participants:
-                    self.removeParticipantSignal.emit(domain_id, participant)
+            if len(item.new_endpoints) > 0:
+                self.newEndpointsSignal.emit(item.new_endpoints)
 
-                for (domain_id, endpoint, entity_type) in item.new_endpoints:
-                    self.newEndpointSignal.emit(domain_id, endpoint, entity_type)
+            if len(item.remove_endpoints) > 0:
+                self.removeEndpointsSignal.emit(item.remove_endpoints)
 
-                for (domain_id, endpoint) in item.remove_endpoints:
-                    self.removeEndpointSignal.emit(domain_id, endpoint)
+            if len(item.update_participants) > 0:
+                self.updateParticipantsSignal.emit(item.update_participants)
 
-                for (domain_id, endpoint_update) in item.update_participants:
-                    self.updateParticipantSignal.emit(domain_id, endpoint_update)
+            if len(item.new_topics) > 0:
+                self.newTopicsSignal.emit(item.new_topics)
 
-                for (domain_id, topic) in item.new_topics:
-                    self.newTopicSignal.emit(domain_id, topic)
+            # Queued after the items above, so it arrives once they are applied
+            self.deliveredSignal.emit(item.timestamp)
 
         logging.info("Running BuiltInReceiver ... DONE")
 
     def stop(self):
         self.running = False
+        # Wake up the blocking get, a full queue does not block it anyway
+        try:
+            self.queue.put_nowait(None)
+        except Full:
+            pass
 
 @singleton
 class DdsData(QObject):
 
-    # domain observer threads
-    observer_threads = {}
-
     # signals and slots
-    new_topic_signal = Signal(int, str)
-    remove_topic_signal = Signal(int, str)
+    new_topics_signal = Signal(int, list)
+    remove_topics_signal = Signal(int, list)
     new_domain_signal = Signal(int)
     removed_domain_signal = Signal(int)
-    new_endpoint_signal = Signal(str, int, DataEndpoint)
-    removed_endpoint_signal = Signal(int, str)
-    new_participant_signal = Signal(int, DcpsParticipant)
-    removed_participant_signal = Signal(int, str)
+    new_endpoints_signal = Signal(str, int, list)
+    removed_endpoints_signal = Signal(int, list)
+    new_participants_signal = Signal(int, list)
+    removed_participants_signal = Signal(int, list)
     update_participant_signal = Signal(int, DcpsParticipant)
 
     response_domain_ids_signal = Signal(str, list)
     response_data_type_signal = Signal(str, object)
-    response_endpoints_by_participant_key_signal = Signal(str, int, DataEndpoint)
+    response_endpoints_by_participant_key_signal = Signal(str, int, list)
     response_participants_signal = Signal(str, int, object)
     response_participant_by_key = Signal(str, object)
-    response_dds_data_json_signal = Signal(str, str)
+    dds_data_export_progress_signal = Signal(str, int, int)
+    dds_data_export_done_signal = Signal(str, bool)
 
     no_more_mismatch_in_topic_signal = Signal(int, str)
     publish_mismatch_signal = Signal(int, str, list)
 
+    # Monotonic time the delivered samples were taken by the observer,
+    # queued behind the signals above so the models receive it last
+    discovery_delivered_signal = Signal(float)
+
     the_domains: Dict[int, DataDomain] = {}
 
-    queue = Queue()
+    queue = Queue(maxsize=DISCOVERY_QUEUE_SIZE)
 
     def __init__(self):
         super().__init__()
         logging.trace("Construct DdsData")
+        self.journal: Optional[DiscoveryJournal] = None
+        self.replay: Optional[DiscoveryReplay] = None
+        self.exporters: Dict[str, DdsDataExporter] = {}
+        self.type_resolver = TypeResolver()
+        self.type_prefetcher: Optional[TypePrefetcher] = None
+        if QSettings().value("types/prefetch", False, type=bool):
+            interval_ms = QSettings().value("types/prefetch_interval_ms", DEFAULT_PREFETCH_INTERVAL_MS, type=int)
+            self.type_prefetcher = TypePrefetcher(self.type_resolver, interval_ms)
+            self.type_prefetcher.start(QThread.Priority.LowestPriority)
+        self.observer: BuiltInObserver = BuiltInObserver(self.queue, discovery_filter=DiscoveryFilter.fromSettings())
+        self.observer.start()
+        coalesce_window_ms = QSettings().value("discovery/coalesce_window_ms", DEFAULT_COALESCE_WINDOW_MS, type=int)
         self.receiverThread: QThread = QThread()
-        self.receiver: BuiltInReceiver = BuiltInReceiver(self.queue)
+        self.receiver: BuiltInReceiver = BuiltInReceiver(self.queue, coalesce_window_ms)
         self.receiver.moveToThread(self.receiverThread)
-        self.receiver.newParticipantSignal.connect(self.add_domain_participant, Qt.ConnectionType.QueuedConnection)
-        self.receiver.newEndpointSignal.connect(self.add_endpoint, Qt.ConnectionType.QueuedConnection)
-        self.receiver.removeParticipantSignal.connect(self.remove_domain_participant, Qt.ConnectionType.QueuedConnection)
-        self.receiver.removeEndpointSignal.connect(self.remove_endpoint, Qt.ConnectionType.QueuedConnection)
-        self.receiver.updateParticipantSignal.connect(self.update_domain_participant, Qt.ConnectionType.QueuedConnection)
-        self.receiver.newTopicSignal.connect(self.add_topic, Qt.ConnectionType.QueuedConnection)
+        self.receiver.newParticipantsSignal.connect(self.add_domain_participants, Qt.ConnectionType.QueuedConnection)
+        self.receiver.newEndpointsSignal.connect(self.add_endpoints, Qt.ConnectionType.QueuedConnection)
+        self.receiver.removeParticipantsSignal.connect(self.remove_domain_participants, Qt.ConnectionType.QueuedConnection)
+        self.receiver.removeEndpointsSignal.connect(self.remove_endpoints, Qt.ConnectionType.QueuedConnection)
+        self.receiver.updateParticipantsSignal.connect(self.update_domain_participants, Qt.ConnectionType.QueuedConnection)
+        self.receiver.newTopicsSignal.connect(self.add_topics, Qt.ConnectionType.QueuedConnection)
+        self.receiver.deliveredSignal.connect(self.discovery_delivered, Qt.ConnectionType.QueuedConnection)
         self.receiverThread.started.connect(self.receiver.run)
         self.receiverThread.finished.connect(self.receiver.deleteLater)
         self.receiverThread.start()
 
     def join_observer(self):
+        if self.replay is not None:
+            self.replay.stop()
+            self.replay.wait()
+        if self.type_prefetcher is not None:
+            self.type_prefetcher.stop()
+            self.type_prefetcher.wait()
+        self.type_resolver.shutdown()
+        self.the_domains.clear()
+        self.observer.stop()
+        self.observer.wait()
         self.receiver.stop()
         self.receiverThread.quit()
         self.receiverThread.wait()
-        self.the_domains.clear()
         gc.collect()
+        self.stop_discovery_journal()
+
+    def start_discovery_journal(self, path: str):
+        self.stop_discovery_journal()
+        try:
+            self.journal = DiscoveryJournal(path)
+        except Exception as e:
+            logging.error(f"Failed to open discovery journal {path}: {str(e)}")
+            return
+        self.observer.journal = self.journal
+
+    def stop_discovery_journal(self):
+        if self.journal is not None:
+            self.observer.journal = None
+            self.journal.close()
+            self.journal = None
+
+    def replay_discovery_journal(self, path: str, speed: float = 1.0):
+        try:
+            domain_ids = journal_domain_ids(path)
+        except Exception as e:
+            logging.error(f"Failed to read discovery journal {path}: {str(e)}")
+            return
+        for domain_id in sorted(domain_ids):
+            self.add_domain(domain_id, observe=False)
+        self.replay = DiscoveryReplay(path, self.queue, speed)
+        self.replay.start()
 
-    def add_domain(self, domain_id: int):
+    def add_domain(self, domain_id: int, observe: bool = True):
         if domain_id in self.the_domains:
             return
-        self.the_domains[domain_id] = DataDomain(domain_id, self.queue)
+        self.the_domains[domain_id] = DataDomain(domain_id, self.observer if observe else None)
         self.new_domain_signal.emit(domain_id)
 
     @Slot(int)
@@ -388,90 +594,140 @@ class DdsData(QObject):
 
         self.removed_domain_signal.emit(domain_id)
 
-    def add_topic(self, domain_id: int, topic: DcpsTopic):
-        if domain_id in self.the_domains:
-            return
-        self.the_domains[domain_id].add_topic(topic)
-
-    @Slot(int, DcpsParticipant)
-    def add_domain_participant(self, domain_id: int, participant: DcpsParticipant):
-        logging.debug(f"Add domain participant {str(participant.key)}")
-
-        if domain_id in self.the_domains:
-            self.the_domains[domain_id].add_participant(participant)
-            self.new_participant_signal.emit(domain_id, participant)
-
-    @Slot(int, DcpsParticipant)
-    def remove_domain_participant(self, domain_id: int, participant: DcpsParticipant):
-        logging.debug(f"Remove domain participant: {str(participant.key)}")
-        if domain_id in self.the_domains:
-            self.the_domains[domain_id].remove_participant(str(participant.key))
-            self.removed_participant_signal.emit(domain_id, str(participant.key))
-
-    @Slot(int, DcpsParticipant)
-    def update_domain_participant(self, domain_id: int, participant_update: DcpsParticipant):
-        logging.debug(f"Update domain participant: {str(participant_update.key)}")
-        if domain_id in self.the_domains:
-            updated = self.the_domains[domain_id].update_participant(participant_update)
-            if updated:
-                self.update_participant_signal.emit(domain_id, updated)
-
-    @Slot(int, DcpsEndpoint, EntityType)
-    def add_endpoint(self, domain_id: int, endpoint: DcpsEndpoint, entity_type: EntityType):
-        logging.debug(f"Add endpoint domain: {domain_id}, key: {str(endpoint.key)}, entity: {entity_type}")
-
-        if domain_id in self.the_domains:
-            topic_already_known = self.the_domains[domain_id].has_topic(str(endpoint.topic_name))
-            dataEndp = DataEndpoint(endpoint, entity_type)
-            self.the_domains[domain_id].add_endpoint(dataEndp)
-
-            if not topic_already_known:
-                self.new_topic_signal.emit(domain_id, endpoint.topic_name)
+    @Slot(float)
+    def discovery_delivered(self, observed_at: float):
+        self.discovery_delivered_signal.emit(observed_at)
+
+    @Slot(list)
+    def add_topics(self, topics: list):
+        for (domain_id, topic) in topics:
+            if domain_id in self.the_domains:
+                self.the_domains[domain_id].add_topic(topic)
+
+    @Slot(list)
+    def add_domain_participants(self, participants: list):
+        added: Dict[int, List[DcpsParticipant]] = {}
+        for (domain_id, participant) in participants:
+            logging.debug(f"Add domain participant {str(participant.key)}")
+            if domain_id in self.the_domains:
+                self.the_domains[domain_id].add_participant(participant)
+                added.setdefault(domain_id, []).append(participant)
+
+        for domain_id, domain_participants in added.items():
+            self.new_participants_signal.emit(domain_id, domain_participants)
+
+    @Slot(list)
+    def remove_domain_participants(self, participants: list):
+        removed: Dict[int, List[str]] = {}
+        for (domain_id, participant) in participants:
+            logging.debug(f"Remove domain participant: {str(participant.key)}")
+            if domain_id in self.the_domains:
+                self.the_domains[domain_id].remove_participant(str(participant.key))
+                removed.setdefault(domain_id, []).append(str(participant.key))
+
+        for domain_id, participant_keys in removed.items():
+            self.removed_participants_signal.emit(domain_id, participant_keys)
+
+    @Slot(list)
+    def update_domain_participants(self, participant_updates: list):
+        for (domain_id, participant_update) in participant_updates:
+            logging.debug(f"Update domain participant: {str(participant_update.key)}")
+            if domain_id in self.the_domains:
+                updated = self.the_domains[domain_id].update_participant(participant_update)
+                if updated:
+                    self.update_participant_signal.emit(domain_id, updated)
+
+    @Slot(list)
+    def add_endpoints(self, endpoints: list):
+        added: Dict[int, List[DataEndpoint]] = {}
+        new_topics: Dict[int, List[str]] = {}
+        touched_topics: Dict[int, List[str]] = {}
+
+        for (domain_id, endpoint, entity_type) in endpoints:
+            logging.debug(f"Add endpoint domain: {domain_id}, key: {str(endpoint.key)}, entity: {entity_type}")
+
+            if domain_id in self.the_domains:
+                topic_name = str(endpoint.topic_name)
+                if not self.the_domains[domain_id].has_topic(topic_name):
+                    new_topics.setdefault(domain_id, []).append(topic_name)
+
+                dataEndp = DataEndpoint(endpoint, entity_type)
+                self.the_domains[domain_id].add_endpoint(dataEndp)
+                added.setdefault(domain_id, []).append(self.the_domains[domain_id].snapshot(dataEndp))
+
+                if self.type_prefetcher is not None and dataEndp.endpoint.type_id:
+                    self.type_prefetcher.prefetch(domain_id, dataEndp.endpoint)
+
+                if topic_name not in touched_topics.setdefault(domain_id, []):
+                    touched_topics[domain_id].append(topic_name)
+
+        for domain_id, topic_names in new_topics.items():
+            self.new_topics_signal.emit(domain_id, topic_names)
+
+        for domain_id, domain_endpoints in added.items():
+            self.new_endpoints_signal.emit("", domain_id, domain_endpoints)
+
+        for domain_id, topic_names in touched_topics.items():
+            for topic_name in topic_names:
+                mismatches = self.the_domains[domain_id].topics[topic_name].get_mismatches()
+                if len(mismatches) > 0:
+                    self.publish_mismatch_signal.emit(domain_id, topic_name, mismatches)
 
-            self.new_endpoint_signal.emit("", domain_id, copy.deepcopy(dataEndp))
+    @Slot(list)
+    def remove_endpoints(self, endpoints: list):
+        removed: Dict[int, List[str]] = {}
+        touched_topics: Dict[int, List[str]] = {}
 
-            mismatches = self.the_domains[domain_id].topics[endpoint.topic_name].get_mismatches()
-            if len(mismatches) > 0:
-                self.publish_mismatch_signal.emit(domain_id, endpoint.topic_name, mismatches)
+        for (domain_id, endpoint) in endpoints:
+            logging.debug(f"Remove endpoint domain: {domain_id}, key: {str(endpoint.key)}")
 
-    @Slot(int, DcpsEndpoint)
-    def remove_endpoint(self, domain_id: int, endpoint: DcpsEndpoint):
-        logging.debug(f"Remove endpoint domain: {domain_id}, key: {str(endpoint.key)}")
+            if domain_id in self.the_domains:
+                topicName = self.the_domains[domain_id].get_topic_name(str(endpoint.key))
+                self.the_domains[domain_id].remove_endpoint(str(endpoint.key))
+                removed.setdefault(domain_id, []).append(str(endpoint.key))
 
-        if domain_id in self.the_domains:
+                if topicName and topicName not in touched_topics.setdefault(domain_id, []):
+                    touched_topics[domain_id].append(topicName)
 
-            topicName = self.the_domains[domain_id].get_topic_name(str(endpoint.key))
+        for domain_id, endpoint_keys in removed.items():
+            self.removed_endpoints_signal.emit(domain_id, endpoint_keys)
 
-            self.the_domains[domain_id].remove_endpoint(str(endpoint.key))
+        for domain_id, topic_names in touched_topics.items():
+            gone_topics = []
+            for topicName in topic_names:
+                if not self.the_domains[domain_id].has_topic(topicName):
+                    logging.info(f"Removed last endpointon topic, topic gone {topicName}")
+                    gone_topics.append(topicName)
+                else:
+                    self.no_more_mismatch_in_topic_signal.emit(domain_id, topicName)
+                    mismatches = self.the_domains[domain_id].topics[topicName].get_mismatches()
+                    if len(mismatches) > 0:
+                        self.publish_mismatch_signal.emit(domain_id, topicName, mismatches)
 
-            self.removed_endpoint_signal.emit(domain_id, str(endpoint.key))
-
-            if not self.the_domains[domain_id].has_topic(topicName):
-                logging.info(f"Removed last endpointon topic, topic gone {topicName}")
-                self.remove_topic_signal.emit(domain_id, topicName)
-            else:
-                self.no_more_mismatch_in_topic_signal.emit(domain_id, topicName)
-                mismatches = self.the_domains[domain_id].topics[topicName].get_mismatches()
-                if len(mismatches) > 0:
-                    self.publish_mismatch_signal.emit(domain_id, topicName, mismatches)
+            if len(gone_topics) > 0:
+                self.remove_topics_signal.emit(domain_id, gone_topics)
 
     @Slot(str, int, str, EntityType)
     def requestEndpointsSlot(self, requestId: str, domain_id: int, topic_name: str, entity_type: EntityType):
         if domain_id in self.the_domains:
             endDict = self.the_domains[domain_id].getEndpoints(topic_name, entity_type)
-            for key in endDict.keys():
-                self.new_endpoint_signal.emit(requestId, domain_id, copy.deepcopy(endDict[key]))
+            endpoints = [self.the_domains[domain_id].snapshot(endDict[key]) for key in endDict.keys()]
+            if len(endpoints) > 0:
+                self.new_endpoints_signal.emit(requestId, domain_id, endpoints)
 
     @Slot(str, int, str, str)
     def requestDataType(self, requestId, domainId, topicType, topicName):
         logging.debug(f"requestDataType {requestId}, {domainId}, {topicType}, {topicName}")
-        requestedDataType = None
         if domainId in self.the_domains:
             topic = self.the_domains[domainId].getTopic(topicName)
             if topic:
                 endp = topic.getEndpointWithTypeId(topicType)
                 if endp:
-                    requestedDataType = getDataType(domainId, endp.endpoint)
+                    # Resolved on the type resolver pool, discovery keeps flowing meanwhile
+                    future = self.type_resolver.resolve(domainId, endp.endpoint)
+                    future.add_done_callback(lambda f: self.response_data_type_signal.emit(
+                        requestId, None if f.cancelled() or f.exception() else f.result()))
+                    return
                 else:
                     logging.warning("endpoint not found")
             else:
@@ -479,14 +735,17 @@ class DdsData(QObject):
         else:
             logging.warning("domain not found")
 
-        self.response_data_type_signal.emit(requestId, requestedDataType)
+        # No endpoint to ask, a type seen in an earlier session may still be cached
+        future = self.type_resolver.resolveCached(topicType)
+        future.add_done_callback(lambda f: self.response_data_type_signal.emit(
+            requestId, None if f.cancelled() or f.exception() else f.result()))
 
     @Slot(str, int, str)
     def requestEndpointsByParticipantKey(self, requestId: str, domainId: int, participantKey: str):
         logging.debug(f"requestEndpointsByParticipantKey {requestId}, {domainId}, {participantKey}")
         endpoints = []
         if domainId in self.the_domains:
-            endpoints = self.the_domains[domainId].getEndpointsByParticipantKey(participantKey)
+            endpoints = [self.the_domains[domainId].snapshot(endp) for endp in self.the_domains[domainId].getEndpointsByParticipantKey(participantKey)]
 
         self.response_endpoints_by_participant_key_signal.emit(requestId, domainId, endpoints)
 
@@ -512,14 +771,21 @@ class DdsData(QObject):
         domains = list(self.the_domains.keys())
         self.response_domain_ids_signal.emit(requestId, domains)
 
-    @Slot(str)
-    def requestDdsDataToJson(self, requestId: str):
+    @Slot(str, str)
+    def requestDdsDataToJson(self, requestId: str, filePath: str):
         logging.debug(f"requestDdsDataToJson {requestId}")
 
-        dds_data = {
-            "domains": {}
-        }
-        for domainId, domain in self.the_domains.items():
-            dds_data["domains"][domainId] = domain.toJson()
+        domains = [(domainId, domain.exportRows()) for domainId, domain in self.the_domains.items()]
+
+        exporter = DdsDataExporter(requestId, filePath, domains)
+        exporter.progressSignal.connect(self.dds_data_export_progress_signal, Qt.ConnectionType.QueuedConnection)
+        exporter.doneSignal.connect(self.dds_data_export_done, Qt.ConnectionType.QueuedConnection)
+        self.exporters[requestId] = exporter
+        exporter.start()
 
-        self.response_dds_data_json_signal.emit(requestId, json.dumps(dds_data, indent=4))
+    @Slot(str, bool)
+    def dds_data_export_done(self, requestId: str, ok: bool):
+        if requestId in self.exporters:
+            self.exporters[requestId].wait()
+            del self.exporters[requestId]
+        self.dds_data_export_done_signal.emit(requestId, ok)
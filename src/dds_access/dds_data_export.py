@@ -0,0 +1,121 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import gzip
+import json
+from loguru import logger as logging
+from typing import Dict, List, TextIO, Tuple
+from PySide6.QtCore import QThread, Signal
+
+
+# (endpoint_key, topic_name, type_name, partitions)
+EndpointRow = Tuple[str, str, str, Tuple[str, ...]]
+
+# participant_key -> (readers, writers)
+DomainRows = Dict[str, Tuple[List[EndpointRow], List[EndpointRow]]]
+
+PROGRESS_STEP = 1000
+
+
+def isJsonLines(file_path: str) -> bool:
+    return file_path.endswith(".jsonl") or file_path.endswith(".jsonl.gz")
+
+
+class DdsDataExporter(QThread):
+    """Writes the rows collected by DdsData to a file, off the DdsData thread.
+
+    The output is the nested json document of the whole system, or with a
+    .jsonl file one compact json object per participant and endpoint. A
+    file name ending with .gz is written gzip compressed.
+    """
+
+    progressSignal = Signal(str, int, int)
+    doneSignal = Signal(str, bool)
+
+    def __init__(self, requestId: str, file_path: str, domains: List[Tuple[int, DomainRows]]):
+        super().__init__()
+        self.requestId = requestId
+        self.file_path = file_path
+        self.domains = domains
+        self.total = sum(len(rows) + sum(len(r) + len(w) for (r, w) in rows.values()) for (_, rows) in domains)
+        self.written = 0
+
+    def open(self) -> TextIO:
+        if self.file_path.endswith(".gz"):
+            return gzip.open(self.file_path, "wt", encoding="utf-8")
+        return open(self.file_path, "w", encoding="utf-8")
+
+    def advance(self, count: int):
+        before = self.written // PROGRESS_STEP
+        self.written += count
+        if self.written // PROGRESS_STEP != before:
+            self.progressSignal.emit(self.requestId, self.written, self.total)
+
+    def run(self):
+        logging.info(f"Export dds data to {self.file_path} ...")
+        ok = True
+        try:
+            with self.open() as out:
+                if isJsonLines(self.file_path):
+                    self.writeJsonLines(out)
+                else:
+                    self.writeJson(out)
+        except Exception as e:
+            logging.error(f"Failed to export dds data to {self.file_path}: {str(e)}")
+            ok = False
+
+        self.progressSignal.emit(self.requestId, self.total, self.total)
+        self.doneSignal.emit(self.requestId, ok)
+        logging.info(f"Export dds data to {self.file_path} ... DONE")
+
+    @staticmethod
+    def endpointJson(row: EndpointRow) -> dict:
+        (endpoint_key, topic_name, type_name, partitions) = row
+        return {
+            "endpoint_key": endpoint_key,
+            "topic": topic_name,
+            "type": type_name,
+            "qos": {
+                "partitions": list(partitions)
+            }
+        }
+
+    def writeJson(self, out: TextIO):
+        out.write("{\n    \"domains\": {")
+        for (d_idx, (domain_id, rows)) in enumerate(self.domains):
+            out.write("," if d_idx > 0 else "")
+            out.write(f"\n        {json.dumps(str(domain_id))}: {{\n            \"domain_id\": {domain_id},\n            \"participants\": {{")
+            for (p_idx, (participant_key, (readers, writers))) in enumerate(rows.items()):
+                participant = {
+                    "participant_key": participant_key,
+                    "readers": {row[0]: self.endpointJson(row) for row in readers},
+                    "writers": {row[0]: self.endpointJson(row) for row in writers}
+                }
+                out.write("," if p_idx > 0 else "")
+                out.write(f"\n                {json.dumps(participant_key)}: ")
+                out.write(json.dumps(participant, indent=4).replace("\n", "\n                "))
+                self.advance(1 + len(readers) + len(writers))
+            out.write("\n            }\n        }")
+        out.write("\n    }\n}\n")
+
+    def writeJsonLines(self, out: TextIO):
+        for (domain_id, rows) in self.domains:
+            for (participant_key, (readers, writers)) in rows.items():
+                out.write(json.dumps({"domain_id": domain_id, "kind": "participant", "participant_key": participant_key}, separators=(",", ":")))
+                out.write("\n")
+                for (kind, endpoints) in (("reader", readers), ("writer", writers)):
+                    for row in endpoints:
+                        line = {"domain_id": domain_id, "kind": kind, "participant_key": participant_key}
+                        line.update(self.endpointJson(row))
+                        out.write(json.dumps(line, separators=(",", ":")))
+                        out.write("\n")
+                self.advance(1 + len(readers) + len(writers))
@@ -29,6 +29,11 @@ def status_to_string(status) -> str:
 
 class DdsListener(core.Listener):
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # reader instance handle -> ReaderStats, counts lost and rejected samples
+        self.reader_stats = {}
+
     def on_inconsistent_topic(self, reader: DataReader, status: dds_c_t.inconsistent_topic_status):
         try:
             if reader and status:
@@ -85,6 +90,9 @@ class DdsListener(core.Listener):
         try:
             if writer and status:
                 logging.warning(f"on_sample_lost: {writer.topic.name}, type: {writer.topic.typename}, {status_to_string(status)}")
+                stats = self.reader_stats.get(writer.instance_handle)
+                if stats is not None:
+                    stats.addLost(status.total_count_change)
             else:
                 logging.warning("on_sample_lost")
         except Exception as e:
@@ -94,6 +102,9 @@ class DdsListener(core.Listener):
         try:
             if reader and status:
                 logging.warning(f"on_sample_rejected: {reader.instance_handle}, topic: {reader.topic.name}, {status_to_string(status)}")
+                stats = self.reader_stats.get(reader.instance_handle)
+                if stats is not None:
+                    stats.addRejected(status.total_count_change)
             else:
                 logging.warning("on_sample_rejected")
         except Exception as e:
@@ -11,77 +11,110 @@
 """
 
 from enum import Enum
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
 from cyclonedds import qos
 # from cyclonedds.internal import feature_typelib # not available in v0.10.5
 from utils.ordered_enum import OrderedEnum
 
 
+class QosSignature(NamedTuple):
+    """All values of an endpoint that qos_match looks at.
+
+    Endpoints with equal signatures are interchangeable for the
+    compatibility check, so the result can be cached per signature pair.
+    """
+    topic_name: str
+    type_name: str
+    reliability: Optional["dds_reliability"]
+    durability: Optional["dds_durability_kind"]
+    access_scope: Optional["dds_presentation_access_scope"]
+    coherent_access: Optional[int]
+    ordered_access: Optional[int]
+    deadline: Optional[int]
+    lat_duration: Optional[int]
+    ownership: Optional["dds_ownership"]
+    liveliness: Optional["dds_liveliness"]
+    live_duration: Optional[int]
+    destination_order: Optional["dds_destination_order"]
+    data_representation: Optional[Tuple[bool, bool]]
+
+
+def qos_signature(endpoint) -> QosSignature:
+    data_representation = None
+    if qos.Policy.DataRepresentation in endpoint.qos:
+        data_representation = (
+            bool(endpoint.qos[qos.Policy.DataRepresentation].use_cdrv0_representation),
+            bool(endpoint.qos[qos.Policy.DataRepresentation].use_xcdrv2_representation))
+
+    return QosSignature(
+        topic_name=endpoint.topic_name,
+        type_name=endpoint.type_name,
+        reliability=to_kind_reliability(endpoint.qos),
+        durability=to_kind_durability(endpoint.qos),
+        access_scope=to_kind_access_scope(endpoint.qos),
+        coherent_access=to_kind_coherent_access(endpoint.qos),
+        ordered_access=to_kind_ordered_access(endpoint.qos),
+        deadline=to_kind_deadline(endpoint.qos),
+        lat_duration=to_kind_lat_duration(endpoint.qos),
+        ownership=to_kind_ownership(endpoint.qos),
+        liveliness=to_kind_liveliness(endpoint.qos),
+        live_duration=to_kind_live_duration(endpoint.qos),
+        destination_order=to_kind_destination_order(endpoint.qos),
+        data_representation=data_representation)
+
+
 def qos_match(endpoint_reader, endpoint_writer) -> list:
+    return list(qos_match_signatures(qos_signature(endpoint_reader), qos_signature(endpoint_writer)))
+
+
+@lru_cache(maxsize=4096)
+def qos_match_signatures(rd: QosSignature, wr: QosSignature) -> Tuple["dds_qos_policy_id", ...]:
 
     mismatches = []
 
-    if endpoint_reader.topic_name != endpoint_writer.topic_name:
+    if rd.topic_name != wr.topic_name:
         mismatches.append(dds_qos_policy_id.DDS_INVALID_QOS_POLICY_ID)
 
-    reliability_rd = to_kind_reliability(endpoint_reader.qos)
-    reliability_wr = to_kind_reliability(endpoint_writer.qos)
-    if reliability_rd and reliability_wr and reliability_rd > reliability_wr:
+    if rd.reliability and wr.reliability and rd.reliability > wr.reliability:
         mismatches.append(dds_qos_policy_id.DDS_RELIABILITY_QOS_POLICY_ID)
 
-    durability_rd = to_kind_durability(endpoint_reader.qos)
-    durability_wr = to_kind_durability(endpoint_writer.qos)
-    if durability_rd and durability_wr and durability_rd > durability_wr:
+    if rd.durability and wr.durability and rd.durability > wr.durability:
         mismatches.append(dds_qos_policy_id.DDS_DURABILITY_QOS_POLICY_ID)
 
-    access_scope_rd = to_kind_access_scope(endpoint_reader.qos)
-    access_scope_wr = to_kind_access_scope(endpoint_writer.qos)
-    if access_scope_rd and access_scope_wr and access_scope_rd > access_scope_wr:
+    if rd.access_scope and wr.access_scope and rd.access_scope > wr.access_scope:
         mismatches.append(dds_qos_policy_id.DDS_PRESENTATION_QOS_POLICY_ID)
 
-    coherent_access_rd = to_kind_coherent_access(endpoint_reader.qos)
-    coherent_access_wr = to_kind_coherent_access(endpoint_writer.qos)
-    if coherent_access_rd and coherent_access_wr and coherent_access_rd > coherent_access_wr:
+    if rd.coherent_access and wr.coherent_access and rd.coherent_access > wr.coherent_access:
         mismatches.append(dds_qos_policy_id.DDS_PRESENTATION_QOS_POLICY_ID)
-    
-    ordered_access_rd = to_kind_ordered_access(endpoint_reader.qos)
-    ordered_access_wr = to_kind_ordered_access(endpoint_writer.qos)
-    if ordered_access_rd and ordered_access_wr and ordered_access_rd > ordered_access_wr:
+
+    if rd.ordered_access and wr.ordered_access and rd.ordered_access > wr.ordered_access:
         mismatches.append(dds_qos_policy_id.DDS_PRESENTATION_QOS_POLICY_ID)
 
-    deadline_rd = to_kind_deadline(endpoint_reader.qos)
-    deadline_wr = to_kind_deadline(endpoint_writer.qos)
-    if deadline_rd and deadline_wr and deadline_rd < deadline_wr:
+    if rd.deadline and wr.deadline and rd.deadline < wr.deadline:
         mismatches.append(dds_qos_policy_id.DDS_DEADLINE_QOS_POLICY_ID)
 
-    lat_duration_rd = to_kind_lat_duration(endpoint_reader.qos)
-    lat_duration_wr = to_kind_lat_duration(endpoint_writer.qos)
-    if lat_duration_rd and lat_duration_wr and lat_duration_rd < lat_duration_wr:
+    if rd.lat_duration and wr.lat_duration and rd.lat_duration < wr.lat_duration:
         mismatches.append(dds_qos_policy_id.DDS_LATENCYBUDGET_QOS_POLICY_ID)
 
-    ownership_rd = to_kind_ownership(endpoint_reader.qos)
-    ownership_wr = to_kind_ownership(endpoint_writer.qos)
-    if ownership_rd and ownership_wr and ownership_rd != ownership_wr:
+    if rd.ownership and wr.ownership and rd.ownership != wr.ownership:
         mismatches.append(dds_qos_policy_id.DDS_OWNERSHIP_QOS_POLICY_ID)
 
-    liveliness_rd = to_kind_liveliness(endpoint_reader.qos)
-    liveliness_wr = to_kind_liveliness(endpoint_writer.qos)
-    if liveliness_rd and liveliness_wr and liveliness_rd > liveliness_wr:
+    if rd.liveliness and wr.liveliness and rd.liveliness > wr.liveliness:
         mismatches.append(dds_qos_policy_id.DDS_LIVELINESS_QOS_POLICY_ID)
 
-    live_duration_rd = to_kind_live_duration(endpoint_reader.qos)
-    live_duration_wr = to_kind_live_duration(endpoint_writer.qos)
-    if live_duration_rd and live_duration_wr and live_duration_rd < live_duration_wr:
+    if rd.live_duration and wr.live_duration and rd.live_duration < wr.live_duration:
         mismatches.append(dds_qos_policy_id.DDS_LIVELINESS_QOS_POLICY_ID)
 
-    destination_order_rd = to_kind_destination_order(endpoint_reader.qos)
-    destination_order_wr = to_kind_destination_order(endpoint_writer.qos)
-    if destination_order_rd and destination_order_wr and destination_order_rd > destination_order_wr:
+    if rd.destination_order and wr.destination_order and rd.destination_order > wr.destination_order:
         mismatches.append(dds_qos_policy_id.DDS_DESTINATIONORDER_QOS_POLICY_ID)
 
-    if qos.Policy.DataRepresentation in endpoint_reader.qos and qos.Policy.DataRepresentation in endpoint_writer.qos:
-        if endpoint_writer.qos[qos.Policy.DataRepresentation].use_cdrv0_representation and endpoint_reader.qos[qos.Policy.DataRepresentation].use_cdrv0_representation:
+    if rd.data_representation is not None and wr.data_representation is not None:
+        (rd_cdrv0, rd_xcdrv2) = rd.data_representation
+        (wr_cdrv0, wr_xcdrv2) = wr.data_representation
+        if wr_cdrv0 and rd_cdrv0:
             pass # ok - both using cdrv0
-        elif endpoint_writer.qos[qos.Policy.DataRepresentation].use_xcdrv2_representation and endpoint_reader.qos[qos.Policy.DataRepresentation].use_xcdrv2_representation:
+        elif wr_xcdrv2 and rd_xcdrv2:
             pass # ok - both using xcdrv2
         else:
             mismatches.append(dds_qos_policy_id.DDS_DATA_REPRESENTATION_QOS_POLICY_ID)
@@ -89,10 +122,11 @@ def qos_match(endpoint_reader, endpoint_writer) -> list:
     if False: # feature_typelib:
         pass # TODO: finish implementation of xtypes qos check
     else:
-        if endpoint_reader.type_name != endpoint_writer.type_name:
+        if rd.type_name != wr.type_name:
             mismatches.append(dds_qos_policy_id.DDS_INVALID_QOS_POLICY_ID)
 
-    return mismatches
+    # tuple, the cached result is shared between all callers
+    return tuple(mismatches)
 
 class dds_durability_kind(OrderedEnum):
     DDS_DURABILITY_VOLATILE = 0
@@ -198,14 +198,17 @@ def getConfiguredDomainIds():
 
 
 def getDataType(domainId, endp):
+    requestedDataType, _ = getDataTypeAndMapping(domainId, endp)
+    return requestedDataType
+
+def getDataTypeAndMapping(domainId, endp):
     with DomainParticipantFactory.get_participant(domainId) as participant:
         try:
-            requestedDataType, _ = dynamic.get_types_for_typeid(participant, endp.type_id, duration(seconds=3))
-            return requestedDataType
+            return dynamic.get_types_for_typeid(participant, endp.type_id, duration(seconds=3))
         except Exception as e:
             logging.error(str(e))
 
-    return None
+    return (None, None)
 
 def normalizeGuid(guid: str) -> str:
 
@@ -220,6 +223,11 @@ def normalizeGuid(guid: str) -> str:
 
     return f"{part0}-{part1[:4]}-{part1[4:8]}-{part2[:4]}-{part2[4:8]}{part3}"
 
+def hasValidData(sample) -> bool:
+    """False for the InvalidSample a dispose or unregister is read as, it carries no data to serialize."""
+    info = getattr(sample, "sample_info", None)
+    return info is None or bool(info.valid_data)
+
 def toQos(
         # Reader/Writer
         q_own, q_dur, q_rel, q_rel_max_block_msec, q_xcdr1, q_xcdr2,
@@ -0,0 +1,167 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import fnmatch
+import re
+from loguru import logger as logging
+from typing import Dict, List, Optional, Set
+from PySide6.QtCore import QSettings
+from cyclonedds.builtin import DcpsEndpoint, DcpsParticipant
+from cyclonedds.core import Policy
+
+from dds_access.datatypes.participant_info import ParticipantInfo
+
+
+# Builtin topics of DDS and OpenSplice, never shown
+IGNORE_TOPICS = [
+                # DDS-Spec
+                "DCPSParticipant", "DCPSPublication", "DCPSSubscription",
+                # OSPL-BuiltIn-Topics
+                "CMParticipant", "CMDataReader", "CMDataWriter", "CMSubscriber", "CMPublisher",
+                "DCPSTopic", "DCPSType", "DCPSHeartbeat", "DCPSCandMCommand", "DCPSDelivery"]
+
+# QSettings keys of the rule lists, each a comma separated list of glob
+# patterns, or regular expressions when prefixed with "re:"
+FILTER_SETTINGS = ["include_topics", "exclude_topics", "include_partitions", "exclude_partitions",
+                   "include_hosts", "exclude_hosts", "include_processes", "exclude_processes",
+                   "include_vendors", "exclude_vendors"]
+
+
+def compileRule(patterns: str) -> Optional[re.Pattern]:
+    """One regex for a comma separated list of patterns, None if the list is empty."""
+    parts = []
+    for pattern in patterns.split(","):
+        pattern = pattern.strip()
+        if pattern.startswith("re:"):
+            parts.append(f"(?:{pattern[3:]})\\Z")
+        elif pattern:
+            parts.append(fnmatch.translate(pattern))
+    if len(parts) == 0:
+        return None
+    try:
+        return re.compile("|".join(parts))
+    except re.error as e:
+        logging.error(f"Invalid discovery filter '{patterns}': {str(e)}")
+        return None
+
+
+def passes(value: str, include: Optional[re.Pattern], exclude: Optional[re.Pattern]) -> bool:
+    if include is not None and include.match(value) is None:
+        return False
+    if exclude is not None and exclude.match(value) is not None:
+        return False
+    return True
+
+
+def passesAny(values: List[str], include: Optional[re.Pattern], exclude: Optional[re.Pattern]) -> bool:
+    """For an entity known by several names: included if any name is
+    included, rejected if any name is excluded."""
+    if include is not None and all(include.match(value) is None for value in values):
+        return False
+    if exclude is not None and any(exclude.match(value) is not None for value in values):
+        return False
+    return True
+
+
+class DiscoveryFilter:
+    """Include/exclude rules applied by the BuiltInObserver before queueing.
+
+    Topics and partitions are checked on the endpoint samples, hostname,
+    process and vendor on the participant samples. Endpoints of a rejected
+    participant are rejected with it, also when they were discovered before
+    their participant: those are withdrawn again with a remove.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, str]] = None):
+        rules = rules or {}
+        self.rules: Dict[str, Optional[re.Pattern]] = {name: compileRule(rules.get(name, "")) for name in FILTER_SETTINGS}
+        self.participant_rules = any(self.rules[name] is not None for name in
+            ["include_hosts", "exclude_hosts", "include_processes", "exclude_processes", "include_vendors", "exclude_vendors"])
+
+        self.topic_results: Dict[str, bool] = {}
+        self.rejected_participants: Set[str] = set()
+        self.rejected_endpoints: Set[str] = set()
+        # Accepted endpoints whose participant was not checked yet
+        self.unchecked: Dict[str, List[DcpsEndpoint]] = {}
+        self.checked_participants: Set[str] = set()
+
+    @staticmethod
+    def fromSettings() -> "DiscoveryFilter":
+        settings = QSettings()
+        return DiscoveryFilter({name: settings.value(f"discovery/{name}", "", type=str) for name in FILTER_SETTINGS})
+
+    def acceptTopic(self, topic_name: str) -> bool:
+        if topic_name not in self.topic_results:
+            self.topic_results[topic_name] = topic_name not in IGNORE_TOPICS and passes(
+                topic_name, self.rules["include_topics"], self.rules["exclude_topics"])
+        return self.topic_results[topic_name]
+
+    def acceptPartitions(self, endpoint: DcpsEndpoint) -> bool:
+        include = self.rules["include_partitions"]
+        exclude = self.rules["exclude_partitions"]
+        if include is None and exclude is None:
+            return True
+        partitions = [""]
+        if Policy.Partition in endpoint.qos and len(endpoint.qos[Policy.Partition].partitions) > 0:
+            partitions = endpoint.qos[Policy.Partition].partitions
+        return any(passes(str(p), include, exclude) for p in partitions)
+
+    def acceptParticipant(self, participant: DcpsParticipant) -> bool:
+        """Checks a discovered participant. Returns whether to forward it."""
+        key = str(participant.key)
+        if not self.participant_rules:
+            return True
+
+        info = ParticipantInfo(participant)
+        accepted = (passes(info.hostname, self.rules["include_hosts"], self.rules["exclude_hosts"]) and
+                    passesAny([info.process_name, info.app_name], self.rules["include_processes"], self.rules["exclude_processes"]) and
+                    passesAny([info.vendor_short_name, info.vendor_name], self.rules["include_vendors"], self.rules["exclude_vendors"]))
+        self.checked_participants.add(key)
+        if not accepted:
+            self.rejected_participants.add(key)
+        return accepted
+
+    def withdrawUnchecked(self, participant: DcpsParticipant) -> List[DcpsEndpoint]:
+        """Endpoints forwarded before their participant was checked, to remove if it got rejected."""
+        endpoints = self.unchecked.pop(str(participant.key), [])
+        if str(participant.key) in self.rejected_participants:
+            for endpoint in endpoints:
+                self.rejected_endpoints.add(str(endpoint.key))
+            return endpoints
+        return []
+
+    def acceptEndpoint(self, endpoint: DcpsEndpoint) -> bool:
+        participant_key = str(endpoint.participant_key)
+        accepted = (participant_key not in self.rejected_participants and
+                    self.acceptTopic(str(endpoint.topic_name)) and
+                    self.acceptPartitions(endpoint))
+        if not accepted:
+            self.rejected_endpoints.add(str(endpoint.key))
+        elif self.participant_rules and participant_key not in self.checked_participants:
+            self.unchecked.setdefault(participant_key, []).append(endpoint)
+        return accepted
+
+    def acceptRemovedParticipant(self, participant: DcpsParticipant) -> bool:
+        key = str(participant.key)
+        self.checked_participants.discard(key)
+        self.unchecked.pop(key, None)
+        if key in self.rejected_participants:
+            self.rejected_participants.discard(key)
+            return False
+        return True
+
+    def acceptRemovedEndpoint(self, endpoint: DcpsEndpoint) -> bool:
+        key = str(endpoint.key)
+        if key in self.rejected_endpoints:
+            self.rejected_endpoints.discard(key)
+            return False
+        return True
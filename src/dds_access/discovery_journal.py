@@ -0,0 +1,250 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import base64
+import dataclasses
+import gzip
+import json
+import struct
+import threading
+import time
+import uuid
+from loguru import logger as logging
+from queue import Queue, Full
+from typing import BinaryIO, Iterator, Optional, Set, Tuple
+from PySide6.QtCore import QThread
+from cyclonedds.builtin import DcpsEndpoint, DcpsParticipant, DcpsTopic
+from cyclonedds.core import Qos
+from cyclonedds.idl._typesupport.DDS.XTypes import TypeIdentifier
+
+from dds_access.builtin_observer import BuiltInDataItem
+from dds_access.datatypes.entity_type import EntityType
+
+
+# A journal is a header followed by length prefixed json frames, one frame
+# per BuiltInDataItem: {"offset": seconds since journal start, "items":
+# {item list: [[domain id, sample fields, entity type], ...]}}. Frames only
+# hold data, reading a journal never constructs other than the builtin
+# sample types, Qos and type identifiers.
+JOURNAL_MAGIC = b"CDDSIJ02"
+FRAME_HEADER = struct.Struct("<I")
+
+ITEM_FIELDS = ("new_participants", "remove_participants", "update_participants",
+               "new_topics", "new_endpoints", "remove_endpoints")
+
+SAMPLE_TYPES = {
+    "new_participants": DcpsParticipant,
+    "remove_participants": DcpsParticipant,
+    "update_participants": DcpsParticipant,
+    "new_topics": DcpsTopic,
+    "new_endpoints": DcpsEndpoint,
+    "remove_endpoints": DcpsEndpoint
+}
+
+
+def _open(path: str, mode: str) -> BinaryIO:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def _encode_value(value):
+    if isinstance(value, uuid.UUID):
+        return {"uuid": str(value)}
+    if isinstance(value, Qos):
+        return {"qos": _encode_value(value.asdict())}
+    if isinstance(value, TypeIdentifier):
+        return {"type_id": base64.b64encode(bytes(value.serialize())).decode("ascii")}
+    if isinstance(value, (bytes, bytearray)):
+        return {"bytes": base64.b64encode(bytes(value)).decode("ascii")}
+    if isinstance(value, dict):
+        return {"dict": {key: _encode_value(v) for key, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(v) for v in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise ValueError(f"Cannot journal a {type(value).__name__}")
+
+
+def _decode_value(value):
+    if isinstance(value, list):
+        return [_decode_value(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "uuid" in value:
+        return uuid.UUID(value["uuid"])
+    if "qos" in value:
+        return Qos.fromdict(_decode_value(value["qos"]))
+    if "type_id" in value:
+        return TypeIdentifier.deserialize(base64.b64decode(value["type_id"]))
+    if "bytes" in value:
+        return base64.b64decode(value["bytes"])
+    if "dict" in value:
+        return {key: _decode_value(v) for key, v in value["dict"].items()}
+    raise ValueError("Unknown value in discovery journal")
+
+
+def _sample_fields(sample) -> dict:
+    # The sample info refers to the reader it was taken from, it is left out
+    names = [f.name for f in dataclasses.fields(sample)] if dataclasses.is_dataclass(sample) else list(vars(sample))
+    return {name: _encode_value(getattr(sample, name)) for name in names if name != "sample_info"}
+
+
+def encode_entry(entry: tuple) -> list:
+    entity_type = entry[2].value if len(entry) > 2 else None
+    return [entry[0], _sample_fields(entry[1]), entity_type]
+
+
+def decode_entry(name: str, encoded: list) -> tuple:
+    (domain_id, fields, entity_type) = encoded
+    sample = SAMPLE_TYPES[name](**{key: _decode_value(value) for key, value in fields.items()})
+    if entity_type is None:
+        return (int(domain_id), sample)
+    return (int(domain_id), sample, EntityType(entity_type))
+
+
+class DiscoveryJournal:
+    """Appends the builtin samples of BuiltInDataItems to a journal file.
+
+    Shared by all observed domains, record() is thread safe.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.start = time.monotonic()
+        self.file: Optional[BinaryIO] = _open(path, "wb")
+        self.file.write(JOURNAL_MAGIC)
+        self.write_frame({"started": time.time()})
+        logging.info(f"Recording discovery journal to {path}")
+
+    def write_frame(self, obj):
+        data = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+        self.file.write(FRAME_HEADER.pack(len(data)))
+        self.file.write(data)
+
+    def record(self, item: BuiltInDataItem):
+        if item.empty():
+            return
+        try:
+            items = {name: [encode_entry(entry) for entry in getattr(item, name)]
+                     for name in ITEM_FIELDS if len(getattr(item, name)) > 0}
+        except Exception as e:
+            logging.error(f"Failed to encode discovery journal frame: {str(e)}")
+            return
+        with self.lock:
+            if self.file is None:
+                return
+            try:
+                self.write_frame({"offset": item.timestamp - self.start, "items": items})
+            except Exception as e:
+                logging.error(f"Failed to write discovery journal: {str(e)}")
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+                logging.info(f"Discovery journal {self.path} closed")
+
+
+def read_journal(path: str) -> Iterator[Tuple[float, BuiltInDataItem]]:
+    """Yields (seconds since journal start, item) for each recorded frame.
+
+    A journal whose recording was killed ends with its last complete frame.
+    """
+    with _open(path, "rb") as file:
+        if file.read(len(JOURNAL_MAGIC)) != JOURNAL_MAGIC:
+            raise ValueError(f"{path} is not a discovery journal")
+
+        header = True
+        while True:
+            try:
+                length = file.read(FRAME_HEADER.size)
+                if len(length) < FRAME_HEADER.size:
+                    break
+                size = FRAME_HEADER.unpack(length)[0]
+                data = file.read(size)
+            except EOFError:
+                # Truncated gzip stream
+                break
+            if len(data) < size:
+                break
+            if header:
+                header = False
+                continue
+
+            frame = json.loads(data.decode("utf-8"))
+            item = BuiltInDataItem()
+            for name, entries in frame["items"].items():
+                if name in SAMPLE_TYPES:
+                    setattr(item, name, [decode_entry(name, entry) for entry in entries])
+            yield (frame["offset"], item)
+
+
+def journal_domain_ids(path: str) -> Set[int]:
+    domain_ids = set()
+    for (_, item) in read_journal(path):
+        for name in ITEM_FIELDS:
+            domain_ids.update(entry[0] for entry in getattr(item, name))
+    return domain_ids
+
+
+class DiscoveryReplay(QThread):
+    """Feeds a recorded journal into the queue the observers normally fill.
+
+    A speed of 1.0 keeps the recorded timing, 0 replays as fast as possible.
+    """
+
+    def __init__(self, path: str, queue: Queue, speed: float = 1.0):
+        super().__init__()
+        self.path = path
+        self.queue = queue
+        self.speed = speed
+        self.running = False
+        # Set by stop(), wakes the thread while it waits for the next item
+        self.stopped = threading.Event()
+
+    def stop(self):
+        self.running = False
+        self.stopped.set()
+
+    def put(self, item: BuiltInDataItem) -> bool:
+        while self.running:
+            try:
+                self.queue.put(item, timeout=0.5)
+                return True
+            except Full:
+                logging.debug("discovery replay queue full")
+        return False
+
+    def run(self):
+        logging.info(f"Replay discovery journal {self.path} (speed: {self.speed}) ...")
+        self.running = True
+        start = time.monotonic()
+        count = 0
+        try:
+            for (offset, item) in read_journal(self.path):
+                if not self.running:
+                    break
+                if self.speed > 0:
+                    delay = start + offset / self.speed - time.monotonic()
+                    if delay > 0 and self.stopped.wait(delay):
+                        break
+                item.timestamp = time.monotonic()
+                if not self.put(item):
+                    break
+                count += 1
+        except Exception as e:
+            logging.error(f"Failed to replay discovery journal: {str(e)}")
+
+        logging.info(f"Replay discovery journal {self.path} ... DONE ({count} items)")
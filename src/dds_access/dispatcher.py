@@ -11,8 +11,8 @@
 """
 
 from loguru import logger as logging
-import datetime
-from PySide6.QtCore import Signal, Slot, QThread
+import time
+from PySide6.QtCore import Signal, Slot, QThread, QSettings
 from cyclonedds import core
 from cyclonedds.util import duration
 from cyclonedds.core import SampleState, ViewState, InstanceState
@@ -23,11 +23,64 @@ from dds_access.dds_listener import DdsListener
 from threading import Lock, Event
 from dds_access.domain_participant_factory import DomainParticipantFactory
 from dds_access.datatypes.entity_type import EntityType
+from dds_access.reader_stats import ReaderStats
+from dds_access.sample_filter import compile_filter
+
+
+# Bounds of one batch of received samples, see DispatcherThread.dispatch
+DISPATCH_BATCH_SIZE = 1000
+DISPATCH_BATCH_INTERVAL_MS = 50
+
+# Period of the onStats signal, also the longest wait of the waitset
+STATS_INTERVAL_S = 1.0
+
+
+class DispatcherWorker(QThread):
+    """Waits for and dispatches the samples of some of the readers of a DispatcherThread.
+
+    Used with the listener/dispatcher_workers setting, so a busy reader only
+    delays the readers that share its worker.
+    """
+
+    def __init__(self, dispatcher, index: int):
+        super().__init__()
+        self.dispatcher = dispatcher
+        self.index = index
+        self.running = False
+        self.readers = []
+        self.waitset = core.WaitSet(dispatcher.domain_participant)
+        self.guardCondition = core.GuardCondition(dispatcher.domain_participant)
+        self.waitset.attach(self.guardCondition)
+
+    def run(self):
+        logging.info(f"Dispatcher worker {self.index} for domain({str(self.dispatcher.domain_id)}) ...")
+        self.running = True
+        rotation = 0
+        while self.running:
+            amount_triggered = 0
+            try:
+                amount_triggered = self.waitset.wait(duration(seconds=STATS_INTERVAL_S))
+            except:
+                pass
+            if amount_triggered == 0 or not self.running:
+                continue
+            self.dispatcher.dispatch(list(self.readers), rotation)
+            rotation += 1
+        logging.info(f"Dispatcher worker {self.index} for domain({str(self.dispatcher.domain_id)}) ... DONE")
+
+    def stop(self):
+        self.running = False
+        self.guardCondition.set(True)
 
 
 class DispatcherThread(QThread):
 
-    onData = Signal(str, str)
+    # list of (reader id, reception time, sample), all samples taken in one wakeup
+    onData = Signal(list)
+    # reader id -> ReaderStats.snapshot()
+    onStats = Signal(dict)
+    # reader id, error of a filter expression that does not fit the type
+    onFilterError = Signal(str, str)
 
     def __init__(self, id: str, domain_id: int, topic_name: str, topic_type, qos, entityType, parent=None):
         super().__init__(parent)
@@ -37,8 +90,23 @@ class DispatcherThread(QThread):
         self.running = False
         self.readerData = []
         self.writerData = {}
+        # The readers waited for by this thread, and by each worker
+        self.readers = []
+        self.workers = []
+        self.workerCount = QSettings().value("listener/dispatcher_workers", 1, type=int)
+        # reader id -> this thread or the DispatcherWorker it is attached to
+        self.readerGroups = {}
         self.mutex = Lock()
         self.dpSetUpDone = Event()
+        # CaptureWriter the samples of all readers are recorded to, if any
+        self.capture = None
+        self.readerStats = {}
+        # reader id -> filter expression, read when the reader is created
+        self.readerFilters = {}
+        # reader id -> compiled filter evaluated on taken samples, for
+        # readers whose topic does not take the filter
+        self.readerPredicates = {}
+        self.lastStats = time.monotonic()
 
         # initial endpoint
         self.entityType = entityType
@@ -81,31 +149,48 @@ class DispatcherThread(QThread):
             logging.info(f"Delete writer {id}")
             del self.writerData[id]
 
+    def attachReader(self, group, entry):
+        group.guardCondition.set(True)
+        group.waitset.attach(entry[4])
+        group.readers.append(entry)
+        group.guardCondition.set(False)
+        self.readerGroups[entry[0]] = group
+
+    def detachReader(self, entry):
+        group = self.readerGroups.pop(entry[0], self)
+        group.guardCondition.set(True)
+        group.waitset.detach(entry[4])
+        group.readers[:] = [e for e in group.readers if e is not entry]
+        group.guardCondition.set(False)
+
+    def pickGroup(self):
+        # The worker with the fewest readers, this thread if there are none
+        if len(self.workers) == 0:
+            return self
+        return min(self.workers, key=lambda worker: len(worker.readers))
+
     @Slot()
     def deleteAllReaders(self):
         logging.info(f"Delete all readers")
-        self.guardCondition.set(True)
-        for id, tp, sub, rd, readCondition in self.readerData:
-            logging.info(f"Delete reader {id} ({tp.name})")
-            self.waitset.detach(readCondition)
-            del rd
-            del sub
-            del tp
+        for entry in self.readerData:
+            logging.info(f"Delete reader {entry[0]} ({entry[1].name})")
+            self.detachReader(entry)
         self.readerData.clear()
-        self.guardCondition.set(False)
+        self.readerStats.clear()
+        self.readerPredicates.clear()
+        self.listener.reader_stats.clear()
 
     @Slot(str)
     def deleteReader(self, _id: str):
-        for i, (readerId, tp, sub, rd, readCondition) in enumerate(self.readerData):
+        for i, entry in enumerate(self.readerData):
+            (readerId, tp, _, rd, _) = entry
             if readerId == _id:
                 logging.info(f"Delete reader {_id} ({tp.name})")
-                self.guardCondition.set(True)
-                self.waitset.detach(readCondition)
-                del rd
-                del sub
-                del tp
+                self.detachReader(entry)
+                self.readerStats.pop(_id, None)
+                self.readerPredicates.pop(_id, None)
+                self.listener.reader_stats.pop(rd.instance_handle, None)
                 del self.readerData[i]
-                self.guardCondition.set(False)
                 break
 
     @Slot()
@@ -117,12 +202,14 @@ class DispatcherThread(QThread):
 
             if entity_type == EntityType.READER:
                 subscriber = Subscriber(self.domain_participant, qos=pubSubQos, listener=self.listener)
-                reader = DataReader(subscriber, topic, qos=endpQos, listener=self.listener)
+                readTopic = self.filteredTopic(id, topic, topic_type)
+                reader = DataReader(subscriber, readTopic, qos=endpQos, listener=self.listener)
                 readCondition = core.ReadCondition(reader, SampleState.Any | ViewState.Any | InstanceState.Any)
-                self.guardCondition.set(True)
-                self.waitset.attach(readCondition)
-                self.guardCondition.set(False)
-                self.readerData.append((id, topic, subscriber, reader, readCondition))
+                entry = (id, topic, subscriber, reader, readCondition)
+                self.readerData.append(entry)
+                self.attachReader(self.pickGroup(), entry)
+                self.readerStats[id] = ReaderStats()
+                self.listener.reader_stats[reader.instance_handle] = self.readerStats[id]
 
             elif entity_type == EntityType.WRITER:
                 publisher = Publisher(self.domain_participant, qos=pubSubQos, listener=self.listener)
@@ -134,6 +221,28 @@ class DispatcherThread(QThread):
         except Exception as e:
             logging.error(f"Error creating endpoint {topic_name}: {e}")
 
+    def filteredTopic(self, id: str, topic: Topic, topic_type):
+        expression = self.readerFilters.get(id, "")
+        if not expression:
+            return topic
+        try:
+            predicate = compile_filter(topic_type, expression)
+        except ValueError as e:
+            # Not kept, so the reader is not shown as filtered
+            logging.error(f"Reader {id} without filter: {e}")
+            self.readerFilters.pop(id, None)
+            self.onFilterError.emit(id, str(e))
+            return topic
+
+        # Every reader has its own Topic entity, cyclonedds applies the filter
+        # to the samples of that reader before they reach its cache
+        try:
+            topic.set_topic_filter(predicate)
+        except Exception as e:
+            logging.warning(f"Topic filter not available, filtering in the dispatcher: {e}")
+            self.readerPredicates[id] = predicate
+        return topic
+
     def run(self):
         self.dpSetUpDone.clear()
         with DomainParticipantFactory.get_participant(self.domain_id) as domain_participant:
@@ -145,31 +254,88 @@ class DispatcherThread(QThread):
             self.waitset.attach(self.guardCondition)
             logging.info(f"Worker thread is set up domain({str(self.domain_id)})")
 
+            if self.workerCount > 1:
+                self.workers = [DispatcherWorker(self, index) for index in range(self.workerCount)]
+                for worker in self.workers:
+                    worker.start()
+
             self.addEndpoint(self.id, self.topic_name, self.topic_type, self.qos, self.entityType)
 
             self.dpSetUpDone.set()
 
+            rotation = 0
             while self.running:
                 amount_triggered = 0
                 try:
-                    amount_triggered = self.waitset.wait(duration(infinite=True))
+                    amount_triggered = self.waitset.wait(duration(seconds=STATS_INTERVAL_S))
                 except:
                     pass
-                if amount_triggered == 0:
+                self.emitStats()
+                if amount_triggered == 0 or len(self.readers) == 0:
                     continue
 
-                for (_id, _, _, readItem, condItem) in self.readerData:
-                    for sample in readItem.take(condition=condItem):
-                        logging.trace(f"Received sample: {str(sample)}")
-                        self.onData.emit(_id, f"[{str(datetime.datetime.now().isoformat())}]  -  {str(sample)}")
+                self.dispatch(list(self.readers), rotation)
+                rotation += 1
 
-                # clean up references to last items
-                _id = None
-                readItem = None
-                condItem = None
+            for worker in self.workers:
+                worker.stop()
+            for worker in self.workers:
+                worker.wait()
+            self.workers.clear()
 
             logging.info(f"Worker thread for domain({str(self.domain_id)}) ... DONE")
 
+    def dispatch(self, readers: list, rotation: int):
+        """Takes the samples of the readers and emits them in batches.
+
+        Each reader takes at most its share of a batch per call, starting
+        with another reader every call. Samples left over trigger the
+        waitset again, so a reader that keeps delivering cannot starve the
+        others.
+        """
+        if len(readers) == 0:
+            return
+        quota = max(1, DISPATCH_BATCH_SIZE // len(readers))
+
+        batch = []
+        batch_start = time.monotonic()
+        for k in range(len(readers)):
+            (_id, topic, subscriber, readItem, condItem) = readers[(rotation + k) % len(readers)]
+            samples = readItem.take(N=quota, condition=condItem)
+            if len(samples) == 0:
+                continue
+            predicate = self.readerPredicates.get(_id)
+            if predicate is not None:
+                samples = [sample for sample in samples if predicate(sample)]
+            stats = self.readerStats.get(_id)
+            if stats is not None:
+                stats.record(samples)
+            capture = self.capture
+            if capture is not None:
+                capture.record(_id, self.domain_id, topic, subscriber, readItem, samples)
+            # Rendered to text by the ReceiverModel, only when shown
+            timestamp = time.time()
+            for sample in samples:
+                batch.append((_id, timestamp, sample))
+
+            if len(batch) >= DISPATCH_BATCH_SIZE or (time.monotonic() - batch_start) * 1000 >= DISPATCH_BATCH_INTERVAL_MS:
+                self.onData.emit(batch)
+                batch = []
+                batch_start = time.monotonic()
+
+        if len(batch) > 0:
+            self.onData.emit(batch)
+
+    def emitStats(self):
+        now = time.monotonic()
+        if now - self.lastStats < STATS_INTERVAL_S or len(self.readerStats) == 0:
+            return
+        self.lastStats = now
+        self.onStats.emit({readerId: stats.snapshot() for readerId, stats in list(self.readerStats.items())})
+
+    def setCapture(self, capture):
+        self.capture = capture
+
     def stop(self):
         logging.info(f"Request to stop worker thread for domain({str(self.domain_id)})")
         self.running = False
@@ -10,6 +10,7 @@
  * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
 """
 
+import threading
 from loguru import logger as logging
 from cyclonedds import domain
 
@@ -17,17 +18,20 @@ from cyclonedds import domain
 class DomainParticipantFactory:
     _participants = {}
     _ref_count = {}
+    # Participants are requested from the observer, dispatcher and type resolver threads
+    _lock = threading.RLock()
 
     @classmethod
     def get_participant(cls, domain_id):
-        if domain_id not in cls._participants:
-            # Create a new participant and initialize reference count
-            logging.info(f"Creating participant for domain {domain_id}")
-            cls._participants[domain_id] = domain.DomainParticipant(domain_id)
-            cls._ref_count[domain_id] = 1
-        else:
-            # Increment reference count for existing participant
-            cls._ref_count[domain_id] += 1
+        with cls._lock:
+            if domain_id not in cls._participants:
+                # Create a new participant and initialize reference count
+                logging.info(f"Creating participant for domain {domain_id}")
+                cls._participants[domain_id] = domain.DomainParticipant(domain_id)
+                cls._ref_count[domain_id] = 1
+            else:
+                # Increment reference count for existing participant
+                cls._ref_count[domain_id] += 1
         return cls._RAIIWrapper(cls, domain_id)
 
     class _RAIIWrapper:
@@ -39,10 +43,11 @@ class DomainParticipantFactory:
             return self._factory._participants[self._domain_id]
 
         def __exit__(self, exc_type, exc_value, traceback):
-            # Decrease the reference count and clean up if no more references
-            self._factory._ref_count[self._domain_id] -= 1
-            if self._factory._ref_count[self._domain_id] == 0:
-                logging.info(f"Cleaning up participant for domain {self._domain_id}")
-                # Delete the participant and its reference count
-                del self._factory._participants[self._domain_id]
-                del self._factory._ref_count[self._domain_id]
+            with self._factory._lock:
+                # Decrease the reference count and clean up if no more references
+                self._factory._ref_count[self._domain_id] -= 1
+                if self._factory._ref_count[self._domain_id] == 0:
+                    logging.info(f"Cleaning up participant for domain {self._domain_id}")
+                    # Delete the participant and its reference count
+                    del self._factory._participants[self._domain_id]
+                    del self._factory._ref_count[self._domain_id]
@@ -0,0 +1,125 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import threading
+import time
+from typing import List
+
+
+# Serializing a sample to learn its size is not free, only every nth
+# sample is measured and the average size extrapolated
+BYTES_MEASURE_EVERY = 16
+
+# Latency histogram: exact below 16 us, above with 8 buckets per power of
+# two, so a percentile is off by at most 12.5 %
+SUB_BUCKETS = 8
+HISTOGRAM_SIZE = SUB_BUCKETS * 64
+
+
+def latency_bucket(us: int) -> int:
+    if us < 2 * SUB_BUCKETS:
+        return us
+    shift = us.bit_length() - 4
+    return (shift + 1) * SUB_BUCKETS + (us >> shift) - SUB_BUCKETS
+
+
+def bucket_latency(bucket: int) -> int:
+    """Lower bound of a bucket in us."""
+    if bucket < 2 * SUB_BUCKETS:
+        return bucket
+    shift = bucket // SUB_BUCKETS - 1
+    return (bucket % SUB_BUCKETS + SUB_BUCKETS) << shift
+
+
+class ReaderStats:
+    """Throughput and latency of one listener reader.
+
+    Updated by the dispatcher thread for taken samples and by the listener
+    callbacks for lost and rejected ones. The latency is the reception time
+    minus the source timestamp, so it includes the clock offset of the
+    writing host.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = 0
+        self.measured_samples = 0
+        self.measured_bytes = 0
+        self.lost = 0
+        self.rejected = 0
+        self.histogram: List[int] = [0] * HISTOGRAM_SIZE
+        self.max_latency_us = 0
+
+        self.last_time = time.monotonic()
+        self.last_samples = 0
+
+    def record(self, samples: list):
+        reception = time.time_ns()
+        for sample in samples:
+            if self.samples % BYTES_MEASURE_EVERY == 0:
+                try:
+                    self.measured_bytes += len(sample.serialize())
+                    self.measured_samples += 1
+                except Exception:
+                    pass
+            self.samples += 1
+
+            latency_us = max(0, (reception - sample.sample_info.source_timestamp) // 1000)
+            self.histogram[min(latency_bucket(latency_us), HISTOGRAM_SIZE - 1)] += 1
+            if latency_us > self.max_latency_us:
+                self.max_latency_us = latency_us
+
+    def addLost(self, count: int):
+        with self.lock:
+            self.lost += count
+
+    def addRejected(self, count: int):
+        with self.lock:
+            self.rejected += count
+
+    def percentile_us(self, fraction: float) -> int:
+        total = sum(self.histogram)
+        if total == 0:
+            return 0
+        rank = fraction * total
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank:
+                return bucket_latency(bucket)
+        return self.max_latency_us
+
+    def averageSize(self) -> float:
+        return self.measured_bytes / self.measured_samples if self.measured_samples > 0 else 0.0
+
+    def snapshot(self) -> dict:
+        """Rates since the previous snapshot, everything else since the start."""
+        now = time.monotonic()
+        elapsed = max(now - self.last_time, 1e-6)
+        samples_per_s = (self.samples - self.last_samples) / elapsed
+        self.last_time = now
+        self.last_samples = self.samples
+
+        with self.lock:
+            lost = self.lost
+            rejected = self.rejected
+
+        return {
+            "samples": self.samples,
+            "samples_per_s": samples_per_s,
+            "bytes_per_s": samples_per_s * self.averageSize(),
+            "latency_p50_ms": self.percentile_us(0.5) / 1000.0,
+            "latency_p99_ms": self.percentile_us(0.99) / 1000.0,
+            "latency_max_ms": self.max_latency_us / 1000.0,
+            "lost": lost,
+            "rejected": rejected
+        }
@@ -0,0 +1,88 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import ast
+import dataclasses
+import re
+from functools import lru_cache
+from typing import Callable
+
+
+# Nodes a filter expression may consist of, anything else is rejected
+ALLOWED_NODES = (ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+                 ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn,
+                 ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.FloorDiv,
+                 ast.Name, ast.Load, ast.Attribute, ast.Subscript, ast.Constant, ast.Tuple, ast.List)
+
+STRING_LITERAL = re.compile(r"('[^']*'|\"[^\"]*\")")
+SQL_SYNTAX = [(re.compile(r"\bAND\b", re.IGNORECASE), " and "),
+              (re.compile(r"\bOR\b", re.IGNORECASE), " or "),
+              (re.compile(r"\bNOT\b", re.IGNORECASE), " not "),
+              (re.compile(r"<>"), "!="),
+              (re.compile(r"(?<![=!<>])=(?!=)"), "==")]
+
+SAMPLE_NAME = "_sample"
+
+
+def to_python(expression: str) -> str:
+    """Accepts the SQL like syntax of DDS filter expressions as well."""
+    parts = STRING_LITERAL.split(expression)
+    for i in range(0, len(parts), 2):
+        for (pattern, replacement) in SQL_SYNTAX:
+            parts[i] = pattern.sub(replacement, parts[i])
+    return "".join(parts)
+
+
+class _SampleFields(ast.NodeTransformer):
+    """Turns the free names of an expression into fields of the sample."""
+
+    def __init__(self, field_names):
+        self.field_names = field_names
+
+    def visit_Name(self, node: ast.Name):
+        if node.id in ("True", "False", "None"):
+            return node
+        if self.field_names is not None and node.id not in self.field_names:
+            raise ValueError(f"Unknown field '{node.id}'")
+        return ast.copy_location(ast.Attribute(value=ast.Name(id=SAMPLE_NAME, ctx=ast.Load()), attr=node.id, ctx=ast.Load()), node)
+
+
+@lru_cache(maxsize=256)
+def compile_filter(data_type, expression: str) -> Callable[[object], bool]:
+    """Compiles a filter over the fields of data_type, like "vehicle_id == 42 and speed > 100".
+
+    Raises ValueError for invalid expressions. A sample the expression
+    cannot be evaluated on does not match.
+    """
+    try:
+        tree = ast.parse(to_python(expression).strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid filter expression: {e.msg}")
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ValueError(f"Unsupported in filter expression: {type(node).__name__}")
+        name = node.attr if isinstance(node, ast.Attribute) else node.id if isinstance(node, ast.Name) else ""
+        if name.startswith("_"):
+            raise ValueError(f"Unsupported field in filter expression: {name}")
+
+    field_names = {f.name for f in dataclasses.fields(data_type)} if dataclasses.is_dataclass(data_type) else None
+    tree = ast.fix_missing_locations(_SampleFields(field_names).visit(tree))
+    code = compile(tree, f"<filter {expression}>", "eval")
+
+    def matches(sample) -> bool:
+        try:
+            return bool(eval(code, {"__builtins__": {}}, {SAMPLE_NAME: sample}))
+        except Exception:
+            return False
+
+    return matches
@@ -0,0 +1,107 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import json
+import os
+import pickle
+import threading
+from loguru import logger as logging
+from typing import Dict, Optional
+from PySide6.QtCore import QStandardPaths
+from cyclonedds.idl._typesupport.DDS.XTypes import TypeIdentifier, TypeMapping
+from cyclonedds.idl._xt_builder import XTInterpreter
+
+
+INDEX_FILE = "index.json"
+
+
+class TypeCache:
+    """Types resolved from the network, kept on disk across sessions.
+
+    Every type is stored as its serialized type identifier and type mapping
+    in <type_id key>.xtype, the python class is rebuilt on load. index.json
+    maps the keys to the type names, oldest first, and is read on first use.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        if directory is None:
+            app_data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+            directory = os.path.join(app_data_dir, "datamodel", "xtypes")
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.index: Optional[Dict[str, str]] = None
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.xtype")
+
+    def loadIndex(self) -> Dict[str, str]:
+        if self.index is None:
+            self.index = {}
+            try:
+                with open(os.path.join(self.directory, INDEX_FILE), "r", encoding="utf-8") as f:
+                    self.index = json.load(f)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.error(f"Failed to read type cache index: {str(e)}")
+        return self.index
+
+    def keyForTypeName(self, type_name: str) -> Optional[str]:
+        """The most recently stored type of that name, types of different
+        versions or modules may share a name."""
+        with self.lock:
+            for key, name in reversed(list(self.loadIndex().items())):
+                if name == type_name:
+                    return key
+        return None
+
+    def load(self, key: str):
+        with self.lock:
+            if key not in self.loadIndex():
+                return None
+            try:
+                with open(self.path(key), "rb") as f:
+                    entry = pickle.load(f)
+                type_id = TypeIdentifier.deserialize(entry["type_id"])
+                type_mapping = TypeMapping.deserialize(entry["type_mapping"])
+                type_objects = {}
+                for pair in type_mapping.identifier_object_pair_minimal + type_mapping.identifier_object_pair_complete:
+                    type_objects[pair.type_identifier] = pair.type_object
+                logging.debug(f"Loaded type {entry['type_name']} from type cache")
+                return XTInterpreter.xt_to_class(type_id, type_objects)[0]
+            except Exception as e:
+                logging.warning(f"Dropping unreadable type cache entry {key}: {str(e)}")
+                del self.index[key]
+                return None
+
+    def store(self, key: str, type_name: str, data_type):
+        """Stores a resolved data type, the type id and mapping are taken from its class."""
+        with self.lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                entry = {
+                    "type_name": type_name,
+                    "type_id": bytes(data_type.__idl__.get_type_id().serialize()),
+                    "type_mapping": bytes(data_type.__idl__.get_type_mapping().serialize())
+                }
+                with open(self.path(key), "wb") as f:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+                # Moved to the end, so the newest type of a name is found first
+                self.loadIndex().pop(key, None)
+                self.index[key] = type_name
+                index_path = os.path.join(self.directory, INDEX_FILE)
+                with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump(self.index, f, indent=2)
+                os.replace(index_path + ".tmp", index_path)
+            except Exception as e:
+                logging.error(f"Failed to store type {type_name} in type cache: {str(e)}")
@@ -0,0 +1,153 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from loguru import logger as logging
+from queue import Queue, Empty, Full
+from typing import Dict, Optional, Set
+from PySide6.QtCore import QThread
+
+from dds_access.dds_utils import getDataTypeAndMapping
+from dds_access.type_cache import TypeCache
+
+
+TYPE_RESOLVER_WORKERS = 4
+PREFETCH_QUEUE_SIZE = 10000
+DEFAULT_PREFETCH_INTERVAL_MS = 200
+
+
+def type_id_key(type_id) -> str:
+    """Stable key of a type identifier, equal type ids give equal keys."""
+    try:
+        data = bytes(type_id.serialize())
+    except Exception:
+        data = repr(type_id).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class TypeResolver:
+    """Looks up data types by type_id on a small thread pool.
+
+    Resolved types are cached by type_id, in memory and in the on-disk
+    TypeCache which is asked before the network. Concurrent requests for
+    the same type_id share one lookup. The futures complete on the pool
+    threads.
+    """
+
+    def __init__(self, workers: int = TYPE_RESOLVER_WORKERS, type_cache: Optional[TypeCache] = None):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="type_resolver")
+        self.type_cache = type_cache if type_cache is not None else TypeCache()
+        self.lock = threading.Lock()
+        self.resolved: Dict[str, object] = {}
+        self.in_flight: Dict[str, Future] = {}
+
+    def resolve(self, domain_id: int, endpoint) -> Future:
+        return self.submit(type_id_key(endpoint.type_id), domain_id, endpoint)
+
+    def resolveCached(self, type_name: str) -> Future:
+        """For types no discovered endpoint can provide anymore, only asks the on-disk cache."""
+        key = self.type_cache.keyForTypeName(type_name)
+        if key is None:
+            future = Future()
+            future.set_result(None)
+            return future
+        return self.submit(key, None, None)
+
+    def submit(self, key: str, domain_id: Optional[int], endpoint) -> Future:
+        with self.lock:
+            if key in self.resolved:
+                future = Future()
+                future.set_result(self.resolved[key])
+                return future
+            if key in self.in_flight:
+                return self.in_flight[key]
+
+            future = self.executor.submit(self.lookup, key, domain_id, endpoint)
+            self.in_flight[key] = future
+            return future
+
+    def lookup(self, key: str, domain_id: Optional[int], endpoint):
+        dataType = None
+        try:
+            dataType = self.type_cache.load(key)
+            if dataType is None and endpoint is not None:
+                logging.debug(f"Resolve type {endpoint.type_name} in domain {domain_id}")
+                dataType, _ = getDataTypeAndMapping(domain_id, endpoint)
+                if dataType is not None:
+                    self.type_cache.store(key, endpoint.type_name, dataType)
+        finally:
+            with self.lock:
+                # Failed lookups are not cached, the next request tries again
+                if dataType is not None:
+                    self.resolved[key] = dataType
+                del self.in_flight[key]
+        return dataType
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class TypePrefetcher(QThread):
+    """Resolves the types of newly discovered endpoints in the background.
+
+    One lookup at a time with a pause in between, so prefetching never
+    competes with the lookups a user is waiting for.
+    """
+
+    def __init__(self, resolver: TypeResolver, interval_ms: int = DEFAULT_PREFETCH_INTERVAL_MS):
+        super().__init__()
+        self.resolver = resolver
+        self.interval = max(0, interval_ms) / 1000.0
+        self.queue = Queue(maxsize=PREFETCH_QUEUE_SIZE)
+        self.seen: Set[str] = set()
+        self.running = True
+
+    def prefetch(self, domain_id: int, endpoint):
+        try:
+            self.queue.put_nowait((domain_id, endpoint))
+        except Full:
+            pass
+
+    def stop(self):
+        self.running = False
+        try:
+            self.queue.put_nowait(None)
+        except Full:
+            pass
+
+    def run(self):
+        logging.info("type_prefetcher ...")
+        while self.running:
+            try:
+                entry = self.queue.get(timeout=1.0)
+            except Empty:
+                continue
+            if entry is None:
+                break
+
+            (domain_id, endpoint) = entry
+            key = type_id_key(endpoint.type_id)
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+
+            try:
+                self.resolver.resolve(domain_id, endpoint).result()
+            except Exception as e:
+                logging.debug(f"Prefetch of {endpoint.type_name} failed: {str(e)}")
+
+            if self.interval > 0:
+                self.msleep(int(self.interval * 1000))
+
+        logging.info("type_prefetcher ... DONE")
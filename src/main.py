@@ -85,6 +85,9 @@ if __name__ == "__main__":
     # Setup the logger
     parser = argparse.ArgumentParser(description="CycloneDDS Insight")
     parser.add_argument("--loglevel", type=str, help="Set logging level (TRACE, DEBUG, INFO, WARNING, ERROR, CRITICAL)", default="INFO")
+    parser.add_argument("--record-discovery", type=str, help="Record the discovery samples to a journal file (.gz for compressed)", default="")
+    parser.add_argument("--replay-discovery", type=str, help="Replay a recorded discovery journal file", default="")
+    parser.add_argument("--replay-speed", type=float, help="Replay speed factor, 0 replays as fast as possible", default=1.0)
     args = parser.parse_args()
     loglevel = args.loglevel.upper()
     loggerConfig = LoggerConfig()
@@ -112,6 +115,8 @@ if __name__ == "__main__":
     data.moveToThread(worker_thread)
     worker_thread.finished.connect(data.deleteLater)
     worker_thread.start()
+    if args.record_discovery:
+        data.start_discovery_journal(args.record_discovery)
 
     rootItem = TreeNode("Root")
     treeModel = TreeModel(rootItem)
@@ -125,13 +130,16 @@ if __name__ == "__main__":
     datamodelRepoModelProxy.setSourceModel(datamodelRepoModel)
 
     receiverModel = ReceiverModel()
-    datamodelRepoModel.newDataArrived.connect(receiverModel.addReceivedMsg, Qt.QueuedConnection)
+    datamodelRepoModel.newDataArrived.connect(receiverModel.addReceivedMsgs, Qt.QueuedConnection)
     receiverProxyModel = ReceiverProxyModel()
     receiverProxyModel.setSourceModel(receiverModel)
 
     listenerModel = ListenerModel(threads)
     datamodelRepoModel.newReaderSignal.connect(listenerModel.addReader)
+    datamodelRepoModel.readerStatsSignal.connect(listenerModel.updateStats)
     listenerModel.createEndpointSignal.connect(datamodelRepoModel.createEndpointFromTester)
+    listenerModel.readerFilterSignal.connect(datamodelRepoModel.setReaderFilter)
+    datamodelRepoModel.readerFilterErrorSignal.connect(listenerModel.filterFailed)
     listenerProxyModel = ListenerProxyModel()
     listenerProxyModel.setSourceModel(listenerModel)
 
@@ -145,6 +153,7 @@ if __name__ == "__main__":
 
     qmlUtils = QmlUtils()
     app.aboutToQuit.connect(qmlUtils.aboutToQuit)
+    data.discovery_delivered_signal.connect(qmlUtils.discoveryDelivered, Qt.QueuedConnection)
 
     engine = QQmlApplicationEngine()
 
@@ -210,9 +219,12 @@ if __name__ == "__main__":
 
     domainIds.sort()
 
-    # Add domains
-    for domainId in domainIds:
-        data.add_domain(domainId)
+    # Add domains, a replay brings its own domains without observing the network
+    if args.replay_discovery:
+        data.replay_discovery_journal(args.replay_discovery, args.replay_speed)
+    else:
+        for domainId in domainIds:
+            data.add_domain(domainId)
 
     logging.info("qt ...")
     ret_code = app.exec()
@@ -225,6 +237,8 @@ if __name__ == "__main__":
     datamodelRepoModel.shutdownEndpoints()
     logging.debug("Shutdown data ...")
     data.join_observer()
+    logging.debug("Shutdown receiver ...")
+    receiverModel.close()
     logging.debug("Shutdown worker thread ...")
     worker_thread.quit()
     worker_thread.wait()
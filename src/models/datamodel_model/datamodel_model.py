@@ -11,13 +11,14 @@
 """
 
 from PySide6.QtCore import Qt, QModelIndex, QAbstractListModel, Qt, QByteArray
-from PySide6.QtCore import QObject, Signal, Slot
+from PySide6.QtCore import QObject, Signal, Slot, QSettings
 from loguru import logger as logging
 import typing
 import uuid
 import os
 import json
 from dds_access.dispatcher import DispatcherThread
+from dds_access.capture import CaptureWriter, CaptureReplay
 from dds_access.dds_data import DdsData
 from dds_access import dds_utils
 from dds_access.qos_provider_utils import (
@@ -35,11 +36,13 @@ class DatamodelModel(QAbstractListModel):
 
     NameRole = Qt.UserRole + 1
 
-    newDataArrived = Signal(str, str)
+    newDataArrived = Signal(list)
+    readerStatsSignal = Signal(dict)
+    readerFilterErrorSignal = Signal(str, str)
     isLoadingSignal = Signal(bool)
     requestDataType = Signal(str, int, str, str)
     newWriterSignal = Signal(str, int, str, str, object)
-    newReaderSignal = Signal(str, int, str, str, object)
+    newReaderSignal = Signal(str, int, str, str, object, str)
     qosProviderError = Signal(str)
 
     def __init__(self, threads, dataModelHandler, parent=typing.Optional[QObject]) -> None:
@@ -55,6 +58,10 @@ class DatamodelModel(QAbstractListModel):
 
         self.threads = threads
         self.readerRequests = {}
+        self.capture = None
+        self.captureReplay = None
+        # reader id -> filter expression, shared with the dispatcher threads
+        self.readerFilters = {}
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> typing.Any:
         if not index.isValid():
@@ -98,12 +105,17 @@ class DatamodelModel(QAbstractListModel):
     def endInsertModule(self):
         self.endInsertRows()
 
-    @Slot(str, str)
-    def onData(self, _id: str, data: str):
-        self.newDataArrived.emit(_id, data)
+    @Slot(list)
+    def onData(self, batch: list):
+        self.newDataArrived.emit(batch)
 
     @Slot()
     def shutdownEndpoints(self):
+        self.stopCapture()
+        if self.captureReplay is not None:
+            self.captureReplay.stop()
+            self.captureReplay.wait()
+            self.captureReplay = None
         for key in list(self.threads.keys()):
             self.threads[key].stop()
             self.threads[key].wait()
@@ -227,6 +239,7 @@ class DatamodelModel(QAbstractListModel):
                     if "subscriber_qos" in allQosDict:
                         pubSubQos = Qos.fromdict(allQosDict["subscriber_qos"])
 
+                    self.setReaderFilter(_id, preset.get("filter", ""))
                     self.handleEndpointCreation(_id, domainId, topic_name, topic_type, (dpQos, topicQos, pubSubQos, endpointQos), EntityType(entityType))
 
     @Slot(str, object)
@@ -248,7 +261,11 @@ class DatamodelModel(QAbstractListModel):
             self.threads[domainId].addEndpoint(id, topicName, dataType, qos, entityType)
         else:
             self.threads[domainId] = DispatcherThread(id, domainId, topicName, dataType, qos, entityType)
+            self.threads[domainId].setCapture(self.capture)
+            self.threads[domainId].readerFilters = self.readerFilters
             self.threads[domainId].onData.connect(self.onData, Qt.ConnectionType.QueuedConnection)
+            self.threads[domainId].onStats.connect(self.readerStatsSignal, Qt.ConnectionType.QueuedConnection)
+            self.threads[domainId].onFilterError.connect(self.readerFilterErrorSignal, Qt.ConnectionType.QueuedConnection)
             self.threads[domainId].start()
             while not self.threads[domainId].isSetUpDone():
                 logging.debug("Waiting for worker thread to set up...")
@@ -267,21 +284,66 @@ class DatamodelModel(QAbstractListModel):
         if entityType == EntityType.WRITER:
             self.newWriterSignal.emit(id, domainId, topicName, topic_type, qosDict)
         if entityType == EntityType.READER:
-            self.newReaderSignal.emit(id, domainId, topicName, topic_type, qosDict)
+            self.newReaderSignal.emit(id, domainId, topicName, topic_type, qosDict, self.readerFilters.get(id, ""))
 
         logging.debug("try add endpoint ... DONE")
 
+    @Slot(str, str)
+    def setReaderFilter(self, readerId: str, expression: str):
+        """Applies to the reader when it is created next."""
+        if expression:
+            self.readerFilters[readerId] = expression
+        else:
+            self.readerFilters.pop(readerId, None)
+
+    @Slot(str)
+    def startCapture(self, filePath: str):
+        self.stopCapture()
+        try:
+            self.capture = CaptureWriter(filePath)
+        except Exception as e:
+            logging.error(f"Failed to open capture {filePath}: {str(e)}")
+            return
+        for thread in self.threads.values():
+            thread.setCapture(self.capture)
+
+    @Slot()
+    def stopCapture(self):
+        if self.capture is not None:
+            for thread in self.threads.values():
+                thread.setCapture(None)
+            self.capture.close()
+            self.capture = None
+
+    @Slot(str)
+    def replayCapture(self, filePath: str):
+        if self.captureReplay is not None and self.captureReplay.isRunning():
+            logging.warning("A capture is already being replayed")
+            return
+        speed = QSettings().value("listener/replay_speed", 1.0, type=float)
+        self.captureReplay = CaptureReplay(filePath, self.getTypeForReplay, speed)
+        self.captureReplay.start()
+
+    def getTypeForReplay(self, typeName: str):
+        # Called on the replay thread, types not loaded from idl or the
+        # network may still be in the type cache
+        dataType = self.dataModelHandler.getType(typeName)
+        if dataType is None:
+            dataType = self.ddsData.type_resolver.resolveCached(typeName).result()
+        return dataType
+
     @Slot(str)
     def exportListenerPresets(self, filePath: str):
         logging.info(f"Export listener presets to {filePath}")
 
         exportData = { "presets": [] }
         for _, dspThread in self.threads.items():
-            for (_, topic, subscriber, reader, _) in dspThread.readerData:
+            for (readerId, topic, subscriber, reader, _) in dspThread.readerData:
                 exportData["presets"].append({
                     "domain_id": dspThread.domain_id,
                     "topic_name": topic.name,
                     "topic_type": topic.typename,
+                    "filter": self.readerFilters.get(readerId, ""),
                     "qos": {
                         "topic_qos": topic.get_qos().asdict(),
                         "subscriber_qos": subscriber.get_qos().asdict(),
@@ -10,20 +10,16 @@
  * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
 """
 
-from PySide6.QtCore import Qt, QModelIndex, QAbstractItemModel, Qt, Slot, Signal, QThread
-from cyclonedds.builtin import DcpsEndpoint, DcpsParticipant
-from cyclonedds import core
-from cyclonedds import qos
+from PySide6.QtCore import Qt, QModelIndex, QAbstractItemModel, Slot, Signal
+from cyclonedds.builtin import DcpsParticipant
 from loguru import logger as logging
-import os
-from pathlib import Path
-import time
 import uuid
 from typing import Optional, List
 
 from dds_access import dds_data
-from dds_access.dds_data import DataEndpoint
-from dds_access.dds_utils import getProperty, getHostname, PROCESS_NAMES, PIDS, ADDRESSES
+from dds_access.dds_data import EndpointSnapshot
+from dds_access.datatypes.endpoint_record import EndpointRecord
+from dds_access.datatypes.participant_info import participant_info
 from dds_access.dds_qos import partitions_match_p
 from dds_access.datatypes.entity_type import EntityType
 
@@ -135,8 +131,8 @@ class EndpointModel(QAbstractItemModel):
         # self to dds_data
         self.requestEndpointsSignal.connect(self.dds_data.requestEndpointsSlot, Qt.ConnectionType.QueuedConnection)
         # From dds_data to self
-        self.dds_data.new_endpoint_signal.connect(self.new_endpoint_slot, Qt.ConnectionType.QueuedConnection)
-        self.dds_data.removed_endpoint_signal.connect(self.remove_endpoint_slot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.new_endpoints_signal.connect(self.new_endpoints_slot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.removed_endpoints_signal.connect(self.remove_endpoints_slot, Qt.ConnectionType.QueuedConnection)
         self.dds_data.no_more_mismatch_in_topic_signal.connect(self.no_more_mismatch_in_topic_slot, Qt.ConnectionType.QueuedConnection)
         self.dds_data.publish_mismatch_signal.connect(self.publish_mismatch_slot, Qt.ConnectionType.QueuedConnection)
 
@@ -159,7 +155,7 @@ class EndpointModel(QAbstractItemModel):
         row = index.row()
         endp_key = list(self.endpoints.keys())[row]
 
-        endp: DcpsEndpoint = self.endpoints[endp_key].endpoint
+        endp: EndpointRecord = self.endpoints[endp_key].endpoint
         p: Optional[DcpsParticipant] =  self.endpoints[endp_key].participant
 
         if role == self.KeyRole:
@@ -182,14 +178,13 @@ class EndpointModel(QAbstractItemModel):
         elif role == self.TypeIdRole:
             return str(endp.type_id)
         elif role == self.HostnameRole:
-            return getHostname(p)
+            return participant_info(p).hostname
         elif role == self.ProcessIdRole:
-            return getProperty(p, PIDS)
+            return participant_info(p).pid
         elif role == self.ProcessNameRole:
-            appname: str = getProperty(p, PROCESS_NAMES)
-            return Path(appname.replace("\\", f"{os.path.sep}")).stem
+            return participant_info(p).process_name
         elif role == self.AddressesRole:
-            return getProperty(p, ADDRESSES)
+            return participant_info(p).addresses
         elif role == self.EndpointHasQosMismatch:
             if len(self.endpoints[endp_key].mismatches.keys()):
                 return True
@@ -237,20 +232,18 @@ class EndpointModel(QAbstractItemModel):
         if self.selectedPartition is None:
             return
         for endp_key in list(self.endpoints.keys()):
-            endp: DcpsEndpoint = self.endpoints[endp_key].endpoint
-            if qos.Policy.Partition in endp.qos:
-                for i in range(len(endp.qos[qos.Policy.Partition].partitions)):
-                    pat = str(endp.qos[qos.Policy.Partition].partitions[i])
-                    selected = False
-                    if pat == self.selectedPartition:
-                        matched = True
-                        selected = True if endp_key == self.selectedPartitionEndpKey else False
+            endp: EndpointRecord = self.endpoints[endp_key].endpoint
+            for pat in endp.partitions:
+                selected = False
+                if pat == self.selectedPartition:
+                    matched = True
+                    selected = True if endp_key == self.selectedPartitionEndpKey else False
+                else:
+                    if self.entity_type == EntityType.READER:
+                        matched = partitions_match_p([pat], [self.selectedPartition])
                     else:
-                        if self.entity_type == EntityType.READER:
-                            matched = partitions_match_p([pat], [self.selectedPartition])
-                        else:
-                            matched = partitions_match_p([self.selectedPartition], [pat])
-                    self.partitions[endp_key].updatePartition(pat, matched, selected)
+                        matched = partitions_match_p([self.selectedPartition], [pat])
+                self.partitions[endp_key].updatePartition(pat, matched, selected)
 
     @Slot()
     def clearPartitionMatching(self):
@@ -287,69 +280,96 @@ class EndpointModel(QAbstractItemModel):
         self.totalEndpointsSignal.emit(len(self.endpoints))
         self.requestEndpointsSignal.emit(self.currentRequestId, domain_id, self.topic_name, self.entity_type)
 
-    @Slot(str, int, DataEndpoint)
-    def new_endpoint_slot(self, requestId: str, domain_id: int, endpointData: DataEndpoint):
+    @Slot(str, int, list)
+    def new_endpoints_slot(self, requestId: str, domain_id: int, endpoints: List[EndpointSnapshot]):
         if self.currentRequestId != requestId and requestId != "":
             return
         if domain_id != self.domain_id:
             return
-        if self.topic_name != endpointData.endpoint.topic_name:
-            return
 
-        if (endpointData.isReader() and EntityType.WRITER == self.entity_type) or (endpointData.isWriter() and EntityType.READER == self.entity_type):
-            if len(endpointData.mismatches.keys()) > 0:
-                for mismKey in endpointData.mismatches.keys():
-                    if mismKey in self.endpoints:
-                        self.endpoints[mismKey].mismatches[str(endpointData.endpoint.key)] = endpointData.mismatches[mismKey]
-                        idx = list(self.endpoints.keys()).index(mismKey)
-                        index = self.createIndex(idx, 0)
-                        self.dataChanged.emit(index, index, [self.EndpointHasQosMismatch, self.EndpointQosMismatchText])
-            return
-        if str(endpointData.endpoint.key) in self.endpoints:
+        newEndpoints = {}
+        for endpointData in endpoints:
+            if self.topic_name != endpointData.endpoint.topic_name:
+                continue
+
+            if (endpointData.isReader() and EntityType.WRITER == self.entity_type) or (endpointData.isWriter() and EntityType.READER == self.entity_type):
+                if len(endpointData.mismatches.keys()) > 0:
+                    for mismKey in endpointData.mismatches.keys():
+                        if mismKey in self.endpoints:
+                            self.endpoints[mismKey].mismatches[str(endpointData.endpoint.key)] = endpointData.mismatches[mismKey]
+                            idx = list(self.endpoints.keys()).index(mismKey)
+                            index = self.createIndex(idx, 0)
+                            self.dataChanged.emit(index, index, [self.EndpointHasQosMismatch, self.EndpointQosMismatchText])
+                continue
+
+            if str(endpointData.endpoint.key) in self.endpoints:
+                continue
+
+            newEndpoints[str(endpointData.endpoint.key)] = endpointData
+
+        if len(newEndpoints) == 0:
             return
-        
-        endp_keys = list(self.endpoints.keys())
-        row = 0
-        while row < len(endp_keys) and endp_keys[row] != str(endpointData.endpoint.key):
-            row += 1
-
-        self.beginInsertRows(QModelIndex(), row, row)
-        self.endpoints[str(endpointData.endpoint.key)] = endpointData
-        self.topicTypes.append(endpointData.endpoint.type_name)
-        self.partitions[str(endpointData.endpoint.key)] = PartitionModel(self)
-        if qos.Policy.Partition in endpointData.endpoint.qos:
-            for i in range(len(endpointData.endpoint.qos[qos.Policy.Partition].partitions)):
-                pat = str(endpointData.endpoint.qos[qos.Policy.Partition].partitions[i])
-                self.partitions[str(endpointData.endpoint.key)].updatePartition(pat, False, False)
+
+        # All new endpoints are appended as one contiguous range
+        row = len(self.endpoints)
+        self.beginInsertRows(QModelIndex(), row, row + len(newEndpoints) - 1)
+        for endpKey, endpointData in newEndpoints.items():
+            self.endpoints[endpKey] = endpointData
+            self.topicTypes.append(endpointData.endpoint.type_name)
+            self.partitions[endpKey] = PartitionModel(self)
+            for pat in endpointData.endpoint.partitions:
+                self.partitions[endpKey].updatePartition(pat, False, False)
         self.endInsertRows()
 
         self.totalEndpointsSignal.emit(len(self.endpoints))
 
-        if len(endpointData.mismatches.keys()) > 0:
+        if any(len(endpointData.mismatches.keys()) > 0 for endpointData in newEndpoints.values()):
             self.topicHasQosMismatchSignal.emit(True)
 
         if self.selectedPartition is not None:
             self.updateMatchedPartitions()
 
-    @Slot(int, str)
-    def remove_endpoint_slot(self, domain_id, endpoint_key):
+    @Slot(int, list)
+    def remove_endpoints_slot(self, domain_id, endpoint_keys):
         if domain_id != self.domain_id:
             return
-        
-        if str(endpoint_key) in self.endpoints:
-            row = list(self.endpoints.keys()).index(endpoint_key)
-            self.beginRemoveRows(QModelIndex(), row, row)
-            self.topicTypes.remove(self.endpoints[endpoint_key].endpoint.type_name)
-            del self.endpoints[endpoint_key]
+
+        keys = [str(endpoint_key) for endpoint_key in endpoint_keys]
+        endpKeys = list(self.endpoints.keys())
+        rowOf = {endpKey: row for (row, endpKey) in enumerate(endpKeys)}
+        rows = sorted({rowOf[key] for key in keys if key in rowOf})
+
+        # Contiguous rows are removed as one range, the highest range first
+        # so the rows of the remaining ranges stay valid
+        ranges = []
+        for row in rows:
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+
+        for (first, last) in reversed(ranges):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for endpKey in endpKeys[first:last + 1]:
+                self.topicTypes.remove(self.endpoints[endpKey].endpoint.type_name)
+                del self.endpoints[endpKey]
+                self.partitions.pop(endpKey, None)
             self.endRemoveRows()
+
+        if len(ranges) > 0:
             self.totalEndpointsSignal.emit(len(self.endpoints))
-        else:
-            for endpKey in self.endpoints.keys():
-                if str(endpoint_key) in self.endpoints[endpKey].mismatches:
-                    del self.endpoints[endpKey].mismatches[str(endpoint_key)]
-                    idx = list(self.endpoints.keys()).index(endpKey)
-                    index = self.createIndex(idx, 0)
-                    self.dataChanged.emit(index, index, [self.EndpointHasQosMismatch, self.EndpointQosMismatchText])
+
+        # Remote endpoints of the other kind only appear in the mismatches
+        remoteKeys = set(key for key in keys if key not in rowOf)
+        if len(remoteKeys) > 0:
+            for (row, endpointData) in enumerate(self.endpoints.values()):
+                removed = remoteKeys.intersection(endpointData.mismatches.keys())
+                if len(removed) == 0:
+                    continue
+                for key in removed:
+                    del endpointData.mismatches[key]
+                index = self.createIndex(row, 0)
+                self.dataChanged.emit(index, index, [self.EndpointHasQosMismatch, self.EndpointQosMismatchText])
 
     @Slot(int, str, list)
     def publish_mismatch_slot(self, domain_id, topicName, mismatches):
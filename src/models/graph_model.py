@@ -23,7 +23,7 @@ import requests
 import socket
 
 from dds_access import dds_data
-from dds_access.dds_utils import getAppName, getHostname, getVendorShortName, getVendorPicture, getProperty, DEBUG_MONITORS
+from dds_access.datatypes.participant_info import participant_info
 
 
 class GraphStatisticThread(QThread):
@@ -188,8 +188,8 @@ class GraphModel(QAbstractItemModel):
         self.requestDomainIds.connect(self.dds_data.requestDomainIds, Qt.ConnectionType.QueuedConnection)
 
         # From dds_data to self
-        self.dds_data.new_participant_signal.connect(self.newParticipantSlot, Qt.ConnectionType.QueuedConnection)
-        self.dds_data.removed_participant_signal.connect(self.removedParticipantSlot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.new_participants_signal.connect(self.newParticipantsSlot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.removed_participants_signal.connect(self.removedParticipantsSlot, Qt.ConnectionType.QueuedConnection)
         self.dds_data.response_participants_signal.connect(self.response_participants_slot, Qt.ConnectionType.QueuedConnection)
         self.dds_data.new_domain_signal.connect(self.newDomainSlot, Qt.ConnectionType.QueuedConnection)
         self.dds_data.removed_domain_signal.connect(self.removedDomainSlot, Qt.ConnectionType.QueuedConnection)
@@ -238,17 +238,19 @@ class GraphModel(QAbstractItemModel):
         for participant in participants:
             self.newParticipant(domain_id, participant)
 
-    @Slot(int, DcpsParticipant)
-    def newParticipantSlot(self, domain_id: int, participant: DcpsParticipant):
-        self.newParticipant(domain_id, participant)
+    @Slot(int, list)
+    def newParticipantsSlot(self, domain_id: int, participants: list):
+        for participant in participants:
+            self.newParticipant(domain_id, participant)
 
     def newParticipant(self, domain_id: int, participant: DcpsParticipant):
 
         if not self.acceptDomainId(domain_id):
             return
 
-        appName: str = getAppName(participant)
-        host: str = getHostname(participant)
+        info = participant_info(participant)
+        appName: str = info.app_name
+        host: str = info.hostname
         nodeKey = f"{host}:{appName}"
 
         if nodeKey == self.selfName and self.ignoreSelf:
@@ -273,10 +275,10 @@ class GraphModel(QAbstractItemModel):
             else:
                 self.appNames[nodeKey][domain_id].append(str(participant.key))
 
-        self.newNodeSignal.emit(nodeKey, appName, domainIdStr, host, getVendorShortName(participant), getVendorPicture(participant))
+        self.newNodeSignal.emit(nodeKey, appName, domainIdStr, host, info.vendor_short_name, info.vendor_picture)
 
         # Extracting debug monitor address
-        dbg_mon_str: str = getProperty(participant, DEBUG_MONITORS)
+        dbg_mon_str: str = info.debug_monitor
         splitProtoAdr = dbg_mon_str.split("/")
         if len(splitProtoAdr) > 0:
             if splitProtoAdr[0] == "tcp":
@@ -288,8 +290,12 @@ class GraphModel(QAbstractItemModel):
         
         self.graphStatistics.setDbgPorts(self.dgbPorts)
 
-    @Slot(int, str)
-    def removedParticipantSlot(self, domainId: int, participantKey: str):
+    @Slot(int, list)
+    def removedParticipantsSlot(self, domainId: int, participantKeys: list):
+        for participantKey in participantKeys:
+            self.removedParticipant(domainId, participantKey)
+
+    def removedParticipant(self, domainId: int, participantKey: str):
         toBeRemovedApps = []
         for appName in list(self.appNames.keys()):
             if domainId in self.appNames[appName]:
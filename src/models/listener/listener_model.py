@@ -24,6 +24,7 @@ import glob
 from dataclasses import dataclass
 import typing
 from dds_access.dispatcher import DispatcherThread
+from dds_access.sample_filter import compile_filter
 from cyclonedds.core import Qos, Policy
 from cyclonedds.util import duration
 import types
@@ -43,6 +44,16 @@ class ReaderData:
     qos: object
     stopped: bool
     isChecked: bool
+    stats: typing.Optional[dict] = None
+    filter: str = ""
+    filterError: str = ""
+
+
+def formatRate(value: float, unit: str) -> str:
+    for prefix in ["", "k", "M", "G"]:
+        if value < 1000.0 or prefix == "G":
+            return f"{value:.1f} {prefix}{unit}/s"
+        value /= 1000.0
 
 
 class ListenerModel(QAbstractListModel):
@@ -51,8 +62,12 @@ class ListenerModel(QAbstractListModel):
     TopicTypeRole = Qt.UserRole + 3
     StoppedRole = Qt.UserRole + 4
     IsCheckedRole = Qt.UserRole + 5
+    StatsRole = Qt.UserRole + 6
+    FilterRole = Qt.UserRole + 7
+    FilterErrorRole = Qt.UserRole + 8
 
     createEndpointSignal = Signal(str, int, str, str, int, str, object, object)
+    readerFilterSignal = Signal(str, str)
 
     def __init__(self, threads, parent=None):
         super().__init__(parent)
@@ -82,9 +97,25 @@ class ListenerModel(QAbstractListModel):
             return item.stopped
         if role == self.IsCheckedRole:
             return item.isChecked
+        if role == self.StatsRole:
+            return self.statsText(item.stats)
+        if role == self.FilterRole:
+            return item.filter
+        if role == self.FilterErrorRole:
+            return item.filterError
 
         return None
 
+    @staticmethod
+    def statsText(stats: typing.Optional[dict]) -> str:
+        if stats is None:
+            return ""
+        text = (f"{formatRate(stats['samples_per_s'], 'Samples')} | {formatRate(stats['bytes_per_s'], 'B')} | "
+                f"Latency p50 {stats['latency_p50_ms']:.2f} ms, p99 {stats['latency_p99_ms']:.2f} ms, max {stats['latency_max_ms']:.2f} ms")
+        if stats["lost"] > 0 or stats["rejected"] > 0:
+            text += f" | Lost {stats['lost']}, rejected {stats['rejected']}"
+        return text
+
     def flags(self, index):
         if not index.isValid():
             return Qt.ItemIsEnabled
@@ -96,7 +127,10 @@ class ListenerModel(QAbstractListModel):
             self.TopicNameRole: b"topicName",
             self.TopicTypeRole: b"topicType",
             self.StoppedRole: b"stoppedReader",
-            self.IsCheckedRole: b"isChecked"
+            self.IsCheckedRole: b"isChecked",
+            self.StatsRole: b"readerStats",
+            self.FilterRole: b"readerFilter",
+            self.FilterErrorRole: b"readerFilterError"
         }
 
     @Slot(str)
@@ -160,9 +194,72 @@ class ListenerModel(QAbstractListModel):
             self.readers[_id].isChecked = checked
             self.endResetModel()
 
-    @Slot(int, str, str, str, object)
-    def addReader(self, id: str, domainId, topic_name, topic_type: str, qos):
+    def filterChanged(self, _id: str):
+        index = self.index(list(self.readers.keys()).index(_id))
+        self.dataChanged.emit(index, index, [self.FilterRole, self.FilterErrorRole])
+
+    @Slot(str, str, result=str)
+    def setFilter(self, _id: str, expression: str) -> str:
+        """Returns the error of an invalid expression, the filter stays as it was then."""
+        if _id not in self.readers:
+            return ""
+        expression = expression.strip()
+        try:
+            # Without the type only the syntax is checked, the fields are
+            # checked by the dispatcher, see filterFailed
+            if expression:
+                compile_filter(None, expression)
+        except ValueError as e:
+            self.readers[_id].filterError = str(e)
+            self.filterChanged(_id)
+            return str(e)
+
+        self.readers[_id].filterError = ""
+        if self.readers[_id].filter != expression:
+            logging.info(f"Set filter of reader {_id} to '{expression}'")
+            self.readers[_id].filter = expression
+            self.readerFilterSignal.emit(_id, expression)
+            # The filter is applied when the reader is created
+            if not self.readers[_id].stopped:
+                self.stopReader(_id)
+                self.startReader(_id)
+        self.filterChanged(_id)
+        return ""
+
+    @Slot(str, str)
+    def filterFailed(self, _id: str, error: str):
+        # The dispatcher created the reader without the filter
+        if _id in self.readers:
+            self.readers[_id].filter = ""
+            self.readers[_id].filterError = error
+            self.filterChanged(_id)
+
+    @Slot(dict)
+    def updateStats(self, statsByReader: dict):
+        ids = list(self.readers.keys())
+        for _id, stats in statsByReader.items():
+            if _id in self.readers:
+                self.readers[_id].stats = stats
+                index = self.index(ids.index(_id))
+                self.dataChanged.emit(index, index, [self.StatsRole])
+
+    @Slot(str)
+    def exportStats(self, filePath: str):
+        logging.info(f"Export reader statistics to {filePath}")
+        exportData = {}
+        for _id, item in self.readers.items():
+            exportData[_id] = {
+                "domain_id": item.domainId,
+                "topic_name": item.topic_name,
+                "topic_type": item.topic_type,
+                "stats": item.stats
+            }
+        qmlUtils = QmlUtils()
+        qmlUtils.saveFileContent(filePath, json.dumps(exportData, indent=4))
+
+    @Slot(int, str, str, str, object, str)
+    def addReader(self, id: str, domainId, topic_name, topic_type: str, qos, filter: str):
         logging.info("AddReader to ListenerModel")
         self.beginResetModel()
-        self.readers[id] = ReaderData(id, domainId, topic_name, topic_type, qos, False, True)
+        self.readers[id] = ReaderData(id, domainId, topic_name, topic_type, qos, False, True, filter=filter)
         self.endResetModel()
@@ -0,0 +1,214 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import glob
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from loguru import logger as logging
+from typing import Dict, List, Optional, Tuple
+from PySide6.QtCore import QStandardPaths
+
+from dds_access.dds_utils import hasValidData
+
+
+# Per message: offset of its serialized sample in the log, number of its
+# reader and reception time
+INDEX_ENTRY = struct.Struct("<QId")
+
+LOG_PREFIX = "messages-"
+
+
+class MappedFile:
+    """An append-only file, read back through a memory map that grows with it."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "w+b")
+        # Gone with the process, also when it crashes. Windows cannot remove
+        # open files, MessageStore removes the leftovers of earlier runs there.
+        self.unlinked = False
+        if sys.platform != "win32":
+            os.remove(path)
+            self.unlinked = True
+        self.size = 0
+        self.dirty = False
+        self.map: Optional[mmap.mmap] = None
+
+    def append(self, data: bytes):
+        self.file.write(data)
+        self.size += len(data)
+        self.dirty = True
+
+    def view(self, end: int) -> mmap.mmap:
+        if self.dirty:
+            self.file.flush()
+            self.dirty = False
+        if self.map is None or len(self.map) < end:
+            if self.map is not None:
+                self.map.close()
+            self.map = mmap.mmap(self.file.fileno(), self.size, access=mmap.ACCESS_READ)
+        return self.map
+
+    def snapshot(self) -> Optional[mmap.mmap]:
+        """A map of the file as it is now, still readable after close."""
+        if self.size == 0:
+            return None
+        self.file.flush()
+        self.dirty = False
+        return mmap.mmap(self.file.fileno(), self.size, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+        if not self.unlinked:
+            try:
+                os.remove(self.path)
+            except OSError:
+                # Still mapped by a snapshot, removed on the next start
+                pass
+
+
+def remove_stale_logs(directory: str):
+    for path in glob.glob(os.path.join(directory, f"{LOG_PREFIX}*")):
+        try:
+            os.remove(path)
+        except OSError:
+            # Still open by another running instance
+            pass
+
+
+class MessageStore:
+    """Received messages spilled to disk for long listener sessions.
+
+    The serialized samples are appended to a log, an index file holds the
+    offset, reader and reception time of every message. Both are read
+    through memory maps, so only the pages of the rows on screen are in
+    memory. A sample is deserialized again with the type of its reader
+    when it is shown.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        if directory is None:
+            app_data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+            directory = os.path.join(app_data_dir, "listener")
+        os.makedirs(directory, exist_ok=True)
+        remove_stale_logs(directory)
+        self.directory = directory
+        self.readerIds: List[str] = []
+        self.readerTypes: List[type] = []
+        self.readerNumbers: Dict[str, int] = {}
+        self.open()
+
+    def open(self):
+        (fd, log_path) = tempfile.mkstemp(prefix=LOG_PREFIX, suffix=".log", dir=self.directory)
+        os.close(fd)
+        self.log = MappedFile(log_path)
+        self.index = MappedFile(log_path[:-len(".log")] + ".idx")
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, readerId: str, timestamp: float, sample) -> bool:
+        """Stores a sample, returns whether it was. Samples without data,
+        as read for a dispose or unregister, are not stored."""
+        if not hasValidData(sample):
+            return False
+        try:
+            data = bytes(sample.serialize())
+        except Exception as e:
+            logging.warning(f"Failed to serialize message of {readerId}: {str(e)}")
+            return False
+
+        # The type of a reader is known from its first sample with data
+        if readerId not in self.readerNumbers:
+            self.readerNumbers[readerId] = len(self.readerIds)
+            self.readerIds.append(readerId)
+            self.readerTypes.append(type(sample))
+        # Log before index, a failed write leaves no index entry behind
+        offset = self.log.size
+        self.log.append(data)
+        self.index.append(INDEX_ENTRY.pack(offset, self.readerNumbers[readerId], timestamp))
+        self.count += 1
+        return True
+
+    def entry(self, row: int) -> Tuple[int, int, float]:
+        start = row * INDEX_ENTRY.size
+        return INDEX_ENTRY.unpack_from(self.index.view(start + INDEX_ENTRY.size), start)
+
+    def readerId(self, row: int) -> str:
+        (_, readerNumber, _) = self.entry(row)
+        return self.readerIds[readerNumber]
+
+    def message(self, row: int) -> Tuple[str, float, object]:
+        """The reader id, reception time and deserialized sample of a row."""
+        (offset, readerNumber, timestamp) = self.entry(row)
+        end = self.entry(row + 1)[0] if row + 1 < self.count else self.log.size
+        return decode_message(row, self.readerIds[readerNumber], self.readerTypes[readerNumber],
+                              timestamp, self.log.view(end)[offset:end])
+
+    def snapshot(self) -> "StoredMessages":
+        """The messages stored so far, readable from another thread while
+        this store takes new ones or is cleared."""
+        return StoredMessages(self.log.snapshot(), self.index.snapshot(), self.count,
+                              list(self.readerIds), list(self.readerTypes))
+
+    def clear(self):
+        # New files instead of truncating, snapshots still map the old ones
+        self.log.close()
+        self.index.close()
+        self.open()
+
+    def close(self):
+        self.log.close()
+        self.index.close()
+
+
+def decode_message(row: int, readerId: str, readerType: type, timestamp: float, data: bytes) -> Tuple[str, float, object]:
+    try:
+        sample = readerType.deserialize(data)
+    except Exception as e:
+        logging.warning(f"Failed to deserialize stored message {row}: {str(e)}")
+        sample = None
+    return (readerId, timestamp, sample)
+
+
+class StoredMessages:
+    """A read-only snapshot of a MessageStore."""
+
+    def __init__(self, log: Optional[mmap.mmap], index: Optional[mmap.mmap], count: int,
+                 readerIds: List[str], readerTypes: List[type]):
+        self.log = log
+        self.index = index
+        self.count = count
+        self.readerIds = readerIds
+        self.readerTypes = readerTypes
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        for row in range(self.count):
+            (offset, readerNumber, timestamp) = INDEX_ENTRY.unpack_from(self.index, row * INDEX_ENTRY.size)
+            end = INDEX_ENTRY.unpack_from(self.index, (row + 1) * INDEX_ENTRY.size)[0] if row + 1 < self.count else len(self.log)
+            yield decode_message(row, self.readerIds[readerNumber], self.readerTypes[readerNumber],
+                                 timestamp, self.log[offset:end])
+
+    def close(self):
+        for view in (self.log, self.index):
+            if view is not None:
+                view.close()
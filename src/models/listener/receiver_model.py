@@ -11,8 +11,47 @@
 """
 
 from loguru import logger as logging
+import datetime
+import itertools
+from collections import OrderedDict, deque
 
-from PySide6.QtCore import Qt, QModelIndex, QAbstractListModel, Qt, Slot
+from typing import Deque, Dict, Iterable, List, Optional
+
+from PySide6.QtCore import Qt, QModelIndex, QAbstractListModel, Qt, Slot, QSettings, QThread
+
+from models.listener.message_store import MessageStore, StoredMessages
+
+
+# Rendered messages kept for the rows on screen
+RENDER_CACHE_SIZE = 512
+
+# Defaults of the listener/* settings, a limit of 0 means unlimited. The
+# listener used to keep all messages, set listener/max_messages to 0 for that.
+DEFAULT_MAX_MESSAGES = 100000
+DEFAULT_MAX_MESSAGES_PER_READER = 0
+DEFAULT_KEEP_EVERY_NTH = 10
+
+EVICTION_DROP_OLDEST = "drop_oldest"
+EVICTION_KEEP_EVERY_NTH = "keep_every_nth"
+
+# Above this many separate runs of removed rows, the rows between the first
+# and the last run are removed as one range and the kept ones inserted again
+MAX_REMOVE_RUNS = 16
+
+
+class ReceivedSample:
+    """A received sample as taken by the dispatcher, rendered on demand."""
+
+    __slots__ = ("seq", "readerId", "timestamp", "sample")
+
+    def __init__(self, seq: int, readerId: str, timestamp: float, sample) -> None:
+        self.seq = seq
+        self.readerId = readerId
+        self.timestamp = timestamp
+        self.sample = sample
+
+    def render(self) -> str:
+        return f"[{datetime.datetime.fromtimestamp(self.timestamp).isoformat()}]  -  {str(self.sample)}"
 
 
 class ReceiverModel(QAbstractListModel):
@@ -22,22 +61,75 @@ class ReceiverModel(QAbstractListModel):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._messages = []
-        self._rows_by_reader = {}
+        # Rows start at _head, dropping the oldest rows only moves it. The
+        # list is compacted once the dropped front outgrows the rows.
+        self._messages: List[Optional[ReceivedSample]] = []
+        self._head = 0
+        # Sequence numbers of the messages of every reader, oldest first
+        self._seqs_by_reader: Dict[str, Deque[int]] = {}
+        self._next_seq = 0
+        self._rendered = OrderedDict()
+        self._exports: List[QThread] = []
+
+        settings = QSettings()
+        self._max_messages = settings.value("listener/max_messages", DEFAULT_MAX_MESSAGES, type=int)
+        self._max_messages_per_reader = settings.value("listener/max_messages_per_reader", DEFAULT_MAX_MESSAGES_PER_READER, type=int)
+        self._eviction = settings.value("listener/eviction", EVICTION_DROP_OLDEST, type=str)
+        self._keep_every_nth = max(2, settings.value("listener/keep_every_nth", DEFAULT_KEEP_EVERY_NTH, type=int))
+
+        # With listener/store_to_disk the samples go serialized to a
+        # MessageStore, without limits
+        self._store: Optional[MessageStore] = None
+        if settings.value("listener/store_to_disk", False, type=bool):
+            try:
+                self._store = MessageStore()
+            except Exception as e:
+                logging.error(f"Failed to create message store, keeping messages in memory: {e}")
+
+    def render(self, item: ReceivedSample) -> str:
+        msg = self._rendered.get(item.seq)
+        if msg is not None:
+            self._rendered.move_to_end(item.seq)
+            return msg
+        msg = item.render()
+        self._rendered[item.seq] = msg
+        if len(self._rendered) > RENDER_CACHE_SIZE:
+            self._rendered.popitem(last=False)
+        return msg
+
+    def renderStored(self, row: int) -> str:
+        # Stored messages are never evicted, the row is their sequence number
+        msg = self._rendered.get(row)
+        if msg is not None:
+            self._rendered.move_to_end(row)
+            return msg
+        return self.render(ReceivedSample(row, *self._store.message(row)))
 
     def rowCount(self, parent=QModelIndex()):
-        return 0 if parent.isValid() else len(self._messages)
+        if parent.isValid():
+            return 0
+        return len(self._store) if self._store is not None else self.count()
+
+    def count(self) -> int:
+        return len(self._messages) - self._head
 
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid():
             return None
 
-        item = self._messages[index.row()]
+        if self._store is not None:
+            if role == self.ReaderIdRole:
+                return self._store.readerId(index.row())
+            if role == self.ReceivedMsgRole:
+                return self.renderStored(index.row())
+            return None
+
+        item = self._messages[self._head + index.row()]
 
         if role == self.ReaderIdRole:
-            return item["readerId"]
+            return item.readerId
         if role == self.ReceivedMsgRole:
-            return item["msg"]
+            return self.render(item)
 
         return None
 
@@ -48,40 +140,191 @@ class ReceiverModel(QAbstractListModel):
         }
 
 
-    @Slot(str, str)
-    def addReceivedMsg(self, readerId, msg):
-        row = len(self._messages)
+    @Slot(list)
+    def addReceivedMsgs(self, batch):
+        if len(batch) == 0:
+            return
 
-        self.beginInsertRows(QModelIndex(), row, row)
+        if self._store is not None:
+            # Stored first, only the rows actually written are announced
+            first = len(self._store)
+            for (readerId, timestamp, sample) in batch:
+                try:
+                    self._store.append(readerId, timestamp, sample)
+                except Exception as e:
+                    logging.error(f"Failed to store message: {e}")
+                    break
+            if len(self._store) > first:
+                self.beginInsertRows(QModelIndex(), first, len(self._store) - 1)
+                self.endInsertRows()
+            return
 
-        self._messages.append({
-            "readerId": readerId,
-            "msg": msg,
-        })
+        first = self.count()
 
-        if readerId not in self._rows_by_reader:
-            self._rows_by_reader[readerId] = []
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
 
-        self._rows_by_reader[readerId].append(row)
+        for (readerId, timestamp, sample) in batch:
+            self._messages.append(ReceivedSample(self._next_seq, readerId, timestamp, sample))
+            if readerId not in self._seqs_by_reader:
+                self._seqs_by_reader[readerId] = deque()
+            self._seqs_by_reader[readerId].append(self._next_seq)
+            self._next_seq += 1
 
         self.endInsertRows()
 
+        self.evict()
+
+    def rowOf(self, seq: int) -> int:
+        # The messages are ordered by sequence number
+        low, high = self._head, len(self._messages)
+        while low < high:
+            mid = (low + high) // 2
+            if self._messages[mid].seq < seq:
+                low = mid + 1
+            else:
+                high = mid
+        return low - self._head
+
+    def evict(self):
+        """Removes messages over the global and per reader limits."""
+        victims = set()
+
+        if self._max_messages_per_reader > 0:
+            for readerId, seqs in self._seqs_by_reader.items():
+                count = len(seqs)
+                if count > self._max_messages_per_reader:
+                    chosen = self.selectVictims(iter(seqs), count, count - self._max_messages_per_reader)
+                    victims.update(self.rowOf(seq) for seq in chosen)
+
+        remaining = self.count() - len(victims)
+        if self._max_messages > 0 and remaining > self._max_messages:
+            rows = (row for row in range(self.count()) if row not in victims)
+            victims.update(self.selectVictims(rows, remaining, remaining - self._max_messages))
+
+        if len(victims) > 0:
+            self.removeMessages(sorted(victims))
+
+    def selectVictims(self, entries: Iterable[int], count: int, excess: int) -> List[int]:
+        """Chooses excess of the count entries, given oldest first, to remove."""
+        if self._eviction == EVICTION_KEEP_EVERY_NTH:
+            # Thin out the oldest entries, within the older half, so older
+            # messages get sparser with every round. Only as many entries are
+            # looked at as thinning needs to find excess of them.
+            n = self._keep_every_nth
+            window = list(itertools.islice(entries, min(count // 2, excess * n // (n - 1) + n)))
+            thinned = [entry for i, entry in enumerate(window) if i % n != 0]
+            if len(thinned) >= excess:
+                return thinned[:excess]
+            entries = itertools.chain(window, entries)
+
+        return list(itertools.islice(entries, excess))
+
+    def removeMessages(self, rows: List[int]):
+        # Contiguous runs, last first so the rows before stay valid
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+
+        removed = {}
+        head = self._head
+        for row in rows:
+            item = self._messages[head + row]
+            removed.setdefault(item.readerId, set()).add(item.seq)
+            self._rendered.pop(item.seq, None)
+
+        for readerId, seqs in removed.items():
+            readerSeqs = self._seqs_by_reader[readerId]
+            while len(readerSeqs) > 0 and readerSeqs[0] in seqs:
+                seqs.discard(readerSeqs.popleft())
+            if len(seqs) > 0:
+                self._seqs_by_reader[readerId] = readerSeqs = deque(seq for seq in readerSeqs if seq not in seqs)
+            if len(readerSeqs) == 0:
+                del self._seqs_by_reader[readerId]
+
+        if len(runs) <= MAX_REMOVE_RUNS:
+            for (first, last) in reversed(runs):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                self.removeRange(first, last)
+                self.endRemoveRows()
+            return
+
+        # Scattered rows, as thinning leaves them: one removal of the whole
+        # span and one insertion of the rows kept in it
+        (first, last) = (runs[0][0], runs[-1][1])
+        victims = set(rows)
+        kept = [item for row, item in enumerate(self._messages[head + first:head + last + 1], first) if row not in victims]
+        self.beginRemoveRows(QModelIndex(), first, last)
+        self.removeRange(first, last)
+        self.endRemoveRows()
+        if len(kept) > 0:
+            self.beginInsertRows(QModelIndex(), first, first + len(kept) - 1)
+            self._messages[self._head + first:self._head + first] = kept
+            self.endInsertRows()
+
+    def removeRange(self, first: int, last: int):
+        if first > 0:
+            del self._messages[self._head + first:self._head + last + 1]
+            return
+        # The oldest rows, as eviction mostly removes: only released
+        self._messages[self._head:self._head + last + 1] = itertools.repeat(None, last + 1)
+        self._head += last + 1
+        if self._head > len(self._messages) // 2:
+            del self._messages[:self._head]
+            self._head = 0
 
     @Slot()
     def clear(self):
         self.beginResetModel()
 
         self._messages.clear()
-        self._rows_by_reader.clear()
+        self._head = 0
+        self._seqs_by_reader.clear()
+        self._rendered.clear()
+        if self._store is not None:
+            self._store.clear()
 
         self.endResetModel()
 
+    def close(self):
+        for thread in list(self._exports):
+            thread.wait()
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
     @Slot(str)
     def exportToFile(self, filePath):
         logging.info(f"Export messages to file: {filePath}")
+        # Rendered off the GUI thread, from what is received until now
+        if self._store is not None:
+            messages = self._store.snapshot()
+        else:
+            messages = [(item.readerId, item.timestamp, item.sample) for item in itertools.islice(self._messages, self._head, None)]
+        thread = ExportThread(filePath, messages, self)
+        thread.finished.connect(lambda: self._exports.remove(thread))
+        self._exports.append(thread)
+        thread.start()
+
+
+class ExportThread(QThread):
+    """Writes received messages to a file."""
+
+    def __init__(self, filePath: str, messages, parent=None):
+        super().__init__(parent)
+        self.filePath = filePath
+        self.messages = messages
+
+    def run(self):
         try:
-            with open(filePath, "w", encoding="utf-8") as f:
-                for item in self._messages:
-                    f.write(f"{item['msg']}\n")
+            with open(self.filePath, "w", encoding="utf-8") as f:
+                for row, message in enumerate(self.messages):
+                    f.write(f"{ReceivedSample(row, *message).render()}\n")
+            logging.info(f"Exported messages to file: {self.filePath}")
         except Exception as e:
             logging.error(f"Error exporting messages to file: {e}")
+        finally:
+            if isinstance(self.messages, StoredMessages):
+                self.messages.close()
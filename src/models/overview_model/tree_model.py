@@ -37,8 +37,8 @@ class TreeModel(QAbstractItemModel):
         self.domainFinderThreads = {}
 
         # Connect to from dds_data to self
-        self.dds_data.new_topic_signal.connect(self.new_topic_slot, Qt.ConnectionType.QueuedConnection)
-        self.dds_data.remove_topic_signal.connect(self.remove_topic_slot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.new_topics_signal.connect(self.new_topics_slot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.remove_topics_signal.connect(self.remove_topics_slot, Qt.ConnectionType.QueuedConnection)
         self.dds_data.new_domain_signal.connect(self._addDomain, Qt.ConnectionType.QueuedConnection)
         self.dds_data.removed_domain_signal.connect(self.removeDomain, Qt.ConnectionType.QueuedConnection)
         self.dds_data.no_more_mismatch_in_topic_signal.connect(self.no_more_mismatch_in_topic_slot, Qt.ConnectionType.QueuedConnection)
@@ -107,16 +107,19 @@ class TreeModel(QAbstractItemModel):
             return Qt.NoItemFlags
         return super(TreeModel, self).flags(index)
 
-    @Slot(int, str)
-    def new_topic_slot(self, domain_id, topic_name):
+    @Slot(int, list)
+    def new_topics_slot(self, domain_id, topic_names):
+        if len(topic_names) == 0:
+            return
         for idx in range(self.rootItem.childCount()):
             child: TreeNode = self.rootItem.child(idx)
             if child.data(0) == str(domain_id):
                 parent_index = self.createIndex(idx, 0, child)
                 row_count = child.childCount()
-                self.beginInsertRows(parent_index, row_count, row_count)
-                topic_child = TreeNode(topic_name, False, False, child)
-                child.appendChild(topic_child)
+                self.beginInsertRows(parent_index, row_count, row_count + len(topic_names) - 1)
+                for topic_name in topic_names:
+                    topic_child = TreeNode(topic_name, False, False, child)
+                    child.appendChild(topic_child)
                 self.endInsertRows()
 
     def set_qos_mismatch(self, domain_id: int, topic_name: str, has_mismatch: bool):
@@ -144,19 +147,18 @@ class TreeModel(QAbstractItemModel):
     def no_more_mismatch_in_topic_slot(self, domain_id, topic_name):
         self.set_qos_mismatch(domain_id, topic_name, False)
 
-    @Slot(int, str)
-    def remove_topic_slot(self, domain_id, topic_name):
+    @Slot(int, list)
+    def remove_topics_slot(self, domain_id, topic_names):
         for idx in range(self.rootItem.childCount()):
             child: TreeNode = self.rootItem.child(idx)
             if child.data(0) == str(domain_id):
-                found_topic_idx = -1
-                for idx_topic in range(child.childCount()):
+                # Remove from the back, so the rows of the remaining topics stay valid
+                for idx_topic in reversed(range(child.childCount())):
                     child_topic: TreeNode = child.child(idx_topic)
-                    if child_topic.data(0) == str(topic_name):
+                    if child_topic.data(0) in topic_names:
                         self.beginRemoveRows(self.createIndex(idx, 0, child), idx_topic, idx_topic)
                         child.removeChild(idx_topic)
                         self.endRemoveRows()
-                        break
 
     def _addDomain(self, domain_id: int):
         # Check if the domain already exists
@@ -15,11 +15,11 @@ from PySide6.QtCore import Signal, Slot
 from pathlib import Path
 import os
 import uuid
-from typing import List
+from typing import List, Optional
 from cyclonedds.builtin import DcpsParticipant
 from loguru import logger as logging
 from dds_access import dds_data
-from dds_access.dds_utils import getHostname, getAppName, getVendorName
+from dds_access.datatypes.participant_info import participant_info
 from enum import Enum
 
 
@@ -119,13 +119,13 @@ class ParticipantTreeModel(QAbstractItemModel):
         self.dds_data = dds_data.DdsData()
 
         # Connect to from dds_data to self
-        self.dds_data.new_participant_signal.connect(self.new_participant_slot, Qt.ConnectionType.QueuedConnection)
-        self.dds_data.removed_participant_signal.connect(self.removed_participant_slot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.new_participants_signal.connect(self.new_participants_slot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.removed_participants_signal.connect(self.removed_participants_slot, Qt.ConnectionType.QueuedConnection)
         self.dds_data.update_participant_signal.connect(self.update_participant_slot, Qt.ConnectionType.QueuedConnection)
         self.dds_data.new_domain_signal.connect(self.addDomain, Qt.ConnectionType.QueuedConnection)
         self.dds_data.removed_domain_signal.connect(self.removeDomain, Qt.ConnectionType.QueuedConnection)
-        self.dds_data.removed_endpoint_signal.connect(self.remove_endpoint_slot, Qt.ConnectionType.QueuedConnection)
-        self.dds_data.new_endpoint_signal.connect(self.new_endpoint_slot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.removed_endpoints_signal.connect(self.remove_endpoints_slot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.new_endpoints_signal.connect(self.new_endpoints_slot, Qt.ConnectionType.QueuedConnection)
         self.dds_data.response_endpoints_by_participant_key_signal.connect(self.response_endpoints_by_participant_key_slot, Qt.ConnectionType.QueuedConnection)
 
         # Connect from self to dds_data
@@ -172,10 +172,10 @@ class ParticipantTreeModel(QAbstractItemModel):
                 return item.data(index)
             elif item.layer == DisplayLayerEnum.HOSTNAME:
                 p = item.data(index)
-                return getHostname(p)
+                return participant_info(p).hostname
             elif item.layer == DisplayLayerEnum.APP:
                 p = item.data(index)
-                return getAppName(p)
+                return participant_info(p).app_name
             elif item.layer == DisplayLayerEnum.PARTICIPANT:
                 return str(item.data(index).key)
             elif item.layer == DisplayLayerEnum.TOPIC:
@@ -218,65 +218,76 @@ class ParticipantTreeModel(QAbstractItemModel):
             return Qt.NoItemFlags
         return super(ParticipantTreeModel, self).flags(index)
 
-    @Slot(int, DcpsParticipant)
-    def new_participant_slot(self, domain_id: int, participant: DcpsParticipant):
-        logging.trace("Add Participant " + str(participant.key) + " to participant model")
-
-        # Look for the domain_id node under rootItem
-        hostname = getHostname(participant)
-        appName = getAppName(participant)
-        self.vendorNames[str(participant.key)] = getVendorName(participant)
-
-        if domain_id in self.rootItem.childMap:
-            domain_child = self.rootItem.childMap[domain_id]
-
-            parent_index = self.createIndex(domain_child.row(), 0, domain_child)
-            row_count = domain_child.childCount()
-
-            # Add hostname
-            if hostname in domain_child.childMap:
-                hostname_child = domain_child.childMap[hostname]
-            else:
-                self.beginInsertRows(parent_index, row_count, row_count)
-                hostname_child = ParticipantTreeNode(participant, DisplayLayerEnum.HOSTNAME, domain_child)
-                domain_child.appendChild(getHostname(participant), hostname_child)
-                self.endInsertRows()
-        
-            # Add app
-            if appName in hostname_child.childMap:
-                app_child = hostname_child.childMap[appName]
-            else:
-                hostname_index = self.createIndex(hostname_child.row(), 0, hostname_child)
-                app_row_count = hostname_child.childCount()
+    def appendChildren(self, parentItem: ParticipantTreeNode, children: dict):
+        # Appends all children to the parent as one contiguous row range
+        if len(children) == 0:
+            return
+        parent_index = self.createIndex(parentItem.row(), 0, parentItem)
+        row_count = parentItem.childCount()
+        self.beginInsertRows(parent_index, row_count, row_count + len(children) - 1)
+        for key, child in children.items():
+            parentItem.appendChild(key, child)
+        self.endInsertRows()
+
+    @Slot(int, list)
+    def new_participants_slot(self, domain_id: int, participants: List[DcpsParticipant]):
+        located = []
+        for participant in participants:
+            logging.trace("Add Participant " + str(participant.key) + " to participant model")
+            info = participant_info(participant)
+            self.vendorNames[str(participant.key)] = info.vendor_name
+            located.append((info.hostname, info.app_name, participant))
 
-                self.beginInsertRows(hostname_index, app_row_count, app_row_count)
-                app_child = ParticipantTreeNode(participant, DisplayLayerEnum.APP, hostname_child)
-                hostname_child.appendChild(appName, app_child)
-                self.endInsertRows()
+        if domain_id not in self.rootItem.childMap:
+            return
 
-            # Add participant
+        domain_child = self.rootItem.childMap[domain_id]
+
+        # Add hostnames
+        new_hosts = {}
+        for hostname, _, participant in located:
+            if hostname not in domain_child.childMap and hostname not in new_hosts:
+                new_hosts[hostname] = ParticipantTreeNode(participant, DisplayLayerEnum.HOSTNAME, domain_child)
+        self.appendChildren(domain_child, new_hosts)
+
+        # Add apps
+        new_apps = {}
+        for hostname, appName, participant in located:
+            hostname_child = domain_child.childMap[hostname]
+            if appName not in hostname_child.childMap:
+                apps = new_apps.setdefault(hostname_child, {})
+                if appName not in apps:
+                    apps[appName] = ParticipantTreeNode(participant, DisplayLayerEnum.APP, hostname_child)
+        for hostname_child, apps in new_apps.items():
+            self.appendChildren(hostname_child, apps)
+
+        # Add participants
+        new_participants = {}
+        for hostname, appName, participant in located:
+            app_child = domain_child.childMap[hostname].childMap[appName]
             if str(participant.key) not in app_child.childMap:
-                app_index = self.createIndex(app_child.row(), 0, app_child)
-                participant_row_count = app_child.childCount()
-
-                self.beginInsertRows(app_index, participant_row_count, participant_row_count)
-                participant_child = ParticipantTreeNode(participant, DisplayLayerEnum.PARTICIPANT, app_child)
-                app_child.appendChild(str(participant.key), participant_child)
-                self.endInsertRows()
+                app_participants = new_participants.setdefault(app_child, {})
+                app_participants[str(participant.key)] = ParticipantTreeNode(participant, DisplayLayerEnum.PARTICIPANT, app_child)
+        for app_child, app_participants in new_participants.items():
+            self.appendChildren(app_child, app_participants)
 
     @Slot(int, DcpsParticipant)
     def update_participant_slot(self, domain_id: int, participant: DcpsParticipant):
         logging.trace("Update Participant " + str(participant.key))
 
-        self.removed_participant_slot(domain_id, str(participant.key))
-        self.new_participant_slot(domain_id, participant)
+        self.removed_participants_slot(domain_id, [str(participant.key)])
+        self.new_participants_slot(domain_id, [participant])
 
         requestId: str = str(uuid.uuid4())
         self.currentRequests.append(requestId)
         self.request_endpoints_by_participant_key_signal.emit(requestId, domain_id, str(participant.key))
 
-    @Slot(int, str)
-    def removed_participant_slot(self, domainId: int, participantKey: str):
+    @Slot(int, list)
+    def removed_participants_slot(self, domainId: int, participantKeys: List[str]):
+        for participantKey in participantKeys:
+            self.removed_participant(domainId, participantKey)
+
+    def removed_participant(self, domainId: int, participantKey: str):
         logging.trace("Remove Participant " + participantKey)
 
         if participantKey in self.vendorNames:
@@ -447,44 +458,60 @@ class ParticipantTreeModel(QAbstractItemModel):
                 return self.vendorNames[pkey]
         return ""
 
-    @Slot(str, int, dds_data.DataEndpoint)
-    def new_endpoint_slot(self, unkown: str, domain_id: int, participant: dds_data.DataEndpoint):
+    def findParticipantNode(self, domain_child: ParticipantTreeNode, participant: Optional[DcpsParticipant]) -> Optional[ParticipantTreeNode]:
+        if participant is None:
+            return None
+        info = participant_info(participant)
+        hostname = info.hostname
+        if hostname in domain_child.childMap:
+            hostname_child = domain_child.childMap[hostname]
+            appName = info.app_name
+            if appName in hostname_child.childMap:
+                app_child = hostname_child.childMap[appName]
+                if str(participant.key) in app_child.childMap:
+                    return app_child.childMap[str(participant.key)]
+        return None
 
-        hostname = getHostname(participant.participant)
-        appName = getAppName(participant.participant)
+    @Slot(str, int, list)
+    def new_endpoints_slot(self, unkown: str, domain_id: int, endpoints: List[dds_data.EndpointSnapshot]):
+        if domain_id not in self.rootItem.childMap:
+            return
 
-        if domain_id in self.rootItem.childMap:
-            domain_child = self.rootItem.childMap[domain_id]
-            if hostname in domain_child.childMap:
-                hostname_child = domain_child.childMap[hostname]
-                if appName in hostname_child.childMap:
-                    app_child = hostname_child.childMap[appName]
-                    if str(participant.participant.key) in app_child.childMap:
-                        participant_child = app_child.childMap[str(participant.participant.key)]
-
-                        # Add or get topic
-                        if participant.endpoint.topic_name in participant_child.childMap:
-                            topic_child = participant_child.childMap[participant.endpoint.topic_name]
-                        else:
-                            part_index = self.createIndex(participant_child.row(), 0, participant_child)
-                            topic_row = participant_child.childCount()
-                            self.beginInsertRows(part_index, topic_row, topic_row)
-                            topic_child = ParticipantTreeNode(participant.endpoint.topic_name, DisplayLayerEnum.TOPIC, participant_child)
-                            participant_child.appendChild(participant.endpoint.topic_name, topic_child)
-                            self.endInsertRows()
-
-                        # Add endpoint under topic
-                        if str(participant.endpoint.key) not in topic_child.childMap:
-                            topic_index = self.createIndex(topic_child.row(), 0, topic_child)
-                            endpoint_row = topic_child.childCount()
-                            self.beginInsertRows(topic_index, endpoint_row, endpoint_row)
-                            endpoint_child = ParticipantTreeNode(participant.endpoint.key, DisplayLayerEnum.READER if participant.isReader() else DisplayLayerEnum.WRITER,  topic_child)
-                            topic_child.appendChild(str(participant.endpoint.key), endpoint_child)
-                            self.endInsertRows()
-
-    @Slot(int, str)
-    def remove_endpoint_slot(self, domain_id: int, endpoint_key: str):
+        domain_child = self.rootItem.childMap[domain_id]
 
+        # Add topics
+        located = []
+        new_topics = {}
+        for endpoint in endpoints:
+            participant_child = self.findParticipantNode(domain_child, endpoint.participant)
+            if participant_child is None:
+                continue
+            located.append((participant_child, endpoint))
+            topic_name = endpoint.endpoint.topic_name
+            if topic_name not in participant_child.childMap:
+                topics = new_topics.setdefault(participant_child, {})
+                if topic_name not in topics:
+                    topics[topic_name] = ParticipantTreeNode(topic_name, DisplayLayerEnum.TOPIC, participant_child)
+        for participant_child, topics in new_topics.items():
+            self.appendChildren(participant_child, topics)
+
+        # Add endpoints under topics
+        new_endpoints = {}
+        for participant_child, endpoint in located:
+            topic_child = participant_child.childMap[endpoint.endpoint.topic_name]
+            if str(endpoint.endpoint.key) not in topic_child.childMap:
+                topic_endpoints = new_endpoints.setdefault(topic_child, {})
+                topic_endpoints[str(endpoint.endpoint.key)] = ParticipantTreeNode(
+                    endpoint.endpoint.key, DisplayLayerEnum.READER if endpoint.isReader() else DisplayLayerEnum.WRITER, topic_child)
+        for topic_child, topic_endpoints in new_endpoints.items():
+            self.appendChildren(topic_child, topic_endpoints)
+
+    @Slot(int, list)
+    def remove_endpoints_slot(self, domain_id: int, endpoint_keys: List[str]):
+        for endpoint_key in endpoint_keys:
+            self.remove_endpoint(domain_id, endpoint_key)
+
+    def remove_endpoint(self, domain_id: int, endpoint_key: str):
         if domain_id in self.rootItem.childMap:
             domain_child = self.rootItem.childMap[domain_id]
             for hostname_child in domain_child.childMap.values():
@@ -509,13 +536,12 @@ class ParticipantTreeModel(QAbstractItemModel):
 
                                 return
 
-    @Slot(str, int, dds_data.DataEndpoint)
-    def response_endpoints_by_participant_key_slot(self, requestId: str, domainId: int, endpoints: dds_data.DataEndpoint):
+    @Slot(str, int, list)
+    def response_endpoints_by_participant_key_slot(self, requestId: str, domainId: int, endpoints: List[dds_data.EndpointSnapshot]):
         if requestId not in self.currentRequests:
             return
 
         logging.trace("Response Endpoints By Participant Key, requestId: " + requestId)
 
         self.currentRequests.remove(requestId)
-        for endpoint in endpoints:
-            self.new_endpoint_slot("", domainId, endpoint)
+        self.new_endpoints_slot("", domainId, endpoints)
@@ -19,7 +19,7 @@ import json
 from dds_access import dds_data
 from cyclonedds.builtin import DcpsParticipant
 from dds_access import dds_utils
-from dds_access.dds_utils import getProperty, DEBUG_MONITORS, getAppName, getHostname
+from dds_access.datatypes.participant_info import participant_info
 import random
 import colorsys
 import datetime
@@ -258,9 +258,9 @@ class StatisticsModel(QAbstractTableModel):
 
         self.dds_data = dds_data.DdsData()
         self.requestParticipants.connect(self.dds_data.requestParticipants, Qt.ConnectionType.QueuedConnection)
-        self.dds_data.new_participant_signal.connect(self.new_participant_slot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.new_participants_signal.connect(self.new_participants_slot, Qt.ConnectionType.QueuedConnection)
         self.dds_data.response_participants_signal.connect(self.response_participants_slot, Qt.ConnectionType.QueuedConnection)
-        self.dds_data.removed_participant_signal.connect(self.removed_participant_slot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.removed_participants_signal.connect(self.removed_participants_slot, Qt.ConnectionType.QueuedConnection)
 
         self.request_ids = []
 
@@ -362,12 +362,17 @@ class StatisticsModel(QAbstractTableModel):
                 return headers[section]
         return None
 
-    @Slot(int, DcpsParticipant)
-    def new_participant_slot(self, domain_id: int, participant: DcpsParticipant):
+    @Slot(int, list)
+    def new_participants_slot(self, domain_id: int, participants: list):
+        for participant in participants:
+            self.new_participant(domain_id, participant)
+
+    def new_participant(self, domain_id: int, participant: DcpsParticipant):
 
-        dbg_mon_str: str = getProperty(participant, DEBUG_MONITORS)
-        appName: str = getAppName(participant)
-        host: str = getHostname(participant)
+        info = participant_info(participant)
+        dbg_mon_str: str = info.debug_monitor
+        appName: str = info.app_name
+        host: str = info.hostname
 
         splitProtoAdr = dbg_mon_str.split("/")
         if len(splitProtoAdr) > 0:
@@ -386,14 +391,15 @@ class StatisticsModel(QAbstractTableModel):
             return
 
         for participant in participants:
-            self.new_participant_slot(domain_id, participant)
+            self.new_participant(domain_id, participant)
 
         self.request_ids.remove(request_id)
 
-    @Slot(int, str)
-    def removed_participant_slot(self, domain_id: int, participant_key: str):
-        if participant_key in self.dgbPorts:
-            del self.dgbPorts[participant_key]
+    @Slot(int, list)
+    def removed_participants_slot(self, domain_id: int, participant_keys: list):
+        for participant_key in participant_keys:
+            if participant_key in self.dgbPorts:
+                del self.dgbPorts[participant_key]
         self.pollingThread.setDbgPorts(self.dgbPorts)
 
     @Slot()
@@ -163,6 +163,42 @@
     <message id="settings.default_domains.description">
         <translation>Komma-separierte Liste von Domains welche beim Start beigetreten werden.</translation>
     </message>
+    <message id="header.discovery_latency">
+        <translation>Discovery-Latenz: %1 ms</translation>
+    </message>
+    <message id="header.discovery_latency.tooltip">
+        <translation>Zeit von der Übernahme der Discovery-Daten bis zu ihrem Eintreffen in den Ansichten. Maximum: %1 ms</translation>
+    </message>
+    <message id="settings.types.label">
+        <translation>Typen</translation>
+    </message>
+    <message id="settings.types.prefetch">
+        <translation>Typen entdeckter Topics vorab laden</translation>
+    </message>
+    <message id="settings.types.prefetch.description">
+        <translation>Löst die Typen entdeckter Topics im Hintergrund auf, damit das Mithören eines Topics sofort startet. Wird nach einem Neustart wirksam.</translation>
+    </message>
+    <message id="settings.listener.label">
+        <translation>Mithören</translation>
+    </message>
+    <message id="settings.listener.max_messages">
+        <translation>Behaltene Nachrichten</translation>
+    </message>
+    <message id="settings.listener.max_messages.description">
+        <translation>Das Mithören behält höchstens so viele empfangene Nachrichten und verwirft darüber die ältesten, 0 behält alle. Frühere Versionen behielten alle Nachrichten, der Standard ist jetzt 100000. Wird nach einem Neustart wirksam.</translation>
+    </message>
+    <message id="settings.discovery_filter.label">
+        <translation>Discovery-Filter</translation>
+    </message>
+    <message id="settings.discovery_filter.description">
+        <translation>Entitäten, die nicht zu diesen kommagetrennten Mustern passen, werden bei der Discovery verworfen. * und ? sind Platzhalter, mit re: beginnt ein regulärer Ausdruck. Wird nach einem Neustart wirksam.</translation>
+    </message>
+    <message id="settings.discovery_filter.include_topics">
+        <translation>Nur Topics</translation>
+    </message>
+    <message id="settings.discovery_filter.exclude_topics">
+        <translation>Außer Topics</translation>
+    </message>
 
     <message id="infinite">
         <translation>Unbegrenzt</translation>
@@ -158,6 +158,42 @@
     <message id="settings.default_domains.description">
         <translation>Comma-separated list of domains to join at startup.</translation>
     </message>
+    <message id="header.discovery_latency">
+        <translation>Discovery latency: %1 ms</translation>
+    </message>
+    <message id="header.discovery_latency.tooltip">
+        <translation>Time from taking discovery data until the views received it. Maximum: %1 ms</translation>
+    </message>
+    <message id="settings.types.label">
+        <translation>Types</translation>
+    </message>
+    <message id="settings.types.prefetch">
+        <translation>Prefetch types of discovered topics</translation>
+    </message>
+    <message id="settings.types.prefetch.description">
+        <translation>Resolves the types of discovered topics in the background, so listening to a topic starts right away. Takes effect after a restart.</translation>
+    </message>
+    <message id="settings.listener.label">
+        <translation>Listener</translation>
+    </message>
+    <message id="settings.listener.max_messages">
+        <translation>Kept messages</translation>
+    </message>
+    <message id="settings.listener.max_messages.description">
+        <translation>The listener keeps at most this many received messages and drops the oldest beyond it, 0 keeps all. Earlier versions kept all messages, the default is now 100000. Takes effect after a restart.</translation>
+    </message>
+    <message id="settings.discovery_filter.label">
+        <translation>Discovery filter</translation>
+    </message>
+    <message id="settings.discovery_filter.description">
+        <translation>Entities not matching these comma separated patterns are dropped during discovery. Use * and ? as wildcards or prefix a regular expression with re:. Takes effect after a restart.</translation>
+    </message>
+    <message id="settings.discovery_filter.include_topics">
+        <translation>Only topics</translation>
+    </message>
+    <message id="settings.discovery_filter.exclude_topics">
+        <translation>Except topics</translation>
+    </message>
 
     <message id="infinite">
         <translation>Infinite</translation>
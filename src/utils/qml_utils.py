@@ -11,11 +11,12 @@
 """
 
 from PySide6 import QtCore
-from PySide6.QtCore import QStandardPaths, QDir, QObject, Slot, Signal, QFile, QFileInfo, QUrl, QTemporaryDir
+from PySide6.QtCore import QStandardPaths, QDir, QObject, Slot, Signal, QFile, QFileInfo, QUrl, QTemporaryDir, Property
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import Qt
 from loguru import logger as logging
 import os
+import time
 import uuid
 import sys
 from enum import Enum
@@ -26,15 +27,37 @@ import requests
 class QmlUtils(QObject):
 
     aboutToQuit = Signal()
-    requestDdsDataJsonSignal = Signal(str)
+    requestDdsDataJsonSignal = Signal(str, str)
+    ddsDataExportProgress = Signal(int, int)
+    ddsDataExportFinished = Signal(bool)
+    discoveryLatencyChanged = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self.ddsDataJsonRequests = {}
+        self.discoveryLatencyMs = 0.0
+        self.discoveryLatencyMaxMs = 0.0
         self.dds_data = dds_data.DdsData()
         self.requestDdsDataJsonSignal.connect(self.dds_data.requestDdsDataToJson, Qt.ConnectionType.QueuedConnection)
-        self.dds_data.response_dds_data_json_signal.connect(self.providedDdsDataJson, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.dds_data_export_progress_signal.connect(self.ddsDataJsonProgress, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.dds_data_export_done_signal.connect(self.ddsDataJsonDone, Qt.ConnectionType.QueuedConnection)
+
+    @Slot(float)
+    def discoveryDelivered(self, observed_at: float):
+        # Runs on the gui thread after the model slots of the same delivery
+        self.discoveryLatencyMs = (time.monotonic() - observed_at) * 1000.0
+        self.discoveryLatencyMaxMs = max(self.discoveryLatencyMaxMs, self.discoveryLatencyMs)
+        self.discoveryLatencyChanged.emit()
+
+    def getDiscoveryLatency(self):
+        return self.discoveryLatencyMs
+
+    def getDiscoveryLatencyMax(self):
+        return self.discoveryLatencyMaxMs
+
+    discoveryLatency = Property(float, getDiscoveryLatency, notify=discoveryLatencyChanged)
+    discoveryLatencyMax = Property(float, getDiscoveryLatencyMax, notify=discoveryLatencyChanged)
 
     @Slot(int)
     def setColorScheme(self, scheme):
@@ -111,9 +134,16 @@ class QmlUtils(QObject):
         logging.info("Request export dds data as json ...")
         reqId = str(uuid.uuid4())
         self.ddsDataJsonRequests[reqId] = filePath
-        self.requestDdsDataJsonSignal.emit(reqId)
+        self.requestDdsDataJsonSignal.emit(reqId, self.removeFilePrefix(filePath))
+
+    @Slot(str, int, int)
+    def ddsDataJsonProgress(self, reqId, written, total):
+        if reqId in self.ddsDataJsonRequests.keys():
+            self.ddsDataExportProgress.emit(written, total)
 
-    @Slot(str, str,)
-    def providedDdsDataJson(self, reqId, content):
+    @Slot(str, bool)
+    def ddsDataJsonDone(self, reqId, ok):
         if reqId in self.ddsDataJsonRequests.keys():
-            self.saveFileContent(self.ddsDataJsonRequests[reqId], content)
+            logging.info(f"Export dds data as json to {self.ddsDataJsonRequests[reqId]} ... {'DONE' if ok else 'FAILED'}")
+            del self.ddsDataJsonRequests[reqId]
+            self.ddsDataExportFinished.emit(ok)
@@ -95,6 +95,17 @@ ToolBar {
         Item {
             Layout.fillWidth: true
         }
+        Label {
+            text: qsTrId("header.discovery_latency").arg(qmlUtils.discoveryLatency.toFixed(1))
+            color: Constants.mutedForegroundColor(rootWindow.isDarkMode)
+            font.pixelSize: Constants.captionFontSize
+
+            HoverHandler {
+                id: discoveryLatencyHover
+            }
+            ToolTip.visible: discoveryLatencyHover.hovered
+            ToolTip.text: qsTrId("header.discovery_latency.tooltip").arg(qmlUtils.discoveryLatencyMax.toFixed(1))
+        }
         ComboBox {
             model: langModel
             textRole: "name"
@@ -28,6 +28,7 @@ Rectangle {
     color: Constants.mainContentColor(rootWindow.isDarkMode)
     property bool started: true
     property bool autoScrollEnabled: true
+    property bool capturing: false
     readonly property color surfaceColor: Constants.cardBackgroundColor(rootWindow.isDarkMode)
     readonly property color borderColor: Constants.designBorderColor(rootWindow.isDarkMode)
 
@@ -133,6 +134,10 @@ Rectangle {
                         text: "Import Listener Preset"
                         onClicked: importListenerPresetDialog.open()
                     }
+                    MenuItem {
+                        text: "Replay Sample Capture"
+                        onClicked: replayCaptureFileDialog.open()
+                    }
                 }
             }
             Button {
@@ -149,6 +154,21 @@ Rectangle {
                         text: "Export Sample Log"
                         onClicked: exportSampleLogFileDialog.open()
                     }
+                    MenuItem {
+                        text: "Export Reader Statistics"
+                        onClicked: exportReaderStatsFileDialog.open()
+                    }
+                    MenuItem {
+                        text: listenerTabId.capturing ? "Stop Sample Capture" : "Start Sample Capture"
+                        onClicked: {
+                            if (listenerTabId.capturing) {
+                                datamodelRepoModel.stopCapture()
+                                listenerTabId.capturing = false
+                            } else {
+                                captureFileDialog.open()
+                            }
+                        }
+                    }
                 }
             }
         }
@@ -268,6 +288,45 @@ Rectangle {
         }
     }
 
+    FileDialog {
+        id: exportReaderStatsFileDialog
+        currentFolder: StandardPaths.standardLocations(StandardPaths.HomeLocation)[0] + "/reader_statistics.json"
+        fileMode: FileDialog.SaveFile
+        defaultSuffix: "json"
+        title: "Export Reader Statistics"
+        onAccepted: {
+            qmlUtils.createFileFromQUrl(selectedFile)
+            var localPath = qmlUtils.toLocalFile(selectedFile)
+            listenerModel.exportStats(localPath)
+        }
+    }
+
+    FileDialog {
+        id: captureFileDialog
+        currentFolder: StandardPaths.standardLocations(StandardPaths.HomeLocation)[0] + "/samples.ddscap"
+        fileMode: FileDialog.SaveFile
+        defaultSuffix: "ddscap"
+        title: "Start Sample Capture"
+        onAccepted: {
+            qmlUtils.createFileFromQUrl(selectedFile)
+            var localPath = qmlUtils.toLocalFile(selectedFile)
+            datamodelRepoModel.startCapture(localPath)
+            listenerTabId.capturing = true
+        }
+    }
+
+    FileDialog {
+        id: replayCaptureFileDialog
+        currentFolder: StandardPaths.standardLocations(StandardPaths.HomeLocation)[0]
+        fileMode: FileDialog.OpenFile
+        nameFilters: ["Sample capture (*.ddscap)", "All files (*)"]
+        title: "Replay Sample Capture"
+        onAccepted: {
+            var localPath = qmlUtils.toLocalFile(selectedFile)
+            datamodelRepoModel.replayCapture(localPath)
+        }
+    }
+
     Popup {
         id: popup
         x: {
@@ -331,12 +390,13 @@ Rectangle {
                 delegate: Item {
                     id: delegateRoot
                     width: listViewSelectReaders.width
-                    height: 44
+                    height: readerRowLayout.implicitHeight + 12
 
                     required property int index
                     required property var model
 
                     RowLayout {
+                        id: readerRowLayout
                         anchors.fill: parent
                         anchors.leftMargin: 8
                         anchors.rightMargin: 8
@@ -370,6 +430,36 @@ Rectangle {
                                 elide: Text.ElideRight
                                 Layout.fillWidth: true
                             }
+
+                            Label {
+                                text: model.readerStats
+                                visible: model.readerStats !== ""
+                                color: "#666"
+                                font.pixelSize: Constants.captionFontSize
+                                elide: Text.ElideRight
+                                Layout.fillWidth: true
+                            }
+
+                            TextField {
+                                text: model.readerFilter
+                                placeholderText: "Filter, e.g. vehicle_id == 42 and speed > 100"
+                                font.pixelSize: Constants.captionFontSize
+                                Layout.fillWidth: true
+                                onEditingFinished: {
+                                    listenerModel.setFilter(model.readerId, text)
+                                    // Shows the filter in effect, an invalid one is not applied
+                                    text = Qt.binding(function() { return model.readerFilter })
+                                }
+                            }
+
+                            Label {
+                                text: model.readerFilterError
+                                visible: model.readerFilterError !== ""
+                                color: "red"
+                                font.pixelSize: Constants.captionFontSize
+                                wrapMode: Text.WordWrap
+                                Layout.fillWidth: true
+                            }
                         }
 
                         IconActionButton {
@@ -41,6 +41,22 @@ Rectangle {
         property alias domains: defaultDomainsTextField.text
     }
 
+    Settings {
+        category: "types"
+        property alias prefetch: prefetchTypesCheckBox.checked
+    }
+
+    Settings {
+        category: "listener"
+        property alias max_messages: maxMessagesSpinBox.value
+    }
+
+    Settings {
+        category: "discovery"
+        property alias include_topics: includeTopicsTextField.text
+        property alias exclude_topics: excludeTopicsTextField.text
+    }
+
     ScrollView {
         id: settingsScrollView
         anchors.fill: parent
@@ -353,6 +369,147 @@ Rectangle {
                 }
             }
 
+            Rectangle {
+                Layout.fillWidth: true
+                implicitHeight: typesLayout.implicitHeight + 24
+                radius: Constants.cardRadius
+                color: settingsViewId.surfaceColor
+                border.width: 1
+                border.color: settingsViewId.borderColor
+
+                ColumnLayout {
+                    id: typesLayout
+                    anchors.left: parent.left
+                    anchors.right: parent.right
+                    anchors.top: parent.top
+                    anchors.margins: 12
+                    spacing: 8
+
+                    Label {
+                        text: qsTrId("settings.types.label")
+                        font.pixelSize: Constants.sectionTitleFontSize
+                        font.bold: true
+                    }
+
+                    Label {
+                        Layout.fillWidth: true
+                        text: qsTrId("settings.types.prefetch.description")
+                        color: settingsViewId.secondaryTextColor
+                        wrapMode: Text.Wrap
+                    }
+
+                    CheckBox {
+                        id: prefetchTypesCheckBox
+                        text: qsTrId("settings.types.prefetch")
+                    }
+                }
+            }
+
+            Rectangle {
+                Layout.fillWidth: true
+                implicitHeight: listenerLayout.implicitHeight + 24
+                radius: Constants.cardRadius
+                color: settingsViewId.surfaceColor
+                border.width: 1
+                border.color: settingsViewId.borderColor
+
+                ColumnLayout {
+                    id: listenerLayout
+                    anchors.left: parent.left
+                    anchors.right: parent.right
+                    anchors.top: parent.top
+                    anchors.margins: 12
+                    spacing: 8
+
+                    Label {
+                        text: qsTrId("settings.listener.label")
+                        font.pixelSize: Constants.sectionTitleFontSize
+                        font.bold: true
+                    }
+
+                    Label {
+                        Layout.fillWidth: true
+                        text: qsTrId("settings.listener.max_messages.description")
+                        color: settingsViewId.secondaryTextColor
+                        wrapMode: Text.Wrap
+                    }
+
+                    RowLayout {
+                        Layout.fillWidth: true
+                        spacing: 8
+
+                        Label {
+                            text: qsTrId("settings.listener.max_messages")
+                            color: settingsViewId.secondaryTextColor
+                        }
+
+                        SpinBox {
+                            id: maxMessagesSpinBox
+                            from: 0
+                            to: 100000000
+                            stepSize: 10000
+                            value: 100000
+                            editable: true
+                        }
+
+                        Item {
+                            Layout.fillWidth: true
+                        }
+                    }
+                }
+            }
+
+            Rectangle {
+                Layout.fillWidth: true
+                implicitHeight: discoveryFilterLayout.implicitHeight + 24
+                radius: Constants.cardRadius
+                color: settingsViewId.surfaceColor
+                border.width: 1
+                border.color: settingsViewId.borderColor
+
+                ColumnLayout {
+                    id: discoveryFilterLayout
+                    anchors.left: parent.left
+                    anchors.right: parent.right
+                    anchors.top: parent.top
+                    anchors.margins: 12
+                    spacing: 8
+
+                    Label {
+                        text: qsTrId("settings.discovery_filter.label")
+                        font.pixelSize: Constants.sectionTitleFontSize
+                        font.bold: true
+                    }
+
+                    Label {
+                        Layout.fillWidth: true
+                        text: qsTrId("settings.discovery_filter.description")
+                        color: settingsViewId.secondaryTextColor
+                        wrapMode: Text.Wrap
+                    }
+
+                    Label {
+                        text: qsTrId("settings.discovery_filter.include_topics")
+                    }
+
+                    TextField {
+                        id: includeTopicsTextField
+                        Layout.fillWidth: true
+                        placeholderText: "rt/*, re:Sensor[0-9]+"
+                    }
+
+                    Label {
+                        text: qsTrId("settings.discovery_filter.exclude_topics")
+                    }
+
+                    TextField {
+                        id: excludeTopicsTextField
+                        Layout.fillWidth: true
+                        placeholderText: "rq/*, rr/*"
+                    }
+                }
+            }
+
             Item {
                 Layout.preferredHeight: 2
             }
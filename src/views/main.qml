@@ -198,6 +198,12 @@ ApplicationWindow {
             console.log("Application is about to quit.")
             shutdown()
         }
+        function onDdsDataExportProgress(written, total) {
+            loadingViewId.visible = written < total
+        }
+        function onDdsDataExportFinished(ok) {
+            loadingViewId.visible = false
+        }
     }
 
     onClosing: (close) => {
@@ -216,6 +222,7 @@ ApplicationWindow {
         currentFolder: StandardPaths.standardLocations(StandardPaths.HomeLocation)[0]
         fileMode: FileDialog.SaveFile
         defaultSuffix: "json"
+        nameFilters: ["JSON (*.json)", "JSON Lines (*.jsonl)", "Compressed JSON (*.json.gz)", "Compressed JSON Lines (*.jsonl.gz)"]
         title: "Export DDS System to json"
         onAccepted: {
             qmlUtils.createFileFromQUrl(selectedFile)
@@ -0,0 +1,33 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from queue import Queue
+import pytest
+
+pytest.importorskip("cyclonedds")
+pytest.importorskip("PySide6")
+
+from dds_access.builtin_observer import BuiltInObserver
+
+
+def test_stop_before_run_is_kept():
+    observer = BuiltInObserver(Queue())
+    observer.stop()
+    observer.start()
+    assert observer.wait(5000)
+
+
+def test_stop_while_waiting():
+    observer = BuiltInObserver(Queue())
+    observer.start()
+    observer.stop()
+    assert observer.wait(5000)
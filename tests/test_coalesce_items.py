@@ -0,0 +1,175 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import uuid
+import pytest
+
+pytest.importorskip("cyclonedds")
+pytest.importorskip("PySide6")
+
+from cyclonedds.builtin import DcpsEndpoint, DcpsParticipant
+from cyclonedds.core import Qos, Policy
+
+from dds_access.builtin_observer import BuiltInDataItem
+from dds_access.datatypes.entity_type import EntityType
+from dds_access.dds_data import coalesce_items
+
+
+DOMAIN_ID = 0
+
+
+def make_item(new=(), remove=(), update=(), new_endpoints=(), remove_endpoints=()) -> BuiltInDataItem:
+    item = BuiltInDataItem()
+    item.new_participants = [(DOMAIN_ID, p) for p in new]
+    item.remove_participants = [(DOMAIN_ID, p) for p in remove]
+    item.update_participants = [(DOMAIN_ID, p) for p in update]
+    item.new_endpoints = [(DOMAIN_ID, e, EntityType.WRITER) for e in new_endpoints]
+    item.remove_endpoints = [(DOMAIN_ID, e) for e in remove_endpoints]
+    return item
+
+
+def make_endpoint(participant: DcpsParticipant, key: uuid.UUID = None, topic_name: str = "Vehicle") -> DcpsEndpoint:
+    return DcpsEndpoint(key=key or uuid.uuid4(), participant_key=participant.key, participant_instance_handle=0,
+                        topic_name=topic_name, type_name="test::Type", qos=Qos(), type_id=None)
+
+
+def test_add_remove_cancels_out():
+    participant = DcpsParticipant(key=uuid.uuid4(), qos=Qos())
+
+    merged = coalesce_items([make_item(new=[participant]), make_item(remove=[participant])])
+
+    assert merged.new_participants == []
+    assert merged.remove_participants == []
+
+
+def test_update_of_removed_participant_is_dropped():
+    participant = DcpsParticipant(key=uuid.uuid4(), qos=Qos())
+    update = DcpsParticipant(key=participant.key, qos=Qos(Policy.Property("__ProcessName", "app")))
+
+    merged = coalesce_items([make_item(new=[participant]), make_item(update=[update]), make_item(remove=[participant])])
+
+    assert merged.update_participants == []
+
+
+def test_readded_participant_keeps_its_update():
+    key = uuid.uuid4()
+    first = DcpsParticipant(key=key, qos=Qos())
+    second = DcpsParticipant(key=key, qos=Qos())
+    update = DcpsParticipant(key=key, qos=Qos(Policy.Property("__ProcessName", "app")))
+
+    merged = coalesce_items([
+        make_item(new=[first]),
+        make_item(remove=[first]),
+        make_item(new=[second], update=[update])])
+
+    assert merged.new_participants == [(DOMAIN_ID, second)]
+    assert merged.remove_participants == []
+    assert merged.update_participants == [(DOMAIN_ID, update)]
+
+
+def test_endpoint_add_remove_cancels_out():
+    participant = DcpsParticipant(key=uuid.uuid4(), qos=Qos())
+    endpoint = make_endpoint(participant)
+
+    merged = coalesce_items([make_item(new_endpoints=[endpoint]), make_item(remove_endpoints=[endpoint])])
+
+    assert merged.new_endpoints == []
+    assert merged.remove_endpoints == []
+
+
+def test_known_endpoint_removed_and_added_again_is_kept():
+    participant = DcpsParticipant(key=uuid.uuid4(), qos=Qos())
+    endpoint = make_endpoint(participant)
+
+    merged = coalesce_items([make_item(remove_endpoints=[endpoint]), make_item(new_endpoints=[endpoint])])
+
+    # Known before the window, the models keep showing it
+    assert merged.new_endpoints == []
+    assert merged.remove_endpoints == []
+
+
+def test_endpoint_add_remove_add_keeps_the_last():
+    participant = DcpsParticipant(key=uuid.uuid4(), qos=Qos())
+    key = uuid.uuid4()
+    first = make_endpoint(participant, key)
+    second = make_endpoint(participant, key)
+
+    merged = coalesce_items([
+        make_item(new_endpoints=[first]),
+        make_item(remove_endpoints=[first]),
+        make_item(new_endpoints=[second])])
+
+    assert merged.new_endpoints == [(DOMAIN_ID, second, EntityType.WRITER)]
+    assert merged.remove_endpoints == []
+
+
+def test_endpoint_remove_add_remove_is_a_remove():
+    participant = DcpsParticipant(key=uuid.uuid4(), qos=Qos())
+    endpoint = make_endpoint(participant)
+
+    merged = coalesce_items([
+        make_item(remove_endpoints=[endpoint]),
+        make_item(new_endpoints=[endpoint]),
+        make_item(remove_endpoints=[endpoint])])
+
+    assert merged.new_endpoints == []
+    assert merged.remove_endpoints == [(DOMAIN_ID, endpoint)]
+
+
+def test_endpoints_of_other_domains_are_not_merged():
+    participant = DcpsParticipant(key=uuid.uuid4(), qos=Qos())
+    endpoint = make_endpoint(participant)
+    item = make_item(new_endpoints=[endpoint])
+    other = BuiltInDataItem()
+    other.remove_endpoints = [(DOMAIN_ID + 1, endpoint)]
+
+    merged = coalesce_items([item, other])
+
+    assert merged.new_endpoints == [(DOMAIN_ID, endpoint, EntityType.WRITER)]
+    assert merged.remove_endpoints == [(DOMAIN_ID + 1, endpoint)]
+
+
+def test_restart_of_participant_with_endpoints_in_one_window():
+    key = uuid.uuid4()
+    first = DcpsParticipant(key=key, qos=Qos())
+    second = DcpsParticipant(key=key, qos=Qos())
+    endpoint_key = uuid.uuid4()
+    first_endpoint = make_endpoint(first, endpoint_key)
+    second_endpoint = make_endpoint(second, endpoint_key)
+    other_endpoint = make_endpoint(second, topic_name="Other")
+
+    merged = coalesce_items([
+        make_item(new=[first], new_endpoints=[first_endpoint]),
+        make_item(remove=[first], remove_endpoints=[first_endpoint]),
+        make_item(new=[second], new_endpoints=[second_endpoint, other_endpoint])])
+
+    assert merged.new_participants == [(DOMAIN_ID, second)]
+    assert merged.remove_participants == []
+    assert merged.new_endpoints == [(DOMAIN_ID, second_endpoint, EntityType.WRITER),
+                                    (DOMAIN_ID, other_endpoint, EntityType.WRITER)]
+    assert merged.remove_endpoints == []
+
+
+def test_participant_gone_with_its_endpoints_in_one_window():
+    participant = DcpsParticipant(key=uuid.uuid4(), qos=Qos())
+    known = make_endpoint(participant)
+    added = make_endpoint(participant, topic_name="Other")
+    update = DcpsParticipant(key=participant.key, qos=Qos(Policy.Property("__ProcessName", "app")))
+
+    merged = coalesce_items([
+        make_item(new_endpoints=[added], update=[update]),
+        make_item(remove=[participant], remove_endpoints=[known, added])])
+
+    assert merged.new_endpoints == []
+    assert merged.remove_endpoints == [(DOMAIN_ID, known)]
+    assert merged.remove_participants == [(DOMAIN_ID, participant)]
+    assert merged.update_participants == []
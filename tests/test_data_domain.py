@@ -0,0 +1,150 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import uuid
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("cyclonedds")
+pytest.importorskip("PySide6")
+
+from cyclonedds.builtin import DcpsEndpoint, DcpsParticipant
+from cyclonedds.core import Qos, Policy
+
+from dds_access.datatypes.entity_type import EntityType
+from dds_access.dds_data import DataDomain, DataEndpoint
+from dds_access.dds_qos import dds_qos_policy_id
+
+
+def make_endpoint(topic_name: str, participant_key: uuid.UUID = None, reliability=None) -> DcpsEndpoint:
+    return DcpsEndpoint(key=uuid.uuid4(), participant_key=participant_key or uuid.uuid4(),
+                        participant_instance_handle=0, topic_name=topic_name, type_name="test::Type",
+                        qos=Qos(reliability or Policy.Reliability.Reliable(0)), type_id=None)
+
+
+def make_dcps_topic(topic_name: str):
+    # DataDomain only reads the name of a DcpsTopic
+    return SimpleNamespace(topic_name=topic_name, type_name="test::Type")
+
+
+def test_topic_discovered_before_its_endpoints():
+    domain = DataDomain(0)
+    dcpsTopic = make_dcps_topic("Vehicle")
+    domain.add_topic(dcpsTopic)
+
+    # Not announced yet, the first endpoint announces it
+    assert not domain.has_topic("Vehicle")
+
+    endpoint = make_endpoint("Vehicle")
+    domain.add_endpoint(DataEndpoint(endpoint, EntityType.WRITER))
+    assert domain.has_topic("Vehicle")
+    assert domain.getTopic("Vehicle").dcpsTopic is dcpsTopic
+
+    domain.remove_endpoint(str(endpoint.key))
+    assert not domain.has_topic("Vehicle")
+
+
+def test_topic_discovered_after_its_endpoints():
+    domain = DataDomain(0)
+    domain.add_endpoint(DataEndpoint(make_endpoint("Vehicle"), EntityType.READER))
+    dcpsTopic = make_dcps_topic("Vehicle")
+    domain.add_topic(dcpsTopic)
+    assert domain.getTopic("Vehicle").dcpsTopic is dcpsTopic
+
+
+def test_topic_without_endpoints_is_never_shown():
+    domain = DataDomain(0)
+    domain.add_topic(make_dcps_topic("Unused"))
+    assert not domain.has_topic("Unused")
+    assert len(domain.getEndpoints("Unused", EntityType.READER)) == 0
+
+
+def test_endpoints_by_participant_key():
+    domain = DataDomain(0)
+    participant = DcpsParticipant(key=uuid.uuid4(), qos=Qos())
+    other = DcpsParticipant(key=uuid.uuid4(), qos=Qos())
+    domain.add_participant(participant)
+    domain.add_participant(other)
+
+    writer = make_endpoint("Vehicle", participant.key)
+    reader = make_endpoint("Position", participant.key)
+    foreign = make_endpoint("Vehicle", other.key)
+    domain.add_endpoint(DataEndpoint(writer, EntityType.WRITER))
+    domain.add_endpoint(DataEndpoint(reader, EntityType.READER))
+    domain.add_endpoint(DataEndpoint(foreign, EntityType.READER))
+
+    keys = {dataEndpoint.endpoint.key for dataEndpoint in domain.getEndpointsByParticipantKey(str(participant.key))}
+    assert keys == {str(writer.key), str(reader.key)}
+
+    domain.remove_endpoint(str(writer.key))
+    assert [e.endpoint.key for e in domain.getEndpointsByParticipantKey(str(participant.key))] == [str(reader.key)]
+
+    # The index entry goes with the last endpoint of the participant
+    domain.remove_endpoint(str(reader.key))
+    assert domain.getEndpointsByParticipantKey(str(participant.key)) == []
+    assert str(participant.key) not in domain.participantToEndpoints
+    assert domain.participantToEndpoints == {str(other.key): {str(foreign.key)}}
+
+
+def test_endpoints_with_equal_qos_share_a_class():
+    domain = DataDomain(0)
+    first = DataEndpoint(make_endpoint("Vehicle"), EntityType.READER)
+    second = DataEndpoint(make_endpoint("Vehicle"), EntityType.READER)
+    domain.add_endpoint(first)
+    domain.add_endpoint(second)
+
+    topic = domain.getTopic("Vehicle")
+    assert len(topic.reader_classes) == 1
+    assert first.qos_signature is second.qos_signature
+
+
+def test_mismatches_are_recorded_per_class_pair():
+    domain = DataDomain(0)
+    readers = [DataEndpoint(make_endpoint("Vehicle"), EntityType.READER) for _ in range(3)]
+    writers = [DataEndpoint(make_endpoint("Vehicle", reliability=Policy.Reliability.BestEffort), EntityType.WRITER)
+               for _ in range(2)]
+    matching = DataEndpoint(make_endpoint("Vehicle"), EntityType.WRITER)
+    for dataEndpoint in readers + writers + [matching]:
+        domain.add_endpoint(dataEndpoint)
+
+    topic = domain.getTopic("Vehicle")
+    # One reliable reader class against one best effort writer class
+    assert list(topic.class_mismatches.values()) == [(dds_qos_policy_id.DDS_RELIABILITY_QOS_POLICY_ID,)]
+    writer_keys = {w.endpoint.key for w in writers}
+    assert set(readers[0].mismatches.keys()) == writer_keys
+    assert set(writers[0].mismatches.keys()) == {r.endpoint.key for r in readers}
+    assert matching.mismatches == {}
+    assert set(topic.get_mismatches()) == {r.endpoint.key for r in readers} | writer_keys
+
+    # The pair goes with the last endpoint of the writer class
+    domain.remove_endpoint(writers[0].endpoint.key)
+    assert len(topic.class_mismatches) == 1
+    domain.remove_endpoint(writers[1].endpoint.key)
+    assert topic.class_mismatches == {}
+    assert readers[0].mismatches == {}
+
+
+def test_endpoint_discovered_before_its_participant():
+    domain = DataDomain(0)
+    participant = DcpsParticipant(key=uuid.uuid4(), qos=Qos())
+    dataEndpoint = DataEndpoint(make_endpoint("Vehicle", participant.key), EntityType.WRITER)
+    domain.add_endpoint(dataEndpoint)
+
+    assert domain.snapshot(dataEndpoint).participant is None
+
+    # Found by its key once the participant is known, nothing to relink
+    domain.add_participant(participant)
+    assert domain.snapshot(dataEndpoint).participant is participant
+    assert [e.participant for e in map(domain.snapshot, domain.getEndpointsByParticipantKey(str(participant.key)))] == [participant]
+
+    domain.remove_participant(str(participant.key))
+    assert domain.snapshot(dataEndpoint).participant is None
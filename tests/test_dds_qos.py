@@ -0,0 +1,103 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import uuid
+from types import SimpleNamespace
+import pytest
+
+# Signatures and their compatibility are plain Python, only the QoS types
+# come from cyclonedds
+pytest.importorskip("cyclonedds")
+
+from cyclonedds.core import Qos, Policy
+
+from dds_access.dds_qos import (QosSignature, qos_signature, qos_match_signatures, dds_qos_policy_id,
+                                dds_reliability, dds_durability_kind)
+
+
+def make_signature(**values) -> QosSignature:
+    fields = dict.fromkeys(QosSignature._fields)
+    fields.update(topic_name="Vehicle", type_name="test::Vehicle")
+    fields.update(values)
+    return QosSignature(**fields)
+
+
+def make_endpoint(*policies) -> SimpleNamespace:
+    return SimpleNamespace(key=uuid.uuid4(), topic_name="Vehicle", type_name="test::Vehicle", qos=Qos(*policies))
+
+
+def test_equal_qos_gives_equal_signatures():
+    first = qos_signature(make_endpoint(Policy.Reliability.Reliable(0), Policy.Durability.TransientLocal))
+    second = qos_signature(make_endpoint(Policy.Reliability.Reliable(0), Policy.Durability.TransientLocal))
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first.reliability == dds_reliability.DDS_RELIABILITY_RELIABLE
+    assert first.durability == dds_durability_kind.DDS_DURABILITY_TRANSIENT_LOCAL
+
+
+def test_endpoint_names_are_not_part_of_the_signature():
+    first = qos_signature(make_endpoint(Policy.Reliability.BestEffort, Policy.EntityName("a")))
+    second = qos_signature(make_endpoint(Policy.Reliability.BestEffort, Policy.EntityName("b")))
+    assert first == second
+
+
+def test_compatible():
+    reader = make_signature(reliability=dds_reliability.DDS_RELIABILITY_BEST_EFFORT)
+    writer = make_signature(reliability=dds_reliability.DDS_RELIABILITY_RELIABLE)
+    assert qos_match_signatures(reader, writer) == ()
+
+
+def test_unset_policies_match_anything():
+    reader = make_signature(reliability=dds_reliability.DDS_RELIABILITY_RELIABLE)
+    assert qos_match_signatures(reader, make_signature()) == ()
+
+
+def test_mismatches():
+    reader = make_signature(reliability=dds_reliability.DDS_RELIABILITY_RELIABLE,
+                            durability=dds_durability_kind.DDS_DURABILITY_TRANSIENT_LOCAL,
+                            deadline=100)
+    writer = make_signature(reliability=dds_reliability.DDS_RELIABILITY_BEST_EFFORT,
+                            durability=dds_durability_kind.DDS_DURABILITY_VOLATILE,
+                            deadline=200)
+    assert qos_match_signatures(reader, writer) == (dds_qos_policy_id.DDS_RELIABILITY_QOS_POLICY_ID,
+                                                    dds_qos_policy_id.DDS_DURABILITY_QOS_POLICY_ID,
+                                                    dds_qos_policy_id.DDS_DEADLINE_QOS_POLICY_ID)
+
+
+def test_data_representation():
+    xcdr2_only = make_signature(data_representation=(False, True))
+    cdr_only = make_signature(data_representation=(True, False))
+    both = make_signature(data_representation=(True, True))
+    assert qos_match_signatures(xcdr2_only, cdr_only) == (dds_qos_policy_id.DDS_DATA_REPRESENTATION_QOS_POLICY_ID,)
+    assert qos_match_signatures(both, cdr_only) == ()
+    assert qos_match_signatures(xcdr2_only, both) == ()
+
+
+def test_type_name_mismatch():
+    reader = make_signature(type_name="test::A")
+    writer = make_signature(type_name="test::B")
+    assert qos_match_signatures(reader, writer) == (dds_qos_policy_id.DDS_INVALID_QOS_POLICY_ID,)
+
+
+def test_result_is_cached_per_signature_pair():
+    qos_match_signatures.cache_clear()
+    reader = make_signature(reliability=dds_reliability.DDS_RELIABILITY_RELIABLE)
+    writer = make_signature(reliability=dds_reliability.DDS_RELIABILITY_BEST_EFFORT)
+
+    first = qos_match_signatures(reader, writer)
+    # Equal signatures of other endpoints hit the same entry
+    second = qos_match_signatures(make_signature(reliability=dds_reliability.DDS_RELIABILITY_RELIABLE),
+                                  make_signature(reliability=dds_reliability.DDS_RELIABILITY_BEST_EFFORT))
+
+    assert second is first
+    assert qos_match_signatures.cache_info().hits == 1
+    assert qos_match_signatures.cache_info().misses == 1
@@ -0,0 +1,105 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import uuid
+import pytest
+
+pytest.importorskip("cyclonedds")
+pytest.importorskip("PySide6")
+
+from cyclonedds.builtin import DcpsEndpoint, DcpsParticipant
+from cyclonedds.core import Qos, Policy
+
+from dds_access.discovery_filter import DiscoveryFilter, IGNORE_TOPICS
+
+
+# Vendor id of Eclipse Cyclone DDS, short name "Cyclone"
+CYCLONE_GUID_PREFIX = bytes([0x01, 0x10])
+
+
+def make_participant(process: str = "/usr/bin/sensor", pid: str = "12", host: str = "host-a") -> DcpsParticipant:
+    key = uuid.UUID(bytes=CYCLONE_GUID_PREFIX + uuid.uuid4().bytes[2:])
+    return DcpsParticipant(key=key, qos=Qos(Policy.Property("__Hostname", host),
+                                            Policy.Property("__ProcessName", process),
+                                            Policy.Property("__Pid", pid)))
+
+
+def make_endpoint(participant: DcpsParticipant, topic_name: str, partitions=None) -> DcpsEndpoint:
+    policies = [Policy.Partition(partitions=partitions)] if partitions is not None else []
+    return DcpsEndpoint(key=uuid.uuid4(), participant_key=participant.key, participant_instance_handle=0,
+                        topic_name=topic_name, type_name="bench::Type", qos=Qos(*policies), type_id=None)
+
+
+def test_no_rules_accepts_all_but_builtin_topics():
+    discovery_filter = DiscoveryFilter()
+    assert discovery_filter.acceptParticipant(make_participant())
+    assert discovery_filter.acceptTopic("Vehicle")
+    assert not discovery_filter.acceptTopic(IGNORE_TOPICS[0])
+
+
+def test_exclude_vendor_by_short_name_rejects_long_name_too():
+    discovery_filter = DiscoveryFilter({"exclude_vendors": "Cyclone*"})
+    assert not discovery_filter.acceptParticipant(make_participant())
+
+
+def test_exclude_vendor_by_long_name():
+    discovery_filter = DiscoveryFilter({"exclude_vendors": "Eclipse*"})
+    assert not discovery_filter.acceptParticipant(make_participant())
+
+
+def test_include_vendor_matches_either_name():
+    assert DiscoveryFilter({"include_vendors": "Cyclone"}).acceptParticipant(make_participant())
+    assert DiscoveryFilter({"include_vendors": "Eclipse Cyclone DDS"}).acceptParticipant(make_participant())
+    assert not DiscoveryFilter({"include_vendors": "RTI*"}).acceptParticipant(make_participant())
+
+
+def test_exclude_process_by_process_name_with_other_app_name():
+    # The app name is "sensor:12", the process name "sensor"
+    discovery_filter = DiscoveryFilter({"exclude_processes": "sensor"})
+    assert not discovery_filter.acceptParticipant(make_participant())
+    assert discovery_filter.acceptParticipant(make_participant(process="/usr/bin/logger"))
+
+
+def test_include_process_by_app_name():
+    discovery_filter = DiscoveryFilter({"include_processes": "sensor:*"})
+    assert discovery_filter.acceptParticipant(make_participant())
+    assert not discovery_filter.acceptParticipant(make_participant(process="/usr/bin/logger"))
+
+
+def test_regex_rules():
+    discovery_filter = DiscoveryFilter({"include_hosts": "re:host-[ab]"})
+    assert discovery_filter.acceptParticipant(make_participant(host="host-b"))
+    assert not discovery_filter.acceptParticipant(make_participant(host="host-c"))
+
+
+def test_topic_and_partition_rules():
+    discovery_filter = DiscoveryFilter({"exclude_topics": "rt/*", "include_partitions": "plant*"})
+    participant = make_participant()
+    assert discovery_filter.acceptEndpoint(make_endpoint(participant, "Vehicle", ["plant_1"]))
+    assert not discovery_filter.acceptEndpoint(make_endpoint(participant, "rt/chatter", ["plant_1"]))
+    assert not discovery_filter.acceptEndpoint(make_endpoint(participant, "Vehicle", ["office"]))
+
+
+def test_endpoints_of_rejected_participant_are_withdrawn():
+    discovery_filter = DiscoveryFilter({"exclude_hosts": "host-a"})
+    participant = make_participant()
+    endpoint = make_endpoint(participant, "Vehicle")
+
+    # Discovered before its participant, forwarded for now
+    assert discovery_filter.acceptEndpoint(endpoint)
+    assert not discovery_filter.acceptParticipant(participant)
+    assert discovery_filter.withdrawUnchecked(participant) == [endpoint]
+
+    # Later samples of the participant and the removal stay filtered
+    assert not discovery_filter.acceptEndpoint(make_endpoint(participant, "Vehicle"))
+    assert not discovery_filter.acceptRemovedEndpoint(endpoint)
+    assert not discovery_filter.acceptRemovedParticipant(participant)
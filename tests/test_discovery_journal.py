@@ -0,0 +1,85 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import uuid
+import pytest
+
+pytest.importorskip("cyclonedds")
+pytest.importorskip("PySide6")
+
+from cyclonedds.builtin import DcpsEndpoint, DcpsParticipant
+from cyclonedds.core import Qos, Policy
+
+from dds_access.builtin_observer import BuiltInDataItem
+from dds_access.datatypes.entity_type import EntityType
+from dds_access.discovery_journal import DiscoveryJournal, read_journal
+
+
+def make_item() -> BuiltInDataItem:
+    participant = DcpsParticipant(key=uuid.uuid4(), qos=Qos(Policy.Property("__ProcessName", "app"),
+                                                            Policy.UserData(data=b"\x00\x01")))
+    endpoint = DcpsEndpoint(
+        key=uuid.uuid4(),
+        participant_key=participant.key,
+        participant_instance_handle=7,
+        topic_name="Vehicle",
+        type_name="vehicle::Vehicle",
+        qos=Qos(Policy.Reliability.Reliable(0), Policy.Partition(partitions=["a"])),
+        type_id=None)
+    item = BuiltInDataItem()
+    item.new_participants = [(3, participant)]
+    item.new_endpoints = [(3, endpoint, EntityType.WRITER)]
+    return item
+
+
+def test_journal_round_trip(tmp_path):
+    path = str(tmp_path / "discovery.journal")
+    item = make_item()
+    journal = DiscoveryJournal(path)
+    journal.record(item)
+    journal.close()
+
+    [(offset, replayed)] = list(read_journal(path))
+
+    assert offset >= 0
+    (domain_id, participant) = replayed.new_participants[0]
+    assert domain_id == 3
+    assert participant.key == item.new_participants[0][1].key
+    assert participant.qos == item.new_participants[0][1].qos
+    (domain_id, endpoint, entity_type) = replayed.new_endpoints[0]
+    assert entity_type == EntityType.WRITER
+    assert endpoint.topic_name == "Vehicle"
+    assert endpoint.participant_instance_handle == 7
+    assert endpoint.qos == item.new_endpoints[0][1].qos
+
+
+def test_truncated_journal_ends_cleanly(tmp_path):
+    path = str(tmp_path / "discovery.journal")
+    journal = DiscoveryJournal(path)
+    journal.record(make_item())
+    journal.record(make_item())
+    journal.close()
+
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-10])
+
+    assert len(list(read_journal(path))) == 1
+
+
+def test_not_a_journal(tmp_path):
+    path = tmp_path / "other.journal"
+    path.write_bytes(b"garbage")
+
+    with pytest.raises(ValueError):
+        list(read_journal(str(path)))
@@ -0,0 +1,112 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import time
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("cyclonedds")
+pytest.importorskip("PySide6")
+
+from dds_access import dispatcher as dispatcher_module
+from dds_access.datatypes.entity_type import EntityType
+from dds_access.dispatcher import DispatcherThread
+from dds_access.reader_stats import ReaderStats
+
+
+class FakeReader:
+    """Hands out its samples like DataReader.take with a read condition."""
+
+    def __init__(self, readerId: str, count: int):
+        self.samples = [SimpleNamespace(readerId=readerId, index=i,
+                                        sample_info=SimpleNamespace(source_timestamp=time.time_ns(), valid_data=True),
+                                        serialize=lambda: b"1234")
+                        for i in range(count)]
+
+    def take(self, N, condition):
+        (taken, self.samples) = (self.samples[:N], self.samples[N:])
+        return taken
+
+
+def make_dispatcher(monkeypatch, batch_size: int, interval_ms: int = 60000):
+    monkeypatch.setattr(dispatcher_module, "DISPATCH_BATCH_SIZE", batch_size)
+    monkeypatch.setattr(dispatcher_module, "DISPATCH_BATCH_INTERVAL_MS", interval_ms)
+    dispatcher = DispatcherThread("initial", 0, "Vehicle", None, None, EntityType.READER)
+    batches = []
+    dispatcher.onData.connect(lambda batch: batches.append(batch))
+    return (dispatcher, batches)
+
+
+def reader_entry(readerId: str, count: int):
+    return (readerId, None, None, FakeReader(readerId, count), None)
+
+
+def taken_by(batch):
+    return [readerId for (readerId, _, _) in batch]
+
+
+def test_quota_per_reader(monkeypatch):
+    (dispatcher, batches) = make_dispatcher(monkeypatch, batch_size=10)
+    readers = [reader_entry("a", 100), reader_entry("b", 2), reader_entry("c", 100)]
+
+    dispatcher.dispatch(readers, 0)
+
+    # 10 // 3 samples each at most, one batch for the whole wakeup
+    assert len(batches) == 1
+    assert taken_by(batches[0]) == ["a"] * 3 + ["b"] * 2 + ["c"] * 3
+
+
+def test_rotation_starts_with_another_reader(monkeypatch):
+    (dispatcher, batches) = make_dispatcher(monkeypatch, batch_size=10)
+    readers = [reader_entry("a", 100), reader_entry("b", 100), reader_entry("c", 100)]
+
+    dispatcher.dispatch(readers, 1)
+    dispatcher.dispatch(readers, 5)
+
+    assert taken_by(batches[0]) == ["b"] * 3 + ["c"] * 3 + ["a"] * 3
+    assert taken_by(batches[1]) == ["c"] * 3 + ["a"] * 3 + ["b"] * 3
+
+
+def test_samples_keep_their_order(monkeypatch):
+    (dispatcher, batches) = make_dispatcher(monkeypatch, batch_size=4)
+    readers = [reader_entry("a", 5)]
+
+    dispatcher.dispatch(readers, 0)
+    dispatcher.dispatch(readers, 1)
+
+    assert [sample.index for batch in batches for (_, _, sample) in batch] == [0, 1, 2, 3, 4]
+
+
+def test_batch_emitted_when_interval_passed(monkeypatch):
+    (dispatcher, batches) = make_dispatcher(monkeypatch, batch_size=100, interval_ms=0)
+    readers = [reader_entry("a", 3), reader_entry("b", 0), reader_entry("c", 2)]
+
+    dispatcher.dispatch(readers, 0)
+
+    assert [taken_by(batch) for batch in batches] == [["a"] * 3, ["c"] * 2]
+
+
+def test_predicates_and_stats_apply_before_batching(monkeypatch):
+    (dispatcher, batches) = make_dispatcher(monkeypatch, batch_size=100)
+    dispatcher.readerPredicates["a"] = lambda sample: sample.index % 2 == 0
+    dispatcher.readerStats["a"] = ReaderStats()
+
+    dispatcher.dispatch([reader_entry("a", 6)], 0)
+
+    assert [sample.index for (_, _, sample) in batches[0]] == [0, 2, 4]
+    assert dispatcher.readerStats["a"].samples == 3
+
+
+def test_no_readers(monkeypatch):
+    (dispatcher, batches) = make_dispatcher(monkeypatch, batch_size=10)
+    dispatcher.dispatch([], 0)
+    assert batches == []
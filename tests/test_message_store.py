@@ -0,0 +1,73 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from dataclasses import dataclass
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("cyclonedds")
+pytest.importorskip("PySide6")
+
+from cyclonedds.idl import IdlStruct
+from cyclonedds.idl.types import int32
+
+from models.listener.message_store import MessageStore
+
+
+@dataclass
+class Reading(IdlStruct, typename="store_test::Reading"):
+    sensor: int32
+    label: str
+
+
+class Disposed:
+    """Stands in for the InvalidSample of a dispose, it has no data."""
+    sample_info = SimpleNamespace(valid_data=False)
+
+    def serialize(self):
+        raise AssertionError("an invalid sample must not be serialized")
+
+
+def test_stores_and_reads_back(tmp_path):
+    store = MessageStore(str(tmp_path))
+    for i in range(3):
+        assert store.append("reader-1", float(i), Reading(i, f"r{i}"))
+    assert len(store) == 3
+    assert store.message(1) == ("reader-1", 1.0, Reading(1, "r1"))
+    assert store.readerId(2) == "reader-1"
+    store.close()
+
+
+def test_skips_samples_without_data(tmp_path):
+    store = MessageStore(str(tmp_path))
+    # The reader's type is taken from its first sample with data
+    assert not store.append("reader-1", 0.0, Disposed())
+    assert store.readerTypes == []
+    assert store.append("reader-1", 1.0, Reading(7, "after dispose"))
+    assert store.readerTypes == [Reading]
+    assert len(store) == 1
+    assert store.message(0)[2] == Reading(7, "after dispose")
+    store.close()
+
+
+def test_snapshot_outlives_clear(tmp_path):
+    store = MessageStore(str(tmp_path))
+    for i in range(4):
+        store.append("reader-1", float(i), Reading(i, "x" * i))
+    snapshot = store.snapshot()
+    store.clear()
+    store.append("reader-1", 9.0, Reading(9, "new"))
+
+    assert [sample for (_, _, sample) in snapshot] == [Reading(i, "x" * i) for i in range(4)]
+    assert store.message(0)[2] == Reading(9, "new")
+    snapshot.close()
+    store.close()
@@ -0,0 +1,87 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import uuid
+import pytest
+
+pytest.importorskip("cyclonedds")
+pytest.importorskip("PySide6")
+
+from cyclonedds.builtin import DcpsParticipant
+from cyclonedds.core import Qos, Policy
+
+from dds_access.datatypes import participant_info as infos
+from dds_access.datatypes.participant_info import participant_info, UNKNOWN_PARTICIPANT_INFO
+from dds_access.dds_data import DataDomain
+
+
+# Vendor id of Eclipse Cyclone DDS
+CYCLONE_GUID_PREFIX = bytes([0x01, 0x10])
+
+
+def make_participant(process: str = "/opt/app/bin/sensor", key: uuid.UUID = None) -> DcpsParticipant:
+    key = key or uuid.UUID(bytes=CYCLONE_GUID_PREFIX + uuid.uuid4().bytes[2:])
+    return DcpsParticipant(key=key, qos=Qos(Policy.Property("__Hostname", "host-a"),
+                                            Policy.Property("__ProcessName", process),
+                                            Policy.Property("__Pid", "42")))
+
+
+def test_identity_is_parsed():
+    info = participant_info(make_participant())
+    assert info.hostname == "host-a"
+    assert info.process_name == "sensor"
+    assert info.pid == "42"
+    assert info.app_name == "sensor:42"
+    assert info.vendor_short_name == "Cyclone"
+    assert not info.is_opensplice
+
+
+def test_none_is_unknown():
+    assert participant_info(None) is UNKNOWN_PARTICIPANT_INFO
+
+
+def test_known_participant_is_parsed_once():
+    domain = DataDomain(0)
+    participant = make_participant()
+    domain.add_participant(participant)
+
+    assert participant_info(participant) is participant_info(participant)
+    domain.remove_participant(str(participant.key))
+
+
+def test_update_invalidates_the_info():
+    domain = DataDomain(0)
+    participant = make_participant()
+    domain.add_participant(participant)
+    before = participant_info(participant)
+
+    update = DcpsParticipant(key=participant.key, qos=Qos(Policy.Property("__ProcessName", "/opt/app/bin/logger")))
+    updated = domain.update_participant(update)
+
+    after = participant_info(updated)
+    assert after is not before
+    assert after.process_name == "logger"
+    assert participant_info(updated) is after
+    domain.remove_participant(str(participant.key))
+
+
+def test_removal_forgets_the_info():
+    domain = DataDomain(0)
+    participant = make_participant()
+    domain.add_participant(participant)
+    assert participant.key in infos._infos
+
+    domain.remove_participant(str(participant.key))
+    assert participant.key not in infos._infos
+    # Still shown by a view for a moment, parsed without being kept
+    assert participant_info(participant).process_name == "sensor"
+    assert participant.key not in infos._infos
@@ -0,0 +1,101 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import time
+from types import SimpleNamespace
+import pytest
+
+from dds_access import reader_stats
+from dds_access.reader_stats import (ReaderStats, latency_bucket, bucket_latency, SUB_BUCKETS, HISTOGRAM_SIZE,
+                                     BYTES_MEASURE_EVERY)
+
+
+NOW_NS = 1_700_000_000_000_000_000
+
+
+@pytest.fixture(autouse=True)
+def reception_clock(monkeypatch):
+    # Samples are received at NOW_NS, latencies do not depend on the test's speed
+    monkeypatch.setattr(reader_stats, "time", SimpleNamespace(time_ns=lambda: NOW_NS, monotonic=time.monotonic))
+
+
+def make_samples(latencies_us, size=100):
+    return [SimpleNamespace(sample_info=SimpleNamespace(source_timestamp=NOW_NS - latency * 1000),
+                            serialize=lambda: b"x" * size)
+            for latency in latencies_us]
+
+
+def test_small_latencies_are_exact():
+    for us in range(2 * SUB_BUCKETS):
+        assert latency_bucket(us) == us
+        assert bucket_latency(us) == us
+
+
+def test_buckets_are_ordered_and_bounded():
+    previous = 0
+    for us in list(range(1, 5000)) + [10 ** k for k in range(4, 19)]:
+        bucket = latency_bucket(us)
+        assert bucket >= previous
+        assert bucket < HISTOGRAM_SIZE
+        previous = bucket
+        # The lower bound of its bucket, within 1 / SUB_BUCKETS
+        lower = bucket_latency(bucket)
+        assert lower <= us
+        assert us - lower <= us / SUB_BUCKETS
+
+
+def test_bucket_lower_bounds_round_trip():
+    for bucket in range(HISTOGRAM_SIZE - SUB_BUCKETS):
+        assert latency_bucket(bucket_latency(bucket)) == bucket
+
+
+def test_percentiles():
+    stats = ReaderStats()
+    assert stats.percentile_us(0.5) == 0
+
+    stats.record(make_samples([1000] * 98 + [50000, 80000]))
+    assert 1000 * (1 - 1 / SUB_BUCKETS) <= stats.percentile_us(0.5) <= 1000
+    assert 50000 * (1 - 1 / SUB_BUCKETS) <= stats.percentile_us(0.99) <= 50000
+    assert stats.max_latency_us == 80000
+
+
+def test_clock_ahead_of_reception_counts_as_zero():
+    stats = ReaderStats()
+    stats.record(make_samples([-5000]))
+    assert stats.histogram[0] == 1
+    assert stats.max_latency_us == 0
+
+
+def test_size_is_measured_on_every_nth_sample():
+    stats = ReaderStats()
+    stats.record(make_samples([10] * (2 * BYTES_MEASURE_EVERY), size=64))
+    assert stats.samples == 2 * BYTES_MEASURE_EVERY
+    assert stats.measured_samples == 2
+    assert stats.averageSize() == 64
+
+
+def test_snapshot():
+    stats = ReaderStats()
+    stats.record(make_samples([2000] * 10))
+    stats.addLost(3)
+    stats.addRejected(1)
+
+    snapshot = stats.snapshot()
+    assert snapshot["samples"] == 10
+    assert snapshot["samples_per_s"] > 0
+    assert snapshot["bytes_per_s"] == pytest.approx(snapshot["samples_per_s"] * 100)
+    assert snapshot["lost"] == 3
+    assert snapshot["rejected"] == 1
+    assert 1.75 <= snapshot["latency_p50_ms"] <= 2.0
+
+    # Rates are since the previous snapshot
+    assert stats.snapshot()["samples_per_s"] == 0
@@ -0,0 +1,114 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import pytest
+
+pytest.importorskip("cyclonedds")
+pytest.importorskip("PySide6")
+
+from models.listener.receiver_model import (ReceiverModel, EVICTION_DROP_OLDEST, EVICTION_KEEP_EVERY_NTH,
+                                            MAX_REMOVE_RUNS)
+
+
+def make_model(eviction=EVICTION_DROP_OLDEST, max_messages=0, max_messages_per_reader=0, keep_every_nth=3):
+    model = ReceiverModel()
+    # Independent of the settings of the machine running the tests
+    model.close()
+    model._max_messages = max_messages
+    model._max_messages_per_reader = max_messages_per_reader
+    model._eviction = eviction
+    model._keep_every_nth = keep_every_nth
+
+    model.changes = []
+    model.rowsRemoved.connect(lambda parent, first, last: model.changes.append(("removed", first, last)))
+    model.rowsInserted.connect(lambda parent, first, last: model.changes.append(("inserted", first, last)))
+    return model
+
+
+def add(model, readerIds):
+    model.addReceivedMsgs([(readerId, 0.0, None) for readerId in readerIds])
+
+
+def seqs(model):
+    return [model._messages[model._head + row].seq for row in range(model.rowCount())]
+
+
+def test_drop_oldest():
+    model = make_model(max_messages=10)
+    for _ in range(5):
+        add(model, ["a"] * 7)
+
+    assert seqs(model) == list(range(25, 35))
+    assert list(model._seqs_by_reader["a"]) == list(range(25, 35))
+    assert all(model.rowOf(seq) == row for row, seq in enumerate(range(25, 35)))
+    # Dropped from the front, the list is compacted as it goes
+    assert len(model._messages) - model._head == 10
+    assert model._head <= len(model._messages) // 2
+
+
+def test_drop_oldest_per_reader():
+    model = make_model(max_messages_per_reader=3)
+    add(model, ["a", "b", "a", "a", "b", "a"])
+
+    assert seqs(model) == [1, 2, 3, 4, 5]
+    assert list(model._seqs_by_reader["a"]) == [2, 3, 5]
+    assert list(model._seqs_by_reader["b"]) == [1, 4]
+
+
+def test_keep_every_nth():
+    model = make_model(eviction=EVICTION_KEEP_EVERY_NTH, max_messages=20, keep_every_nth=3)
+    add(model, ["a"] * 20)
+    add(model, ["a"] * 3)
+
+    # The oldest are thinned out, every third of them kept
+    assert seqs(model) == [0, 3] + list(range(5, 23))
+
+
+def test_keep_every_nth_falls_back_to_oldest():
+    model = make_model(eviction=EVICTION_KEEP_EVERY_NTH, max_messages=10, keep_every_nth=3)
+    add(model, ["a"] * 10)
+    add(model, ["a"] * 5)
+
+    # Thinning the older half does not free enough, the oldest go
+    assert seqs(model) == list(range(5, 15))
+
+
+def test_scattered_rows_removed_in_one_span():
+    model = make_model(max_messages_per_reader=20)
+    add(model, ["a", "b"] * 20)
+    model.changes.clear()
+    add(model, ["a"] * 40)
+
+    # The 20 oldest of "a" interleaved with "b", then 20 of the new ones
+    assert MAX_REMOVE_RUNS < 21
+    assert seqs(model) == list(range(1, 40, 2)) + list(range(60, 80))
+    assert model.changes == [("inserted", 40, 79), ("removed", 0, 59), ("inserted", 0, 19)]
+    assert list(model._seqs_by_reader["a"]) == list(range(60, 80))
+    assert list(model._seqs_by_reader["b"]) == list(range(1, 40, 2))
+
+
+def test_few_runs_removed_one_by_one():
+    model = make_model(max_messages_per_reader=2)
+    add(model, ["a", "b", "b", "a", "b", "b"])
+
+    assert seqs(model) == [0, 3, 4, 5]
+    assert model.changes == [("inserted", 0, 5), ("removed", 1, 2)]
+
+
+def test_clear():
+    model = make_model(max_messages=4)
+    add(model, ["a"] * 9)
+    model.clear()
+    assert model.rowCount() == 0
+    assert model._head == 0
+    add(model, ["b"] * 2)
+    assert seqs(model) == [9, 10]
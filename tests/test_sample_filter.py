@@ -0,0 +1,124 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from dataclasses import dataclass
+from types import SimpleNamespace
+import pytest
+
+from dds_access.sample_filter import to_python, compile_filter
+
+
+@dataclass
+class Position:
+    x: float
+    y: float
+
+
+@dataclass
+class Vehicle:
+    vehicle_id: int
+    name: str
+    speed: float
+    position: Position
+    tags: list
+
+
+def make_vehicle(vehicle_id=42, name="truck", speed=120.0, x=1.0, tags=("a",)):
+    return Vehicle(vehicle_id, name, speed, Position(x, 2.0), list(tags))
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("vehicle_id = 42", "vehicle_id == 42"),
+    ("vehicle_id <> 42", "vehicle_id != 42"),
+    ("speed >= 10 AND speed <= 20", "speed >= 10 and speed <= 20"),
+    ("a = 1 or NOT b = 2", "a == 1 or not b == 2"),
+    ("x == 1 and y != 2", "x == 1 and y != 2"),
+])
+def test_sql_syntax_is_translated(expression, expected):
+    assert " ".join(to_python(expression).split()) == expected
+
+
+def test_string_literals_are_left_alone():
+    assert " ".join(to_python("name = 'A AND B = C' AND x = 1").split()) == "name == 'A AND B = C' and x == 1"
+    assert to_python('name <> "OR"') == 'name != "OR"'
+
+
+@pytest.mark.parametrize("expression", [
+    "vehicle_id == 42",
+    "vehicle_id = 42 AND speed > 100",
+    "position.x < 5 or name == 'bus'",
+    "'a' in tags and vehicle_id in (1, 42)",
+    "vehicle_id % 2 == 0 and -speed < 0",
+    "not (speed < 100)",
+])
+def test_matches(expression):
+    assert compile_filter(Vehicle, expression)(make_vehicle())
+
+
+@pytest.mark.parametrize("expression", [
+    "vehicle_id == 7",
+    "position.x > 5",
+    "name == 'bus' OR speed < 100",
+])
+def test_does_not_match(expression):
+    assert not compile_filter(Vehicle, expression)(make_vehicle())
+
+
+@pytest.mark.parametrize("expression", [
+    "len(name) > 3",
+    "__import__('os').system('true')",
+    "name.__class__ == str",
+    "_sample.speed > 1",
+    "[v for v in tags]",
+    "(lambda: 1)()",
+    "{'a': 1}",
+    "speed if True else 0",
+    "position.__dict__",
+    "speed := 1",
+])
+def test_unsupported_expressions_are_rejected(expression):
+    with pytest.raises(ValueError):
+        compile_filter(Vehicle, expression)
+
+
+def test_syntax_error_is_rejected():
+    with pytest.raises(ValueError):
+        compile_filter(Vehicle, "speed >")
+
+
+def test_unknown_field_of_dataclass_is_rejected():
+    with pytest.raises(ValueError, match="Unknown field 'sped'"):
+        compile_filter(Vehicle, "sped > 100")
+
+
+def test_any_field_without_dataclass():
+    # Types not known as dataclass are checked only when evaluated
+    matches = compile_filter(object, "value > 1")
+    assert matches(SimpleNamespace(value=2))
+    assert not matches(SimpleNamespace(other=2))
+
+
+def test_evaluation_errors_do_not_match():
+    matches = compile_filter(Vehicle, "speed / vehicle_id > 1")
+    assert matches(make_vehicle())
+    assert not matches(make_vehicle(vehicle_id=0))
+    assert not matches(SimpleNamespace(speed="fast", vehicle_id=1))
+
+
+def test_literals():
+    assert compile_filter(Vehicle, "True")(make_vehicle())
+    assert not compile_filter(Vehicle, "name == None")(make_vehicle())
+
+
+def test_compiled_once_per_type_and_expression():
+    assert compile_filter(Vehicle, "speed > 1") is compile_filter(Vehicle, "speed > 1")
+    assert compile_filter(Vehicle, "speed > 1") is not compile_filter(Position, "x > 1")
@@ -0,0 +1,77 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from dataclasses import dataclass
+import pytest
+
+pytest.importorskip("cyclonedds")
+pytest.importorskip("PySide6")
+
+from cyclonedds.idl import IdlStruct
+from cyclonedds.idl.types import int32, float64, sequence
+
+from dds_access.type_cache import TypeCache
+from dds_access.type_resolver import type_id_key
+
+
+@dataclass
+class Position(IdlStruct, typename="cache_test::Position"):
+    x: float64
+    y: float64
+
+
+@dataclass
+class Vehicle(IdlStruct, typename="cache_test::Vehicle"):
+    vehicle_id: int32
+    name: str
+    track: sequence[Position]
+
+
+@dataclass
+class OtherVehicle(IdlStruct, typename="cache_test::Vehicle"):
+    vehicle_id: int32
+
+
+def key_of(data_type) -> str:
+    return type_id_key(data_type.__idl__.get_type_id())
+
+
+def test_stored_type_loads_in_a_new_cache(tmp_path):
+    # Stored the way TypeResolver stores a type resolved from the network
+    key = key_of(Vehicle)
+    TypeCache(str(tmp_path)).store(key, "cache_test::Vehicle", Vehicle)
+
+    loaded = TypeCache(str(tmp_path)).load(key)
+
+    assert loaded is not None
+    sample = Vehicle(vehicle_id=42, name="bus", track=[Position(x=1.0, y=2.0)])
+    received = loaded.deserialize(sample.serialize())
+    assert received.vehicle_id == 42
+    assert received.name == "bus"
+    assert received.track[0].y == 2.0
+    assert bytes(received.serialize()) == bytes(sample.serialize())
+
+
+def test_type_name_finds_newest_type(tmp_path):
+    cache = TypeCache(str(tmp_path))
+    cache.store(key_of(Vehicle), "cache_test::Vehicle", Vehicle)
+    cache.store(key_of(OtherVehicle), "cache_test::Vehicle", OtherVehicle)
+
+    assert key_of(Vehicle) != key_of(OtherVehicle)
+    assert TypeCache(str(tmp_path)).keyForTypeName("cache_test::Vehicle") == key_of(OtherVehicle)
+
+    cache.store(key_of(Vehicle), "cache_test::Vehicle", Vehicle)
+    assert TypeCache(str(tmp_path)).keyForTypeName("cache_test::Vehicle") == key_of(Vehicle)
+
+
+def test_unknown_key_loads_nothing(tmp_path):
+    assert TypeCache(str(tmp_path)).load("unknown") is None